@@ -1,15 +1,20 @@
 from lib.env import ENV
 import os
+import json
 import pandas as pd
 import numpy as np
 from backend.fetch_result_db import Fetch_Result_DB
 from bson import ObjectId
-from backend.models import Subject
+from backend.models import Subject, Degree
+from backend.ranklist_cache import RanklistCache
 from ast import literal_eval
 from lib.gdrive import GDrive
 
 gDrive = GDrive()
 
+# Ranklists served recently, shared by every request
+ranklist_cache = RanklistCache(ENV.RANKLIST_CACHE_TTL_SECONDS, ENV.RANKLIST_CACHE_MAX_ENTRIES)
+
 class Fetch_Result_CSV:
     __college_id: str
     __degree_doc_id: str
@@ -30,35 +35,79 @@ class Fetch_Result_CSV:
     
     async def get_college_result(self):
         """
-        It will get result file of given college
+        It will get ranklist of given college, cached ranklist is served while its version is unchanged. Ranklist
+        precomputed at ingest time is read if semester has one, otherwise result file is read and ranked, then
+        version of result file itself (its md5 in drive) is checked so an updated result file is never served stale
         """
 
-        # Getting result file
-        get_result_data = gDrive.read_gdrive_file(self.__result_file_id)
-        result_df = pd.read_csv(get_result_data, dtype=str)
+        degree = await Fetch_Result_DB().get_degree(self.__degree_doc_id, return_subjects = True)
+        ranklist_link = self.__get_ranklist_link(degree)
+        ranklist_version = ranklist_link["version"] if ranklist_link else gDrive.get_file_version(self.__result_file_id)
+
+        cache_key = (self.__result_file_id, self.__college_id)
+        cached_ranklist = ranklist_cache.get(cache_key, ranklist_version)
+        if cached_ranklist is not None:
+            return cached_ranklist
+
+        if ranklist_link:
+            final_result, sub_id_list = self.__get_college_ranklist(ranklist_link["file_id"])
+        else:
+            # Getting result file
+            get_result_data = gDrive.read_gdrive_file(self.__result_file_id)
+            result_df = pd.read_csv(get_result_data, dtype=str)
+            sub_id_list = self.__get_sub_id_list(result_df.columns)
+
+            # Getting final result
+            final_result_df = self.__get_single_college_result(result_df, self.__college_id)
+            self.__assign_ranks(final_result_df)
+            final_result = final_result_df.sort_values(by="rank", ascending=True).to_dict(orient="records")
 
         # Getting all required subject data
-        sub_id_list = self.__get_sub_id_list(result_df)
-        subject_data_list = await self.__get_subject_data(sub_id_list, self.__degree_doc_id)
+        subject_data_list = await self.__get_subject_data(sub_id_list, degree)
+
+        # Ranklist of unknown version can't be checked for updates, so it isn't cached
+        if ranklist_version is not None:
+            ranklist_cache.put(cache_key, ranklist_version, (final_result, subject_data_list))
+        return final_result, subject_data_list
+
+    def __get_ranklist_link(self, degree: Degree) -> dict[str, str] | None:
+        """
+        It will return link of precomputed ranklist of semester, only if it is ranklist of requested result file
+        """
+
+        sem_key = str(self.__semester_num)
+        if (degree.sem_results or {}).get(sem_key) != self.__result_file_id:
+            return None
+        return (degree.sem_ranklists or {}).get(sem_key)
+
+    def __get_college_ranklist(self, ranklist_file_id: str) -> tuple[list[dict], list[str]]:
+        """
+        It will read precomputed ranklist and return records of given college with their college rank, along with
+        subject ids of result
+        """
 
-        # Getting final result
-        final_result_df = self.__get_single_college_result(result_df, self.__college_id)
-        self.__assign_ranks(final_result_df)
+        ranklist = json.load(gDrive.read_gdrive_file(ranklist_file_id))["records"]
+        college_ranklist = [
+            { **record, "rank": record["college_rank"] }
+            for record in ranklist if record["college_id"] == self.__college_id
+        ]
+        for record in college_ranklist:
+            del record["college_rank"]
 
-        return final_result_df.sort_values(by="rank", ascending=True).to_dict(orient="records"), subject_data_list
+        return college_ranklist, self.__get_sub_id_list(ranklist[0].keys() if ranklist else [])
         
-    def __get_sub_id_list(self, result_csv: pd.DataFrame) -> list[str]:
+    def __get_sub_id_list(self, result_columns) -> list[str]:
         """
         Return the list of subject ids present in the given result column
         """
 
         sub_id_list = []
-        for column in result_csv.columns:
+        for column in result_columns:
             if column.startswith('sub_'):
                 sub_id_list.append(column.split('sub_')[-1])
         return sub_id_list
     
-    async def __get_subject_data(self, sub_id_list: list[str], degree_doc_id: str):
+    async def __get_subject_data(self, sub_id_list: list[str], degree_doc: Degree):
         """
         Return the subject data of given subject ids
         """
@@ -66,7 +115,6 @@ class Fetch_Result_CSV:
         fetch_db = Fetch_Result_DB()
 
         # Getting subject doc ids
-        degree_doc = await fetch_db.get_degree(degree_doc_id, return_subjects = True)        
         sub_doc_id_list = [ObjectId(degree_doc.subjects[subject_id]) for subject_id in sub_id_list if subject_id in degree_doc.subjects]
 
         return await fetch_db.get_all_subjects_by_doc_id(sub_doc_id_list)
@@ -91,4 +139,5 @@ class Fetch_Result_CSV:
         It will assign ranks to the result dataframe
         """
 
-        result_df['rank'] = result_df['cgpa'].rank(method='dense', ascending=False).astype(int)
+        # Cgpa is read as string, so it is ranked as number (string "10.0" would rank below "9.0")
+        result_df['rank'] = pd.to_numeric(result_df['cgpa']).rank(method='dense', ascending=False).astype(int)
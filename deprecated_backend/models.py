@@ -52,6 +52,9 @@ class Degree(BaseResultModel):
     colleges: Optional[list[dict[str, str | list[int] | dict[str, str]]]] = None
     subjects: Optional[dict[str, str]] = None
     sem_results: Optional[dict[str, str]] = None
+    sem_results_parquet: Optional[dict[str, str]] = None
+    sem_result_shards: Optional[dict[str, dict[str, dict[str, str]]]] = None
+    sem_ranklists: Optional[dict[str, dict[str, str]]] = None
     batch_id: str
     batch_year: int
     folder_id: Optional[str] = None
@@ -0,0 +1,49 @@
+import time
+from collections import OrderedDict
+
+class RanklistCache:
+    """
+    Served ranklists kept in memory, key: (result file id, college id). A cached ranklist is served only until its
+    ttl expires and while its version (md5 of precomputed ranklist file, or of result file if semester has no
+    ranklist) is unchanged, so an updated semester result is never served stale. Least recently served ranklists
+    are dropped when cache is full
+    """
+
+    __ttl_seconds: int
+    __max_entries: int
+    __entries: OrderedDict[tuple[str, str], tuple[float, str | None, tuple]]  # value: (expires at, version, ranklist)
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.__ttl_seconds = ttl_seconds
+        self.__max_entries = max_entries
+        self.__entries = OrderedDict()
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.__ttl_seconds > 0 and self.__max_entries > 0
+
+    def get(self, key: tuple[str, str], version: str | None) -> tuple | None:
+        """
+        It will return cached ranklist of key, None if it is not cached, expired or of another version
+        """
+
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, cached_version, ranklist = entry
+        if expires_at <= time.monotonic() or cached_version != version:
+            del self.__entries[key]
+            return None
+
+        self.__entries.move_to_end(key)
+        return ranklist
+
+    def put(self, key: tuple[str, str], version: str | None, ranklist: tuple):
+        if not self.is_enabled:
+            return
+
+        self.__entries[key] = (time.monotonic() + self.__ttl_seconds, version, ranklist)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_entries:
+            self.__entries.popitem(last = False)
@@ -1,11 +1,57 @@
-import { readGDriveFile } from "./gDrive";
+import { getGDriveFileVersion, readGDriveFile, readGDriveFileRange } from "./gDrive";
 import { parse } from "csv-parse/sync";
 import Degree from "@/models/Degree";
 import { connectToDatabase } from "./db";
 import mongoose from "mongoose";
 import Subject from "@/models/Subject";
+import StudentIndex, { StudentRowLocation } from "@/models/StudentIndex";
 import { NextResponse } from "next/server";
 
+interface RanklistLink {
+    file_id: string;
+    version: string;
+}
+
+interface CachedRanklist {
+    expiresAt: number;
+    version: string;
+    result: StudentRecord[];
+    subjects: Subject[];
+}
+
+// Ranklists served recently, key: result file id / college id. Cached ranklist is served until it expires and
+// while its version (md5 of precomputed ranklist file, or of result file if semester has no ranklist) is unchanged
+const ranklistCache = new Map<string, CachedRanklist>();
+const RANKLIST_CACHE_TTL_MS = Number(process.env.RANKLIST_CACHE_TTL_SECONDS ?? 300) * 1000;
+const RANKLIST_CACHE_MAX_ENTRIES = Number(process.env.RANKLIST_CACHE_MAX_ENTRIES ?? 256);
+
+function getCachedRanklist(key: string, version: string) {
+    const cached = ranklistCache.get(key);
+    if (!cached) {
+        return undefined;
+    }
+    ranklistCache.delete(key);
+    if (cached.expiresAt <= Date.now() || cached.version !== version) {
+        return undefined;
+    }
+
+    // Re-inserting keeps map in order of last use, so least recently served ranklist is dropped first
+    ranklistCache.set(key, cached);
+    return cached;
+}
+
+function setCachedRanklist(key: string, ranklist: Omit<CachedRanklist, "expiresAt">) {
+    if (RANKLIST_CACHE_TTL_MS <= 0 || RANKLIST_CACHE_MAX_ENTRIES <= 0) {
+        return;
+    }
+
+    ranklistCache.delete(key);
+    ranklistCache.set(key, { ...ranklist, expiresAt: Date.now() + RANKLIST_CACHE_TTL_MS });
+    while (ranklistCache.size > RANKLIST_CACHE_MAX_ENTRIES) {
+        ranklistCache.delete(ranklistCache.keys().next().value as string);
+    }
+}
+
 export class Result {
     public result: StudentRecord[];
     public subjects: Subject[];
@@ -18,31 +64,59 @@ export class Result {
     async fetchResult(college_id: string, degree_doc_id: string, result_file_id: string) {
         await connectToDatabase();
 
-        // Reading CSV
-        const records = await this.fetchNReadCSV(result_file_id)
+        // Fetching degree to get subject doc ids and ranklist of result file
+        const degree = await Degree.findOne({
+            _id: new mongoose.Types.ObjectId(degree_doc_id)
+        }).select('subjects sem_results sem_ranklists');
+        const ranklistLink = this.getRanklistLink(degree, result_file_id);
+
+        // Serving cached ranklist, if ranklist of result file (or result file itself when it has no ranklist) is
+        // not updated since
+        const version = ranklistLink ? ranklistLink.version : await getGDriveFileVersion(result_file_id);
+        const cacheKey = `${result_file_id}/${college_id}`;
+        const cached = version ? getCachedRanklist(cacheKey, version) : undefined;
+        if (cached) {
+            this.result = cached.result;
+            this.subjects = cached.subjects;
+            return;
+        }
+
+        // Reading precomputed ranklist (already sorted by cgpa) if result file has one, otherwise CSV
+        const records = ranklistLink ?
+            await this.fetchNReadRanklist(ranklistLink.file_id) :
+            await this.fetchNReadCSV(result_file_id);
         if (records.length == 0) {
             throw new Error("No Data Found")
         }
 
         // Getting all subject Data
         const subIDList = this.getAllSubjectsIDFromCSVHeader(records[0])
-        await this.fetchAllSubjectDataByDegree(subIDList, degree_doc_id)
+        await this.getAllSubjectData(subIDList, degree.subjects)
 
         // Filtering result (If college id is empty then return result of all colleges)
         const filteredRecords = college_id ?
             records.filter((row: StudentRecord) => row["college_id"] === college_id) :
             records;
         this.result = this.assignRanks(filteredRecords);
+
+        // Ranklist of unknown version can't be checked for updates, so it isn't cached
+        if (version) {
+            setCachedRanklist(cacheKey, {
+                version: version,
+                result: this.result,
+                subjects: this.subjects
+            });
+        }
     }
 
     async fetchStudentAllSemRes(studentRollNum: string) {
         await connectToDatabase();
 
         // Getting Student Info
-        const { degreeId, batchYear } = this.fetchStudentInfo(studentRollNum)
+        const { collegeId, degreeId, batchYear } = this.fetchStudentInfo(studentRollNum)
 
         // Getting Degree
-        const degree = await this.getDegreeByIDYear(degreeId, batchYear, 'subjects sem_results');
+        const degree = await this.getDegreeByIDYear(degreeId, batchYear, 'subjects sem_results sem_result_shards');
         if (!degree) {
             return NextResponse.json({
                 error: "Degree not found"
@@ -51,8 +125,8 @@ export class Result {
             });
         }
 
-        const sem_results: Record<string, string> = degree.sem_results;
-        if (!sem_results || Object.keys(sem_results).length === 0) {
+        const sem_results: Record<string, string> = this.getStudentResultFiles(degree, collegeId);
+        if (Object.keys(sem_results).length === 0) {
             return NextResponse.json({
                 error: "Semester results not found"
             }, {
@@ -60,6 +134,9 @@ export class Result {
             })
         }
 
+        // Getting rows of student in result files, so only those rows are read instead of whole files
+        const studentIndex = await StudentIndex.findById(studentRollNum).lean<{ semesters?: Record<string, StudentRowLocation> }>();
+
         // Fetching All Semester Result
         const subIDList = [];
         const studentSemResults: StudentRes = {
@@ -69,7 +146,10 @@ export class Result {
         for (const [sem, fileID] of Object.entries(sem_results)) {
             studentSemResults.results[sem] = {};
             try {
-                const records = await this.fetchNReadCSV(fileID);
+                const rowLocation = studentIndex?.semesters?.[sem];
+                const records = rowLocation?.file_id === fileID ?
+                    await this.fetchNReadStudentRow(rowLocation, studentRollNum) ?? await this.fetchNReadCSV(fileID) :
+                    await this.fetchNReadCSV(fileID);
                 await this.fetchStudentResult(records, studentRollNum);
 
                 studentSemResults.results[sem].results = this.result[0]
@@ -96,6 +176,55 @@ export class Result {
         });
     }
 
+    private async fetchNReadRanklist(fileID: string): Promise<StudentRecord[]> {
+        // Getting File Content
+        const fileContent: string = await readGDriveFile(fileID);
+
+        return JSON.parse(fileContent).records;
+    }
+
+    private getRanklistLink(degree: any, resultFileID: string): RanklistLink | undefined {
+        // Ranklist is used only if it is ranklist of requested result file
+        const sem = Object.keys(degree?.sem_results ?? {}).find(
+            sem => degree.sem_results[sem] === resultFileID
+        );
+        return sem ? degree.sem_ranklists?.[sem] : undefined;
+    }
+
+    private async fetchNReadStudentRow(rowLocation: StudentRowLocation, studentRollNum: string) {
+        // Reading header and row of student only
+        try {
+            const [header, row] = await Promise.all([
+                readGDriveFileRange(rowLocation.file_id, 0, rowLocation.header_length),
+                readGDriveFileRange(rowLocation.file_id, rowLocation.offset, rowLocation.length)
+            ]);
+            const records = parse(header + row, {
+                columns: true,
+                skip_empty_lines: true
+            });
+            if (records.length === 1 && records[0]["roll_num"] === studentRollNum) {
+                return records;
+            }
+        } catch {
+            // Range might be outside of file, if file was rewritten after index
+        }
+
+        // Index might be older than file, then whole file is read
+        return null;
+    }
+
+    private getStudentResultFiles(degree: any, collegeId: string): Record<string, string> {
+        // Result csv file of each semester, college shard of student is taken for sharded semesters
+        const sem_results: Record<string, string> = { ...(degree.sem_results ?? {}) };
+        for (const [sem, collegeShards] of Object.entries(degree.sem_result_shards ?? {})) {
+            const shardFileID = (collegeShards as Record<string, Record<string, string>>)[collegeId]?.csv;
+            if (shardFileID) {
+                sem_results[sem] = shardFileID;
+            }
+        }
+        return sem_results;
+    }
+
     private getAllSubjectsIDFromCSVHeader(firstRecord: any): string[] {
         const subIdList = Object.keys(firstRecord).filter(
             column => column.startsWith('sub_')
@@ -106,16 +235,6 @@ export class Result {
         return subIdList;
     }
 
-    private async fetchAllSubjectDataByDegree(subIDList: string[], degreeDocID: string) {
-        // Fetching degree to get subject doc ids
-        const degree = await Degree.findOne({
-            _id: new mongoose.Types.ObjectId(degreeDocID)
-        }).select('subjects');
-
-        // Fetching All Subject data
-        await this.getAllSubjectData(subIDList, degree.subjects);
-    }
-
     private async getAllSubjectData(subIDList: string[], subjects: Record<string, string>) {
         // Getting All Subject Doc IDs
         const subject_doc_id_array: string[] = [];
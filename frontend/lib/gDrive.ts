@@ -38,3 +38,28 @@ export async function readGDriveFile(fileID: string) {
     for await (const chunk of stream) chunks.push(chunk);
     return Buffer.concat(chunks).toString('utf-8');
 }
+
+export async function getGDriveFileVersion(fileID: string) {
+    // Asking only metadata of file, md5 of its content (or modified time for files without md5)
+    const res = await gDriveClient.files.get({
+        fileId: fileID,
+        fields: "md5Checksum, modifiedTime"
+    });
+
+    return res.data.md5Checksum ?? res.data.modifiedTime ?? undefined;
+}
+
+export async function readGDriveFileRange(fileID: string, offset: number, length: number) {
+    // Reading only given bytes of file
+    const res = await gDriveClient.files.get({
+        fileId: fileID,
+        alt: "media"
+    }, {
+        responseType: 'arraybuffer',
+        headers: {
+            Range: `bytes=${offset}-${offset + length - 1}`
+        }
+    });
+
+    return Buffer.from(res.data as ArrayBuffer).toString('utf-8');
+}
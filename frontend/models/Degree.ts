@@ -16,6 +16,9 @@ export interface IDegree extends Document {
     colleges: CollegeData[];
     subjects: Record<string, string>;
     sem_results: Record<string, string>;
+    sem_results_parquet?: Record<string, string>;
+    sem_result_shards?: Record<string, Record<string, Record<string, string>>>;
+    sem_ranklists?: Record<string, { file_id: string; version: string }>;
     batch_year: number;
     batch_id: string;
     folder_id: string;
@@ -37,6 +40,9 @@ const DegreeSchema = new Schema<IDegree>({
     colleges: { type: [CollegeDataSchema], required: false },
     subjects: { type: Object, required: false },
     sem_results: { type: Object, required: false },
+    sem_results_parquet: { type: Object, required: false },
+    sem_result_shards: { type: Object, required: false },
+    sem_ranklists: { type: Object, required: false },
     batch_year: { type: Number, required: true },
     batch_id: { type: String, required: true },
     folder_id: { type: String, required: false },
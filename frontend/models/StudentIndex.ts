@@ -0,0 +1,19 @@
+import mongoose, { Schema, Document } from 'mongoose';
+
+export interface StudentRowLocation {
+    file_id: string;
+    header_length: number;
+    offset: number;
+    length: number;
+}
+
+export interface IStudentIndex extends Document<string> {    // _id is roll number
+    semesters: Record<string, StudentRowLocation>;
+}
+
+const StudentIndexSchema = new Schema<IStudentIndex>({
+    _id: { type: String, required: true },
+    semesters: { type: Object, required: false },
+});
+
+export default mongoose.models.StudentIndex || mongoose.model<IStudentIndex>('StudentIndex', StudentIndexSchema, 'student_index');
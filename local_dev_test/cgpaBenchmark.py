@@ -0,0 +1,116 @@
+import random
+import time
+import pandas as pd
+import numpy as np
+from ast import literal_eval
+from result_parser.lib import result_frame
+from result_parser.lib.result_frame import GRADE_RATING_GGSIPU
+
+GRADES = list(GRADE_RATING_GGSIPU.keys())
+
+def legacy_calculate_cgpa(result_df: pd.DataFrame, sub_id_max_marks_map: dict[str, int]):
+    """
+    It is the earlier literal_eval per cell implementation, kept here to compare with
+    """
+
+    def safe_literal_eval(x):
+        try:
+            return literal_eval(str(x))
+        except (ValueError, SyntaxError):
+            return None
+
+    subject_columns = [col for col in result_df.columns if col.startswith('sub_')]
+
+    result_df['total_marks_scored'] = 0
+    result_df['max_marks_possible'] = 0
+    result_df['total_credits'] = 0
+    result_df['weighted_grade_points'] = 0.0
+
+    for sub in subject_columns:
+        sub_id = sub.replace("sub_", "")
+        valid = result_df[sub].dropna()
+        valid = valid[valid.str.strip() != '']
+        if valid.empty:
+            continue
+
+        parsed = valid.apply(safe_literal_eval).dropna()
+        if parsed.empty:
+            continue
+
+        internal = parsed.apply(lambda x: x[0])
+        external = parsed.apply(lambda x: x[1])
+        grade    = parsed.apply(lambda x: x[2])
+        credit   = parsed.apply(lambda x: x[3])
+
+        result_df.loc[parsed.index, 'total_marks_scored'] += internal + external
+        result_df.loc[parsed.index, 'max_marks_possible'] += sub_id_max_marks_map[sub_id]
+        result_df.loc[parsed.index, 'total_credits'] += credit
+        result_df.loc[parsed.index, 'weighted_grade_points'] += credit * grade.map(GRADE_RATING_GGSIPU)
+
+    result_df['cgpa'] = (result_df['weighted_grade_points'] / result_df['total_credits']).round(2)
+    result_df['cgpa'] = result_df['cgpa'].where(result_df['total_credits'] > 0, np.nan)
+    result_df.drop(columns=['total_credits', 'weighted_grade_points'], inplace=True)
+
+def generate_student_records(num_students: int, num_subjects: int, seed: int = 7) -> tuple[list[dict], dict[str, int]]:
+    """
+    It will generate random student records, some students have missing subjects like in real results
+    """
+
+    rand = random.Random(seed)
+    sub_ids = [f"{rand.randint(100000, 999999)}" for _ in range(num_subjects)]
+    sub_id_max_marks_map = { sub_id: 100 for sub_id in sub_ids }
+
+    student_result_list = []
+    for student_index in range(num_students):
+        student = {
+            'roll_num': f"{student_index:011d}",
+            'name': f"STUDENT {student_index}",
+            'college_id': '',
+            'total_marks_scored': 0,
+            'max_marks_possible': 0,
+            'cgpa': 0.00,
+        }
+        for sub_id in sub_ids:
+            if rand.random() < 0.05:
+                continue
+            internal, external = rand.randint(0, 25), rand.randint(0, 75)
+            student[f"sub_{sub_id}"] = [internal, external, rand.choice(GRADES), rand.choice([2, 3, 4]), internal + external, '']
+        student_result_list.append(student)
+
+    return student_result_list, sub_id_max_marks_map
+
+def run_benchmark(num_students: int = 5000, num_subjects: int = 12):
+    student_result_list, sub_id_max_marks_map = generate_student_records(num_students, num_subjects)
+
+    legacy_df = pd.DataFrame(student_result_list, dtype=str)
+    start = time.perf_counter()
+    legacy_calculate_cgpa(legacy_df, sub_id_max_marks_map)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columnar_df = result_frame.from_student_records(student_result_list)
+    result_frame.calculate_cgpa(columnar_df, sub_id_max_marks_map)
+    vectorized_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reparsed_df = result_frame.to_columnar(legacy_df)
+    result_frame.calculate_cgpa(reparsed_df, sub_id_max_marks_map)
+    reparse_time = time.perf_counter() - start
+
+    for col in ['total_marks_scored', 'max_marks_possible', 'cgpa']:
+        np.testing.assert_allclose(legacy_df[col].to_numpy(dtype = float), columnar_df[col].to_numpy(dtype = float))
+        np.testing.assert_allclose(legacy_df[col].to_numpy(dtype = float), reparsed_df[col].to_numpy(dtype = float))
+
+    # Result file written from columnar dataframe must have same subject cells as earlier
+    legacy_cells = pd.DataFrame(student_result_list, dtype=str)
+    written_df = result_frame.to_legacy(columnar_df)
+    for sub_col in result_frame.get_subject_columns(legacy_cells):
+        pd.testing.assert_series_equal(legacy_cells[sub_col], written_df[sub_col], check_dtype = False)
+
+    print(f"Students: {num_students}, subjects: {num_subjects}")
+    print(f"literal_eval per cell     : {legacy_time * 1000:.1f} ms")
+    print(f"columnar from records     : {vectorized_time * 1000:.1f} ms ({legacy_time / vectorized_time:.1f}x)")
+    print(f"columnar from result file : {reparse_time * 1000:.1f} ms ({legacy_time / reparse_time:.1f}x)")
+
+if __name__ == "__main__":
+    run_benchmark()
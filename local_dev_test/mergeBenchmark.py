@@ -0,0 +1,136 @@
+import random
+import time
+import pandas as pd
+import numpy as np
+from ast import literal_eval
+from result_parser.lib import result_frame
+from local_dev_test.cgpaBenchmark import GRADES, generate_student_records, legacy_calculate_cgpa
+
+def legacy_merge_dataframes(original_df: pd.DataFrame, new_df: pd.DataFrame, sub_id_max_marks_map: dict[str, int]):
+    """
+    It is the earlier roll number x subject loop implementation, kept here to compare with
+    """
+
+    original_df.set_index("roll_num", inplace = True)
+    new_df.set_index("roll_num", inplace = True)
+
+    def parse_subject(val):
+        try:
+            return literal_eval(val)
+        except (ValueError, SyntaxError):
+            return np.nan
+
+    subject_cols = [col for col in new_df.columns if col.startswith("sub_")]
+    for col in subject_cols:
+        if col not in original_df.columns:
+            original_df[col] = np.nan
+            original_df[col] = original_df[col].astype(object)
+
+    for col in subject_cols:
+        new_df[col] = new_df[col].apply(parse_subject)
+        original_df[col] = original_df[col].apply(parse_subject)
+        original_df[col] = original_df[col].astype(object)
+
+    students_for_update = new_df.index.intersection(original_df.index)
+    new_students = new_df.index.difference(original_df.index)
+
+    for roll_num in students_for_update:
+        for col in subject_cols:
+            updated_sub = new_df.at[roll_num, col]
+            orig_sub = original_df.at[roll_num, col]
+            if isinstance(updated_sub, list):
+                if not isinstance(orig_sub, list) or updated_sub[1] > orig_sub[1]:
+                    original_df.at[roll_num, col] = updated_sub
+
+    parts = [original_df, new_df.loc[new_students]]
+    updated_df = pd.concat(
+        [df for df in parts if not df.empty],
+        ignore_index = False,
+        join = "outer"
+    )
+    legacy_calculate_cgpa(updated_df, sub_id_max_marks_map)
+    updated_df.reset_index(inplace = True)
+
+    return updated_df
+
+def generate_supplementary_records(
+    student_result_list: list[dict],
+    sub_id_max_marks_map: dict[str, int],
+    num_new_students: int,
+    seed: int = 11
+) -> list[dict]:
+    """
+    It will generate reappear/rechecking records for some of given students, a new subject and few new students
+    """
+
+    rand = random.Random(seed)
+    sub_ids = list(sub_id_max_marks_map.keys())
+    new_sub_id = "999999"
+    sub_id_max_marks_map[new_sub_id] = 100
+
+    supplementary_list = []
+    reappearing_students = rand.sample(student_result_list, len(student_result_list) // 4)
+    for index, student in enumerate(reappearing_students + [None] * num_new_students):
+        roll_num = student['roll_num'] if student else f"{90000000000 + index:011d}"
+        supplementary = {
+            'roll_num': roll_num,
+            'name': student['name'] if student else f"NEW STUDENT {index}",
+            'college_id': '',
+            'total_marks_scored': 0,
+            'max_marks_possible': 0,
+            'cgpa': 0.00,
+        }
+        for sub_id in rand.sample(sub_ids, 3) + [new_sub_id]:
+            internal, external = rand.randint(0, 25), rand.randint(0, 75)
+            supplementary[f"sub_{sub_id}"] = [internal, external, rand.choice(GRADES), rand.choice([2, 3, 4]), internal + external, '']
+        supplementary_list.append(supplementary)
+
+    return supplementary_list
+
+def read_result_file(result_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    It will write and read back result dataframe as csv, as merge reads result file from drive
+    """
+
+    return pd.read_csv(
+        pd.io.common.StringIO(result_df.to_csv(index = False)),
+        dtype = {"roll_num": "string", "college_id": "string"}
+    )
+
+def run_benchmark(num_students: int = 5000, num_subjects: int = 12, num_new_students: int = 200):
+    student_result_list, sub_id_max_marks_map = generate_student_records(num_students, num_subjects)
+    original_df = result_frame.from_student_records(student_result_list)
+    result_frame.calculate_cgpa(original_df, sub_id_max_marks_map)
+    original_file_df = read_result_file(result_frame.to_legacy(original_df))
+
+    supplementary_list = generate_supplementary_records(student_result_list, sub_id_max_marks_map, num_new_students)
+
+    start = time.perf_counter()
+    legacy_df = legacy_merge_dataframes(
+        original_file_df.copy(),
+        pd.DataFrame(supplementary_list, dtype=str),
+        sub_id_max_marks_map
+    )
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    merged_df = result_frame.merge_supplementary(
+        result_frame.to_columnar(original_file_df),
+        result_frame.from_student_records(supplementary_list)
+    )
+    result_frame.calculate_cgpa(merged_df, sub_id_max_marks_map)
+    merged_file_df = result_frame.to_legacy(merged_df)
+    columnar_time = time.perf_counter() - start
+
+    # Both must write same result file
+    legacy_file_df = read_result_file(legacy_df)
+    merged_file_df = read_result_file(merged_file_df)
+    assert list(legacy_file_df.columns) == list(merged_file_df.columns), "Columns are not same"
+    pd.testing.assert_frame_equal(legacy_file_df, merged_file_df, check_dtype = False)
+
+    print(f"Students: {num_students}, subjects: {num_subjects}, supplementary records: {len(supplementary_list)}")
+    print(f"roll number x subject loop : {legacy_time * 1000:.1f} ms")
+    print(f"columnar merge             : {columnar_time * 1000:.1f} ms ({legacy_time / columnar_time:.1f}x)")
+
+if __name__ == "__main__":
+    run_benchmark()
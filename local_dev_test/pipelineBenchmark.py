@@ -0,0 +1,257 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import resource
+import tempfile
+import statistics
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from result_parser.lib.env import ENV
+from result_parser.lib import result_db
+from result_parser.lib.result_db import get_sem_result_files, RESULT_FILE_FIELDS
+from result_parser.lib.result_buffer import ResultWriteBuffer
+from result_parser.lib.result_files import read_result_file
+from result_parser.lib.storage_backend import LocalBackend, get_storage_backend, close_storage_backends
+from result_parser.lib.tracing import trace_pdf
+from result_parser.lib.logger import parser_logger, result_db_logger, tracing_logger
+from result_parser.pdfDataParser import ipuDataParser
+from result_parser.pdfDataParser.pdfParser import PDFParser
+from result_parser.pdfDataParser.pageExtractor import PageExtractor, LazyPage
+from local_dev_test.syntheticResultPdf import generate_result_pdf
+
+STAGES = ("open_pdf", "extract", "parse", "store", "flush")
+
+class StageTimer:
+    """
+    Time spent in each stage of a run, parse time is what is left of total after other stages
+    """
+
+    def __init__(self):
+        self.times = { stage: 0.0 for stage in STAGES }
+
+    def add(self, stage: str, time_taken: float):
+        self.times[stage] += time_taken
+
+class TimedPageExtractor(PageExtractor):
+    """
+    Page extractor timing how long parser waits for page text and tables
+    """
+
+    def __init__(self, page_extractor: PageExtractor, stage_timer: StageTimer):
+        self.__page_extractor = page_extractor
+        self.__stage_timer = stage_timer
+
+    def __len__(self) -> int:
+        return len(self.__page_extractor)
+
+    async def get_page(self, page_index: int) -> LazyPage:
+        start = time.perf_counter()
+        page = await self.__page_extractor.get_page(page_index)
+        self.__stage_timer.add("extract", time.perf_counter() - start)
+
+        async def table_loader():
+            start = time.perf_counter()
+            table = await page.get_table()
+            self.__stage_timer.add("extract", time.perf_counter() - start)
+            return table
+
+        return LazyPage(page.text, table_loader)
+
+    def close(self):
+        self.__page_extractor.close()
+
+def _get_peak_rss_mb() -> float:
+    """
+    It will return peak resident memory of this process (kilobytes on linux), page extraction worker processes
+    are not included
+    """
+
+    scale = 1 if sys.platform != "darwin" else 1 / 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1024, 1)
+
+def _get_git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd = os.path.dirname(os.path.abspath(__file__)), capture_output = True, text = True, check = True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _use_fresh_storage(run_folder_path: str):
+    """
+    It will point Result_DB to an empty local storage backend and result folder, and drop run state (caches and
+    buffered results) kept from earlier run, so every run stores results from scratch
+    """
+
+    close_storage_backends()
+    ENV.STORAGE_BACKEND = LocalBackend.name
+    ENV.LOCAL_STORAGE_PATH = os.path.join(run_folder_path, "local_storage")
+    ENV.LOCAL_RESULT_FOLDER_PATH = os.path.join(run_folder_path, "results")
+    os.makedirs(ENV.LOCAL_RESULT_FOLDER_PATH, exist_ok = True)
+
+    result_db.subject_catalogs.clear()
+    result_db.metadata_caches.clear()
+    result_db.result_buffer = ResultWriteBuffer()
+
+async def _count_stored_results(storage_backend: LocalBackend) -> tuple[int, int]:
+    """
+    It will return number of result files linked with degrees, and number of result rows in them
+    """
+
+    result_files = result_rows = 0
+    for degree_doc in await storage_backend.degree_collec.find({}).to_list(length = None):
+        sem_keys = { sem_key for field in RESULT_FILE_FIELDS for sem_key in (degree_doc.get(field) or {}) }
+        for sem_key in sem_keys:
+            result_shards, result_file_ids = get_sem_result_files(degree_doc, sem_key)
+            for file_ids in [*result_shards.values(), result_file_ids]:
+                result_df = await read_result_file(storage_backend.file_store, file_ids)
+                if result_df is not None:
+                    result_files += 1
+                    result_rows += len(result_df)
+    return result_files, result_rows
+
+async def run_pipeline(pdf_path: str, workers: int, executor: ProcessPoolExecutor | None = None) -> dict:
+    """
+    It will run PDFParser and IPU_Result_Parser on given pdf with real Result_DB over a fresh local storage
+    backend, and return stage times of the run. Store and flush times are taken from spans of pdf trace
+    """
+
+    stage_timer = StageTimer()
+
+    run_start = time.perf_counter()
+    with trace_pdf(pdf_path, metrics_file_path = None) as trace:
+        pdf_parser = PDFParser(filePath = pdf_path)
+        pdf_parser.parsePdf()
+        stage_timer.add("open_pdf", time.perf_counter() - run_start)
+
+        parser = ipuDataParser.IPU_Result_Parser(
+            session_start = 2020,
+            page_extractor = TimedPageExtractor(pdf_parser.get_page_extractor(max_workers = workers, executor = executor), stage_timer)
+        )
+        await parser.start()
+    total_time = time.perf_counter() - run_start
+
+    spans = trace.summary()["spans"]
+    stage_timer.add("store", spans.get("parser.store_section", {}).get("total_seconds", 0.0))
+    stage_timer.add("flush", spans.get("parser.flush_results", {}).get("total_seconds", 0.0))
+    stage_timer.times["parse"] = total_time - sum(time_taken for stage, time_taken in stage_timer.times.items() if stage != "parse")
+
+    result_files, result_rows = await _count_stored_results(get_storage_backend(LocalBackend.name))
+    return {
+        "total_seconds": round(total_time, 4),
+        "stage_seconds": { stage: round(time_taken, 4) for stage, time_taken in stage_timer.times.items() },
+        "result_files": result_files,
+        "result_rows": result_rows
+    }
+
+def run_benchmark(
+    num_sections: int,
+    students_per_section: int,
+    subjects_per_section: int,
+    workers: int,
+    repeat: int
+) -> dict:
+    """
+    It will generate synthetic result pdf and run whole ingestion pipeline on it, repeat times
+    """
+
+    # Parser stores results through real Result_DB into a local storage backend of each run. Info logs of every
+    # page are skipped, so console output doesn't dominate timings
+    for logger in (parser_logger, result_db_logger, tracing_logger):
+        logger.setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_folder_path:
+        pdf_path = os.path.join(tmp_folder_path, "synthetic_result.pdf")
+        pdf_size = generate_result_pdf(pdf_path, num_sections, students_per_section, subjects_per_section)
+
+        executor = ProcessPoolExecutor(max_workers = workers) if workers > 1 else None
+        runs = []
+        try:
+            for run_index in range(repeat):
+                _use_fresh_storage(os.path.join(tmp_folder_path, f"run_{run_index}"))
+                runs.append(asyncio.run(run_pipeline(pdf_path, workers, executor)))
+        finally:
+            close_storage_backends()
+            if executor:
+                executor.shutdown(wait = True)
+
+    # Every student of synthetic pdf must end up in result files, otherwise parsing is broken and timings are meaningless
+    for run in runs:
+        if run["result_rows"] != pdf_size["students"]:
+            raise ValueError(f"{run['result_rows']} students stored out of {pdf_size['students']} students of synthetic pdf")
+
+    median_seconds = statistics.median(run["total_seconds"] for run in runs)
+    return {
+        "commit": _get_git_commit(),
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()),
+        "python": sys.version.split()[0],
+        "config": {
+            "sections": num_sections,
+            "students_per_section": students_per_section,
+            "subjects_per_section": subjects_per_section,
+            "workers": workers,
+            "repeat": repeat
+        },
+        "pdf": pdf_size,
+        "runs": runs,
+        "summary": {
+            "median_seconds": round(median_seconds, 4),
+            "pages_per_second": round(pdf_size["pages"] / median_seconds, 2),
+            "students_per_second": round(pdf_size["students"] / median_seconds, 2),
+            "median_stage_seconds": {
+                stage: round(statistics.median(run["stage_seconds"][stage] for run in runs), 4) for stage in STAGES
+            },
+            "peak_rss_mb": _get_peak_rss_mb()
+        }
+    }
+
+def compare_reports(report: dict, baseline_report: dict):
+    """
+    It will print change of throughput and stage times against a baseline report
+    """
+
+    summary, baseline_summary = report["summary"], baseline_report["summary"]
+    print(f"Compared with {baseline_report.get('commit')} ({baseline_report.get('timestamp')}):")
+    for metric in ("pages_per_second", "students_per_second"):
+        print(f"  {metric:<20}: {baseline_summary[metric]} -> {summary[metric]} ({(summary[metric] / baseline_summary[metric] - 1) * 100:+.1f}%)")
+    for stage in STAGES:
+        before, after = baseline_summary["median_stage_seconds"][stage], summary["median_stage_seconds"][stage]
+        print(f"  {stage:<20}: {before:.4f}s -> {after:.4f}s")
+    if report["config"] != baseline_report["config"]:
+        print("  Warning: benchmark config differs from baseline")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description = "Benchmark of pdf ingestion pipeline on synthetic GGSIPU result pdf")
+    arg_parser.add_argument("--sections", type = int, default = 6)
+    arg_parser.add_argument("--students", type = int, default = 60, help = "students per section")
+    arg_parser.add_argument("--subjects", type = int, default = 8, help = "subjects per section")
+    arg_parser.add_argument("--workers", type = int, default = 1, help = "page extraction worker processes, 1 extracts serially")
+    arg_parser.add_argument("--repeat", type = int, default = 3)
+    arg_parser.add_argument("--output", default = "", help = "report json path (default benchmark_results/<commit>_<time>.json)")
+    arg_parser.add_argument("--compare", default = "", help = "earlier report json to compare with")
+    args = arg_parser.parse_args()
+
+    report = run_benchmark(args.sections, args.students, args.subjects, args.workers, args.repeat)
+
+    output_path = args.output or os.path.join(
+        "benchmark_results", f"{report['commit'] or 'unknown'}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok = True)
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent = 4)
+
+    summary = report["summary"]
+    print(f"Pages: {report['pdf']['pages']}, students: {report['pdf']['students']}, workers: {args.workers}")
+    print(f"Median run: {summary['median_seconds']}s, {summary['pages_per_second']} pages/s, {summary['students_per_second']} students/s")
+    print(f"Stage times: {summary['median_stage_seconds']}")
+    print(f"Peak RSS of main process (MB): {summary['peak_rss_mb']}")
+    print(f"Report saved to {output_path}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            compare_reports(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
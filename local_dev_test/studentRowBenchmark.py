@@ -0,0 +1,191 @@
+import re
+import random
+import asyncio
+import timeit
+import tracemalloc
+import pandas as pd
+from result_parser.lib import result_frame
+from result_parser.lib.utils import standardize_subject_code
+from result_parser.pdfDataParser import ipuPatterns
+from result_parser.pdfDataParser.ipuDataParser import IPU_Result_Parser
+
+SUBJECT_CELLS = [
+    "ES-101 (4)", "BS-105\n(4)", "HS - 111 (1)", "ES 113 (3)", "BS-151 (1)",
+    "ES-153 (2)", "ES\n-155 (1)", "BS-157(1)", "ES-159 (1)", "HS-161 (2)"
+]
+GRADE_CELLS = ["{} (A+)", "{} (O)", "{}* (B)", "{} (P)", "{} (F)", "ABS (F)"]
+
+class FakeResultDB:
+    """
+    Only subject lookups of Result_DB, which are used while parsing student rows
+    """
+
+    def __init__(self, subject_id_code_map: dict[str, str]):
+        self.subject_id_code_map = subject_id_code_map
+        self.sub_id_max_marks_map = { subject_id: 100 for subject_id in subject_id_code_map.values() }
+
+    async def get_subject_id_by_code(self, subject_code: str, batch_year: int):
+        return None
+
+def legacy_clean_subject_code(raw_subject_code: str) -> str:
+    text = re.sub(r'(?<=\w)[\s\n]+(?=\w)', '', raw_subject_code)
+    text = re.sub(r'(?<=\d)[.\n]+(?=\d)', '', text)
+    match = re.search(r'[A-Z][A-Z.\-/()&]*\s*\d*', text, flags=re.IGNORECASE)
+    return match.group().replace(' ', '') if match else None
+
+def legacy_standardize_subject_code(code: str) -> str:
+    code = code.strip()
+    match = re.match(r'^([A-Za-z0-9\s\-\(\)\.\/]+?)(\d+(?:\.\d+)?)$', code)
+    if match:
+        cleaned_prefix = re.sub(r'[^A-Za-z0-9\(\)]', '', match.group(1)).upper()
+        return f"{cleaned_prefix}-{match.group(2)}"
+    return code
+
+def legacy_parse_subject_cell(raw_subject_cell: str) -> tuple[str, float | int]:
+    """
+    It is the earlier per student parsing of subject cell, kept here to compare with
+    """
+
+    raw_subject_cell = re.sub(r'\s+', ' ', raw_subject_cell).strip()
+    credit_match = re.search(r'\((\d+(?:\.\d+)?)\)', raw_subject_cell)
+    subject_part = raw_subject_cell[:credit_match.start()] if credit_match else raw_subject_cell
+    credit = credit_match.group(1) if credit_match else ''
+    credit = (float(credit) if '.' in credit else int(credit)) if credit else 0
+
+    subject_code = subject_part.replace(' ', '')
+    if subject_code and not subject_code.isdigit():
+        subject_code = legacy_standardize_subject_code(legacy_clean_subject_code(subject_code))
+    return subject_code, credit
+
+def legacy_parse_student_row(
+    student_n_subject_detail: list[str],
+    student_int_ext_marks: list[str],
+    student_total_marks_n_grade: list[str],
+    subject_id_code_map: dict[str, str]
+) -> dict:
+    """
+    It is the earlier student row parsing with regex literals, without warnings and database fallbacks
+    """
+
+    detail_match = re.match(r'(\d+)\s+(.+?)\s+SID:', student_n_subject_detail[1], re.DOTALL)
+    student = {
+        'roll_num': detail_match.group(1).strip(),
+        'name': detail_match.group(2).replace('\n', ' ').strip(),
+        'college_id': '',
+        'total_marks_scored': 0,
+        'max_marks_possible': 0,
+        'cgpa': 0.00
+    }
+
+    for subject_start_index in range(2, len(student_n_subject_detail), 2):
+        subject_code, credit = legacy_parse_subject_cell(student_n_subject_detail[subject_start_index])
+        subject_id = subject_id_code_map[subject_code]
+
+        internal_marks = int(student_int_ext_marks[subject_start_index])
+        external_marks = int(student_int_ext_marks[subject_start_index + 1])
+        grade_match = re.match(r'(-?\d+|CAN|ABS|RL|DET|C|A|D)(?:\s*\*?\s*\(([ABCFPO]\+?)\))?', student_total_marks_n_grade[subject_start_index])
+        total_marks_str, grade = grade_match.group(1), grade_match.group(2)
+
+        status = ''
+        total_marks = int(total_marks_str) if total_marks_str.lstrip('-').isdigit() else 0
+        if not total_marks_str.lstrip('-').isdigit():
+            status = total_marks_str
+        student[f'sub_{subject_id}'] = [internal_marks, external_marks, (grade or '').strip(), credit, total_marks, status]
+    return student
+
+def generate_result_table(num_students: int, seed: int = 7) -> tuple[list[list[str]], dict[str, str]]:
+    """
+    It will generate result table of a student result page, every student takes three rows like in real pdfs
+    """
+
+    rand = random.Random(seed)
+    subject_id_code_map = { legacy_parse_subject_cell(cell)[0]: f"{100000 + index}" for index, cell in enumerate(SUBJECT_CELLS) }
+
+    result_table = [["", "header"]]
+    for student_index in range(num_students):
+        detail_row, marks_row, grade_row = ["", f"{student_index:011d} STUDENT\nNAME {student_index} SID: {rand.randint(1, 99999)}"], ["", ""], ["", ""]
+        for subject_cell in SUBJECT_CELLS:
+            internal, external = rand.randint(0, 25), rand.randint(0, 75)
+            detail_row += [subject_cell, ""]
+            marks_row += [str(internal), str(external)]
+            grade_row += [rand.choice(GRADE_CELLS).format(internal + external), ""]
+        result_table += [detail_row, marks_row, grade_row]
+    return result_table, subject_id_code_map
+
+def parse_with_parser(parser: IPU_Result_Parser, result_table: list[list[str]]) -> pd.DataFrame:
+    """
+    It will parse student rows of result table with student row methods of parser, memo is per page so it is cleared first
+    """
+
+    parser._IPU_Result_Parser__subject_cell_memo.clear()
+    parser._IPU_Result_Parser__section_result.clear()
+
+    async def parse_rows():
+        for student_index in range(1, len(result_table), 3):
+            await parser._IPU_Result_Parser__extract_student_result(*result_table[student_index:student_index + 3])
+
+    asyncio.run(parse_rows())
+    return parser._IPU_Result_Parser__section_result.to_frame()
+
+def parse_with_legacy(result_table: list[list[str]], subject_id_code_map: dict[str, str]) -> pd.DataFrame:
+    """
+    It will parse student rows into a dict per student and then build columnar dataframe from them, as done earlier
+    """
+
+    legacy_students = [
+        legacy_parse_student_row(*result_table[student_index:student_index + 3], subject_id_code_map)
+        for student_index in range(1, len(result_table), 3)
+    ]
+    return result_frame.from_student_records(legacy_students)
+
+def measure(func, *args) -> tuple[object, float, int]:
+    """
+    It will return result, time taken and peak memory allocated by given function
+    """
+
+    tracemalloc.start()
+    start = timeit.default_timer()
+    result = func(*args)
+    time_taken = timeit.default_timer() - start
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, time_taken, peak_memory
+
+def run_micro_benchmarks(number: int = 20000):
+    """
+    It will time each hot pattern with regex literal against precompiled pattern
+    """
+
+    detail_cell = "01234567890 STUDENT\nNAME SID: 12345"
+    subject_cell = "ES\n-155 (1)"
+    grade_cell = "87* (A+)"
+
+    cases = [
+        ("student detail", lambda: re.match(r'(\d+)\s+(.+?)\s+SID:', detail_cell, re.DOTALL), lambda: ipuPatterns.STUDENT_DETAIL_PATTERN.match(detail_cell)),
+        ("grade", lambda: re.match(r'(-?\d+|CAN|ABS|RL|DET|C|A|D)(?:\s*\*?\s*\(([ABCFPO]\+?)\))?', grade_cell), lambda: ipuPatterns.GRADE_PATTERN.match(grade_cell)),
+        ("credit", lambda: re.search(r'\((\d+(?:\.\d+)?)\)', subject_cell), lambda: ipuPatterns.CREDIT_PATTERN.search(subject_cell)),
+        ("standardize subject code", lambda: legacy_standardize_subject_code("ES-155"), lambda: standardize_subject_code("ES-155")),
+    ]
+    for name, legacy_func, compiled_func in cases:
+        legacy_time = timeit.timeit(legacy_func, number = number)
+        compiled_time = timeit.timeit(compiled_func, number = number)
+        print(f"{name:<25}: {legacy_time / number * 1e6:.2f} us -> {compiled_time / number * 1e6:.2f} us ({legacy_time / compiled_time:.1f}x)")
+
+def run_benchmark(num_students: int = 2000):
+    result_table, subject_id_code_map = generate_result_table(num_students)
+
+    parser = IPU_Result_Parser(pdf_pages_list = [None])
+    parser._IPU_Result_Parser__res_db = FakeResultDB(subject_id_code_map)
+
+    legacy_df, legacy_time, legacy_memory = measure(parse_with_legacy, result_table, subject_id_code_map)
+    parsed_df, parser_time, parser_memory = measure(parse_with_parser, parser, result_table)
+
+    pd.testing.assert_frame_equal(parsed_df, legacy_df)
+
+    print(f"Students: {num_students}, subjects: {len(SUBJECT_CELLS)}")
+    print(f"regex literals, dict per student: {legacy_time * 1000:.1f} ms, peak {legacy_memory / 1024 / 1024:.1f} MB")
+    print(f"compiled patterns, typed columns: {parser_time * 1000:.1f} ms ({legacy_time / parser_time:.1f}x), peak {parser_memory / 1024 / 1024:.1f} MB")
+    run_micro_benchmarks()
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,196 @@
+import random
+import zlib
+
+# Landscape A4 in points
+PAGE_WIDTH = 842
+PAGE_HEIGHT = 595
+MARGIN = 20
+FONT_SIZE = 5.5
+LINE_HEIGHT = 7
+
+SEMESTER_NAMES = ["FIRST", "SECOND", "THIRD", "FOURTH", "FIFTH", "SIXTH", "SEVENTH", "EIGHTH"]
+GRADES = [(90, 'O'), (75, 'A+'), (65, 'A'), (55, 'B+'), (50, 'B'), (45, 'C'), (40, 'P'), (0, 'F')]
+
+class SimplePdfWriter:
+    """
+    Minimal pdf writer with a single Helvetica font, enough to write text and ruled tables which pdfplumber reads
+    like tables of GGSIPU result pdfs. It is used instead of a pdf library, so benchmark needs no extra dependency
+    """
+
+    def __init__(self):
+        self.__page_streams: list[bytes] = []
+        self.__ops: list[str] = []
+
+    @staticmethod
+    def __escape(text: str) -> str:
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    def text(self, x: float, y: float, text: str, font_size: float = FONT_SIZE):
+        """
+        It will write single line text, y is from top of page
+        """
+
+        self.__ops.append(f"BT /F1 {font_size} Tf {x:.2f} {PAGE_HEIGHT - y:.2f} Td ({self.__escape(text)}) Tj ET")
+
+    def line(self, x1: float, y1: float, x2: float, y2: float):
+        self.__ops.append(f"{x1:.2f} {PAGE_HEIGHT - y1:.2f} m {x2:.2f} {PAGE_HEIGHT - y2:.2f} l S")
+
+    def table(self, top: float, col_widths: list[float], rows: list[list[str]], row_heights: list[float]):
+        """
+        It will draw a ruled table, cell text can have multiple lines separated by newline
+        """
+
+        x_positions = [MARGIN]
+        for col_width in col_widths:
+            x_positions.append(x_positions[-1] + col_width)
+        y_positions = [top]
+        for row_height in row_heights:
+            y_positions.append(y_positions[-1] + row_height)
+
+        for y in y_positions:
+            self.line(x_positions[0], y, x_positions[-1], y)
+        for x in x_positions:
+            self.line(x, y_positions[0], x, y_positions[-1])
+
+        for row_index, row in enumerate(rows):
+            for col_index, cell in enumerate(row):
+                for line_index, cell_line in enumerate(cell.split("\n") if cell else []):
+                    self.text(x_positions[col_index] + 1.5, y_positions[row_index] + LINE_HEIGHT * (line_index + 1), cell_line)
+
+    def end_page(self):
+        self.__page_streams.append(zlib.compress("\n".join(self.__ops).encode("latin-1")))
+        self.__ops = []
+
+    def save(self, file_path: str):
+        """
+        It will write every ended page into pdf file
+        """
+
+        num_pages = len(self.__page_streams)
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            f"<< /Type /Pages /Kids [{' '.join(f'{4 + 2 * page_index} 0 R' for page_index in range(num_pages))}] /Count {num_pages} >>".encode(),
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+        ]
+        for page_index, page_stream in enumerate(self.__page_streams):
+            objects.append(
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] /CropBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * page_index} 0 R >>".encode()
+            )
+            objects.append(f"<< /Length {len(page_stream)} /Filter /FlateDecode >>\nstream\n".encode() + page_stream + b"\nendstream")
+
+        content = bytearray(b"%PDF-1.4\n")
+        offsets = []
+        for object_index, obj in enumerate(objects):
+            offsets.append(len(content))
+            content += f"{object_index + 1} 0 obj\n".encode() + obj + b"\nendobj\n"
+
+        xref_offset = len(content)
+        content += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+        content += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+        content += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+
+        with open(file_path, "wb") as f:
+            f.write(content)
+
+def _marks_to_grade(marks: int) -> str:
+    return next(grade for threshold, grade in GRADES if marks >= threshold)
+
+def _write_scheme_page(pdf: SimplePdfWriter, section: dict):
+    pdf.text(MARGIN, 30, "GURU GOBIND SINGH INDRAPRASTHA UNIVERSITY", 8)
+    pdf.text(MARGIN, 42, "SCHEME OF EXAMINATIONS", 8)
+    pdf.text(MARGIN, 56, f"Programme Code: {section['degree_id']} Programme Name: {section['degree_name']} SchemeID: 1{section['degree_id']}2020001 Sem./Year: {section['semester_name']} SEMESTER")
+    pdf.text(MARGIN, 66, f"Institution Code: {section['college_id']} Institution: {section['college_name']}")
+
+    rows = [["Paper Id", "Paper Code", "Paper Name", "Credits", "Type", "Exam", "Mode", "Kind", "Minor", "Major", "Max Marks", "Pass Marks"]]
+    for subject in section["subjects"]:
+        rows.append([subject["subject_id"], subject["subject_code"], subject["subject_name"], str(subject["credit"]), "T", "T", "A", "C", "25", "75", "100", "40"])
+    pdf.table(80, [40, 50, 220, 35, 30, 30, 30, 30, 35, 35, 45, 45], rows, [LINE_HEIGHT * 2] * len(rows))
+    pdf.end_page()
+
+def _write_student_page(pdf: SimplePdfWriter, section: dict, students: list[dict]):
+    pdf.text(MARGIN, 30, "GURU GOBIND SINGH INDRAPRASTHA UNIVERSITY", 8)
+    pdf.text(MARGIN, 42, f"Result of Programme Code: {section['degree_id']} Programme Name: {section['degree_name']} Sem./Year/EU: {section['semester_name']} SEMESTER Batch: {section['batch']} Examination: REGULAR DEC, {section['batch'] + 1}")
+    pdf.text(MARGIN, 52, f"Institution Code: {section['college_id']} Institution: {section['college_name']}")
+
+    subjects = section["subjects"]
+    subject_col_width = (PAGE_WIDTH - 2 * MARGIN - 120) / (2 * len(subjects))
+    col_widths = [20, 100] + [subject_col_width] * (2 * len(subjects))
+
+    rows = [["S.No", "Roll No / Name"] + sum([[subject["subject_id"], ""] for subject in subjects], [])]
+    row_heights = [LINE_HEIGHT * 2]
+    for student in students:
+        detail_row = [str(student["serial_num"]), f"{student['roll_num']}\n{student['name']}\nSID: {student['sid']}"]
+        marks_row, grade_row = ["", ""], ["", ""]
+        for subject in subjects:
+            internal, external = student["marks"][subject["subject_id"]]
+            total = internal + external
+            detail_row += [f"{subject['subject_id']}({subject['credit']})", ""]
+            marks_row += [str(internal), str(external)]
+            grade_row += [f"{total}({_marks_to_grade(total)})", ""]
+        rows += [detail_row, marks_row, grade_row]
+        row_heights += [LINE_HEIGHT * 3.5, LINE_HEIGHT * 1.5, LINE_HEIGHT * 1.5]
+
+    pdf.table(60, col_widths, rows, row_heights)
+    pdf.end_page()
+
+def generate_result_pdf(
+    file_path: str,
+    num_sections: int = 4,
+    students_per_section: int = 60,
+    subjects_per_section: int = 8,
+    students_per_page: int = 10,
+    seed: int = 7
+) -> dict[str, int]:
+    """
+    It will generate a GGSIPU layout result pdf, every section has a scheme page followed by student pages where each
+    student takes three rows (subjects with credit, internal and external marks, total with grade). It returns size of
+    generated pdf
+    """
+
+    rand = random.Random(seed)
+    pdf = SimplePdfWriter()
+    num_pages = 0
+    for section_index in range(num_sections):
+        degree_id = f"{27 + section_index // 3:03d}"
+        college_id = f"{101 + section_index % 3:03d}"
+        semester_num = 1 + section_index % len(SEMESTER_NAMES)
+        section = {
+            "degree_id": degree_id,
+            "degree_name": f"BACHELOR OF TECHNOLOGY (BRANCH {degree_id})",
+            "college_id": college_id,
+            "college_name": f"INSTITUTE OF TECHNOLOGY {college_id}",
+            "semester_name": SEMESTER_NAMES[semester_num - 1],
+            "batch": 2022,
+            "subjects": [
+                {
+                    "subject_id": f"{degree_id}{semester_num}{subject_index:02d}",
+                    "subject_code": f"ES-{semester_num}{subject_index:02d}",
+                    "subject_name": f"SUBJECT {subject_index} OF {degree_id}",
+                    "credit": rand.choice([2, 3, 4])
+                } for subject_index in range(1, subjects_per_section + 1)
+            ]
+        }
+        _write_scheme_page(pdf, section)
+        num_pages += 1
+
+        students = [
+            {
+                "serial_num": student_index + 1,
+                "roll_num": f"{student_index:03d}{college_id}{degree_id}22",
+                "name": f"STUDENT {student_index} NAME",
+                "sid": f"{rand.randint(10 ** 11, 10 ** 12 - 1)}",
+                "marks": { subject["subject_id"]: (rand.randint(10, 25), rand.randint(20, 75)) for subject in section["subjects"] }
+            } for student_index in range(students_per_section)
+        ]
+        for page_start in range(0, students_per_section, students_per_page):
+            _write_student_page(pdf, section, students[page_start:page_start + students_per_page])
+            num_pages += 1
+
+    pdf.save(file_path)
+    return {
+        "pages": num_pages,
+        "sections": num_sections,
+        "students": num_sections * students_per_section,
+        "subjects_per_section": subjects_per_section
+    }
@@ -4,6 +4,6 @@ from result_parser.pdfDataParser.ipuDataParser import IPU_Result_Parser
 async def test_func(pdf_path: str):
     pdfParser = PDFParser(pdf_path)
     pdfParser.parsePdf()
-    parser = IPU_Result_Parser(pdfParser.pdf_pages_list, 2022)
+    parser = IPU_Result_Parser(session_start = 2022, page_extractor = pdfParser.get_page_extractor())
     await parser.start()
 
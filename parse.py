@@ -1,7 +1,13 @@
-from result_parser.pdfDataParser.pdfParser import PDFParser
+from result_parser.pdfDataParser.pdfParser import PDFParser, pdf_cache
 from result_parser.pdfDataParser.ipuDataParser import IPU_Result_Parser
 from result_parser.lib.logger import automation_logger
 from result_parser.lib.env import ENV
+from result_parser.lib.progress_journal import ProgressJournal
+from result_parser.lib.tracing import trace_pdf
+from result_parser.lib.storage_backend import LocalBackend, get_storage_backend
+from result_parser.lib.storage_sync import sync_local_storage
+from result_parser.lib.result_db import Result_DB, merge_order
+from concurrent.futures import Executor, ProcessPoolExecutor
 import asyncio
 import json
 import os
@@ -9,15 +15,17 @@ import time
 import traceback
 
 class Parse:
+    __progress_journal: ProgressJournal
     
     def __init__(self) -> None:
-        pass
+        self.__progress_journal = ProgressJournal()
 
     async def start(self):
         print("Select option:\
             \n1. Manual(by entering pdf path)\
             \n2. Auto(by entering json data containing pdf url)\
-            \n3. Exit")
+            \n3. Sync local storage to mongo db and drive\
+            \n4. Exit")
         while True:
             option = input("Enter option: ")
             if option == "1":
@@ -27,33 +35,69 @@ class Parse:
                 await self.auto_parse()
                 break
             elif option == "3":
+                await self.sync_local_storage()
+                break
+            elif option == "4":
                 break
             else:
                 print("Invalid option")
     
-    async def parse_func(self, pdf_path: str = '', pdf_url: str = '', page_num : int = 1):
-        pdfParser = PDFParser(
-            filePath = pdf_path,
-            pdf_url = pdf_url
-        )
-        pdfParser.parsePdf()
-        if not pdfParser.pdf_pages_list or len(pdfParser.pdf_pages_list) <= 1:
-            automation_logger.error(f"No enough content found in pdf {pdf_path if pdf_path else pdf_url}")
-            return
-        
-        parser = IPU_Result_Parser(
-            pdfParser.pdf_pages_list,
-            2020,
-            page_to_start = page_num
-        )
-        await parser.start()
+    async def parse_func(
+        self,
+        pdf_path: str = '',
+        pdf_url: str = '',
+        page_num : int = 1,
+        executor: Executor | None = None,
+        pdf_order: int | None = None
+    ):
+        # Time spent in each stage of pdf is traced, and its summary is written to metrics file
+        pdf_key = self.__get_pdf_key(pdf_path, pdf_url)
+        with trace_pdf(pdf_key):
+            # Downloading and opening pdf in a thread, so other pdfs keep parsing meanwhile
+            pdfParser = await asyncio.to_thread(
+                PDFParser,
+                filePath = pdf_path,
+                pdf_url = pdf_url
+            )
+            await asyncio.to_thread(pdfParser.parsePdf)
+            if not pdfParser.pdf_pages_list or len(pdfParser.pdf_pages_list) <= 1:
+                automation_logger.error(f"No enough content found in pdf {pdf_path if pdf_path else pdf_url}")
+                return
+            
+            parser = IPU_Result_Parser(
+                session_start = 2020,
+                page_to_start = page_num,
+                page_extractor = pdfParser.get_page_extractor(executor = executor),
+                progress_journal = self.__progress_journal,
+                pdf_key = pdf_key,
+                pdf_order = pdf_order
+            )
+            await parser.start()
     
+    def __get_pdf_key(self, pdf_path: str = '', pdf_url: str = '') -> str:
+        """
+        It will return key of pdf in progress journal
+        """
+
+        return pdf_url if pdf_url else os.path.abspath(pdf_path)
+
+    async def sync_local_storage(self):
+        """
+        It will push results parsed with local storage backend to mongo db and drive
+        """
+
+        synced_files = await sync_local_storage(get_storage_backend(LocalBackend.name))
+        automation_logger.info(f"Synced {synced_files} result files of local storage")
+
     async def manual_parse(self):
         pdf_path = input("Enter the path to the PDF file: ")
-        pdf_page_num = input("Enter the page number to start from(default 1): ")
+
+        # Parsing resumes from last committed section of pdf by default
+        resume_page_num = self.__progress_journal.get_resume_page(self.__get_pdf_key(pdf_path))
+        pdf_page_num = input(f"Enter the page number to start from(default {resume_page_num}): ")
         try:
             if not pdf_page_num:
-                pdf_page_num = 1
+                pdf_page_num = resume_page_num
             else:
                 pdf_page_num = int(pdf_page_num)
         except ValueError:
@@ -73,19 +117,23 @@ class Parse:
             automation_logger.error("Json file is not a list")
             return
         
-        input_index = input("Enter the index of the file to start from(default empty): ")
+        # With progress journal every pdf resumes from its last committed section (completed pdfs are skipped),
+        # otherwise index and page to start from are asked
+        input_index = 0
         page_num = 1
-        try:
-            if not input_index:
-                input_index = 0
-            else:
-                input_index = int(input_index)
-                page_str = input("Enter the page number to start from(default 1): ")
-                if page_str and page_str.isdigit():
-                    page_num = int(page_str)
-        except ValueError:
-            automation_logger.error("Invalid index")
-            return
+        if not self.__progress_journal.is_enabled:
+            input_index = input("Enter the index of the file to start from(default empty): ")
+            try:
+                if not input_index:
+                    input_index = 0
+                else:
+                    input_index = int(input_index)
+                    page_str = input("Enter the page number to start from(default 1): ")
+                    if page_str and page_str.isdigit():
+                        page_num = int(page_str)
+            except ValueError:
+                automation_logger.error("Invalid index")
+                return
         
         error_json_content = []
         error_json_path = os.path.join(ENV.LOG_FOLDER_PATH, "error_parsing.json")
@@ -96,31 +144,89 @@ class Parse:
             with open(error_json_path, "w") as f:
                 json.dump([], f)
 
-        for json_data in json_content[input_index:]:
-            startTime = time.time()
-            automation_logger.info(f"Parsing file index no. {input_index}, pdf url: {json_data['link']}, pdf name: {json_data['title']}...")
-            try:
-                await self.parse_func(pdf_url=json_data["link"], page_num = page_num)
-            except Exception as err:
-                error_message = {
-                    "json_file": json_file,
-                    "index": input_index,
-                    "title": json_data['title'],
-                    "link": json_data['link'],
-                    "error": str(err),
-                    "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-                }
-                automation_logger.error(f"Error while parsing pdf file index no. {input_index}, pdf name: {json_data['title']} pdf link: {json_data['link']}", exc_info=True)
-                traceback.print_exc()
-                error_json_content.append(error_message)
-                with open(error_json_path, "w") as f:
-                    json.dump(error_json_content, f, indent=4)
-            else:
-                endTime = time.time()
-                automation_logger.info(f"Successfully parsed pdf file index no. {input_index}, pdf name: {json_data['title']}, pdf link: {json_data['link']}, time taken: {endTime - startTime} seconds")
-            finally:
-                page_num = 1
-            input_index += 1
+        # Pdfs are downloaded ahead of parsing, and page extraction worker processes are shared between all pdfs
+        parse_semaphore = asyncio.Semaphore(ENV.AUTO_PARSE_WORKERS)
+        in_flight_semaphore = asyncio.Semaphore(ENV.AUTO_PARSE_WORKERS * 2)
+        executor = ProcessPoolExecutor(max_workers = ENV.PDF_EXTRACT_WORKERS) if ENV.PDF_EXTRACT_WORKERS > 1 else None
+        automation_logger.info(f"Parsing {len(json_content) - input_index} pdf files with {ENV.AUTO_PARSE_WORKERS} workers...")
+
+        # Pdfs are parsed concurrently, but results they store in a same file are merged in order of json list
+        for file_index in range(input_index, len(json_content)):
+            merge_order.register(file_index)
+
+        try:
+            await asyncio.gather(*[
+                self.__auto_parse_file(
+                    json_file,
+                    file_index,
+                    json_content[file_index],
+                    page_num if file_index == input_index else 1,
+                    parse_semaphore,
+                    in_flight_semaphore,
+                    executor,
+                    error_json_content,
+                    error_json_path
+                ) for file_index in range(input_index, len(json_content))
+            ])
+
+            # Each pdf uploads its own results, results left in buffer by pdfs whose upload failed are retried
+            await Result_DB.flush_all_results()
+        finally:
+            if executor is not None:
+                executor.shutdown(wait = True, cancel_futures = True)
+
+    async def __auto_parse_file(
+        self,
+        json_file: str,
+        file_index: int,
+        json_data: dict,
+        page_num: int,
+        parse_semaphore: asyncio.Semaphore,
+        in_flight_semaphore: asyncio.Semaphore,
+        executor: Executor | None,
+        error_json_content: list[dict],
+        error_json_path: str
+    ):
+        """
+        It will download and parse a single pdf file of json list, error is recorded in error json file
+        """
+
+        try:
+            if self.__progress_journal.is_enabled:
+                if self.__progress_journal.is_completed(json_data["link"]):
+                    automation_logger.info(f"Pdf file index no. {file_index} is already parsed, skipping it...")
+                    return
+                page_num = self.__progress_journal.get_resume_page(json_data["link"])
+
+            async with in_flight_semaphore:
+                try:
+                    await asyncio.to_thread(pdf_cache.get_pdf_path, json_data["link"])
+
+                    async with parse_semaphore:
+                        startTime = time.time()
+                        automation_logger.info(f"Parsing file index no. {file_index}, pdf url: {json_data['link']}, pdf name: {json_data['title']}...")
+                        await self.parse_func(pdf_url=json_data["link"], page_num = page_num, executor = executor, pdf_order = file_index)
+                except Exception as err:
+                    error_message = {
+                        "json_file": json_file,
+                        "index": file_index,
+                        "title": json_data['title'],
+                        "link": json_data['link'],
+                        "error": str(err),
+                        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+                    }
+                    automation_logger.error(f"Error while parsing pdf file index no. {file_index}, pdf name: {json_data['title']} pdf link: {json_data['link']}", exc_info=True)
+                    self.__progress_journal.fail(json_data["link"], str(err))
+                    traceback.print_exc()
+                    error_json_content.append(error_message)
+                    with open(error_json_path, "w") as f:
+                        json.dump(error_json_content, f, indent=4)
+                else:
+                    endTime = time.time()
+                    automation_logger.info(f"Successfully parsed pdf file index no. {file_index}, pdf name: {json_data['title']}, pdf link: {json_data['link']}, time taken: {endTime - startTime} seconds")
+        finally:
+            # Results of later pdfs waiting for this pdf can be merged now
+            merge_order.finish(file_index)
 
 if __name__ == "__main__":
     parse = Parse()
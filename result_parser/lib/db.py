@@ -14,6 +14,7 @@ class DB:
     _batch_collec: AsyncIOMotorCollection
     _degree_collec: AsyncIOMotorCollection
     _subject_collec: AsyncIOMotorCollection
+    _student_index_collec: AsyncIOMotorCollection
 
     def __init__(self):
         self._client = mongoClient
@@ -23,6 +24,7 @@ class DB:
         self._batch_collec = self.__db["batches"]
         self._degree_collec = self.__db["degrees"]
         self._subject_collec = self.__db["subjects"]
+        self._student_index_collec = self.__db["student_index"]    # key: roll num, rows of student in result files
 
         asyncio.create_task(self.__required_indexing())
     
@@ -10,10 +10,15 @@ class ENV:
     # Mongo DB String, to connect with database
     MONGO_STR = os.getenv("MONGO_STR")
 
+    # Storage of metadata and result files, "mongo_drive" (mongo db and google drive) or "local" (sqlite database and
+    # folder tree inside local storage folder, synced to mongo db and google drive later)
+    STORAGE_BACKEND = (os.getenv("STORAGE_BACKEND") or "mongo_drive").lower()
+    LOCAL_STORAGE_PATH = os.getenv("LOCAL_STORAGE_PATH") or "local_storage"
+
     # Google Drive Service Account
     GOOGLE_PROJECT_ID = os.getenv("GOOGLE_PROJECT_ID")
     GOOGLE_PRIVATE_KEY_ID = os.getenv("GOOGLE_PRIVATE_KEY_ID")
-    GOOGLE_PRIVATE_KEY = os.getenv("GOOGLE_PRIVATE_KEY").replace('\\n', '\n')
+    GOOGLE_PRIVATE_KEY = (os.getenv("GOOGLE_PRIVATE_KEY") or "").replace('\\n', '\n')
     GOOGLE_CLIENT_EMAIL = os.getenv("GOOGLE_CLIENT_EMAIL")
     GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_CERT_URL = os.getenv("GOOGLE_CLIENT_CERT_URL")
@@ -21,8 +26,74 @@ class ENV:
     # Google Drive Parent Folder ID
     GOOGLE_PARENT_FOLDER_ID = os.getenv("GOOGLE_PARENT_FOLDER_ID")
 
+    # Google Drive API endpoint override (e.g. a local fake drive server), and number of threads running drive calls
+    GOOGLE_DRIVE_API_ENDPOINT = os.getenv("GOOGLE_DRIVE_API_ENDPOINT") or None
+    GDRIVE_MAX_WORKERS = int(os.getenv("GDRIVE_MAX_WORKERS") or 4)
+
+    # Json file where resolved google drive folder ids are saved, kept only in memory if not given
+    GDRIVE_FOLDER_CACHE_PATH = os.getenv("GDRIVE_FOLDER_CACHE_PATH") or None
+
     # Local Result Folder Path
     LOCAL_RESULT_FOLDER_PATH = os.getenv("LOCAL_RESULT_FOLDER_PATH")
 
+    # Index of local copies of drive result files (default inside local result folder), and whether local copy
+    # is checked against drive file metadata before it is read
+    LOCAL_MIRROR_INDEX_PATH = os.getenv("LOCAL_MIRROR_INDEX_PATH") or (
+        os.path.join(LOCAL_RESULT_FOLDER_PATH, ".drive_mirror_index.json") if LOCAL_RESULT_FOLDER_PATH else None
+    )
+    LOCAL_MIRROR_REVALIDATE = os.getenv("LOCAL_MIRROR_REVALIDATE", "true").lower() in ("1", "true", "yes")
+
     # Log Folder Path
     LOG_FOLDER_PATH = os.getenv("LOG_FOLDER_PATH")
+
+    # Journal of parsing progress of each pdf (default inside log folder), and number of stored sections after which
+    # buffered results are uploaded and progress is checkpointed (0 checkpoints only when parsing of pdf ends)
+    PROGRESS_JOURNAL_PATH = os.getenv("PROGRESS_JOURNAL_PATH") or (
+        os.path.join(LOG_FOLDER_PATH, "progress_journal.json") if LOG_FOLDER_PATH else None
+    )
+    PROGRESS_CHECKPOINT_SECTIONS = int(os.getenv("PROGRESS_CHECKPOINT_SECTIONS") or 0)
+
+    # JSONL file where timing summary of each parsed pdf is appended (default inside log folder), and OTLP endpoint
+    # where spans are also exported (needs opentelemetry-sdk and opentelemetry-exporter-otlp-proto-http)
+    METRICS_FILE_PATH = os.getenv("METRICS_FILE_PATH") or (
+        os.path.join(LOG_FOLDER_PATH, "metrics.jsonl") if LOG_FOLDER_PATH else None
+    )
+    OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT") or None
+
+    # PDF page extraction, number of worker processes (default 1, pages are extracted in current process) and pages
+    # in flight per pdf (default twice the workers)
+    PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS") or 1)
+    PDF_EXTRACT_WINDOW = int(os.getenv("PDF_EXTRACT_WINDOW") or 0)
+
+    # Number of extracted pages kept in memory, so peeks and rewinds don't extract page again
+    PDF_PAGE_CACHE_SIZE = int(os.getenv("PDF_PAGE_CACHE_SIZE") or 8)
+
+    # Downloaded PDF cache folder path, and whether cached pdfs are revalidated with server using their etag
+    PDF_CACHE_FOLDER_PATH = os.getenv("PDF_CACHE_FOLDER_PATH") or "pdf_cache"
+    PDF_CACHE_REVALIDATE = os.getenv("PDF_CACHE_REVALIDATE", "").lower() in ("1", "true", "yes")
+
+    # Number of pdfs parsed concurrently in auto mode
+    AUTO_PARSE_WORKERS = int(os.getenv("AUTO_PARSE_WORKERS") or 1)
+
+    # Formats of result files uploaded to drive, comma separated "csv" and/or "parquet" (parquet needs pyarrow)
+    RESULT_FILE_FORMATS = [
+        file_format.strip().lower() for file_format in (os.getenv("RESULT_FILE_FORMATS") or "csv").split(",")
+        if file_format.strip()
+    ]
+
+    # Layout of semester result files, "single" file per semester or "sharded" with one file per college
+    RESULT_FILE_LAYOUT = (os.getenv("RESULT_FILE_LAYOUT") or "single").lower()
+
+    # Whether ranklist of each semester result file is precomputed and uploaded along with it
+    WRITE_RANKLISTS = os.getenv("WRITE_RANKLISTS", "true").lower() in ("1", "true", "yes")
+
+    # Whether rows of students in result csv files are indexed by roll num, so a student result is read without
+    # downloading whole files
+    WRITE_STUDENT_INDEX = os.getenv("WRITE_STUDENT_INDEX", "true").lower() in ("1", "true", "yes")
+
+    # Seconds a served ranklist is cached by result api (0 disables cache), and number of ranklists kept in cache
+    RANKLIST_CACHE_TTL_SECONDS = int(os.getenv("RANKLIST_CACHE_TTL_SECONDS") or 300)
+    RANKLIST_CACHE_MAX_ENTRIES = int(os.getenv("RANKLIST_CACHE_MAX_ENTRIES") or 256)
+
+    # Memory (in MB) of merged results buffered in a run before largest are uploaded early, 0 uploads every store
+    RESULT_BUFFER_MAX_MB = int(os.getenv("RESULT_BUFFER_MAX_MB") or 256)
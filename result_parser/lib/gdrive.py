@@ -1,9 +1,18 @@
 import os
 import io
+import tempfile
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from result_parser.lib.env import ENV
 from result_parser.lib.utils import create_local_folder
 from result_parser.lib.logger import gdrive_logger
+from result_parser.lib.gdrive_folder_cache import FolderIdCache
+from result_parser.lib.local_mirror import LocalMirrorIndex
+from result_parser.lib.tracing import span, DRIVE
 from google.oauth2.service_account import Credentials
+from google.auth.credentials import Credentials as BaseCredentials
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 from googleapiclient.http import MediaIoBaseDownload
@@ -23,26 +32,71 @@ SERVICE_ACCOUNT_INFO = {
 
 SCOPES = ['https://www.googleapis.com/auth/drive.file']
 
+# Folder ids resolved or created in drive, shared by all drive clients of a run
+folder_id_cache = FolderIdCache()
+
+# Local copies of drive files, shared by all drive clients of a run
+local_mirror_index = LocalMirrorIndex()
+
+# Drive file fields needed to tell whether a local copy is fresh
+MIRROR_METADATA_FIELDS = 'md5Checksum, modifiedTime, size'
+
+# Threads running drive calls, shared by all drive clients of a run
+gdrive_executor = ThreadPoolExecutor(
+    max_workers = ENV.GDRIVE_MAX_WORKERS,
+    thread_name_prefix = "gdrive"
+)
+
 class GDrive:
-    __drive: any
+    __credentials: BaseCredentials
+    __api_endpoint: str | None
+    __thread_local: threading.local
+    __folder_id_cache: FolderIdCache
+    __mirror_index: LocalMirrorIndex
+    __mirror_revalidate: bool
 
-    def __init__(self):
-        self.__connect_to_drive()
+    def __init__(
+        self,
+        credentials: BaseCredentials | None = None,
+        api_endpoint: str | None = ENV.GOOGLE_DRIVE_API_ENDPOINT,
+        folder_cache: FolderIdCache = folder_id_cache,
+        mirror_index: LocalMirrorIndex = local_mirror_index,
+        mirror_revalidate: bool = ENV.LOCAL_MIRROR_REVALIDATE
+    ):
+        self.__credentials = credentials or Credentials.from_service_account_info(
+            SERVICE_ACCOUNT_INFO,
+            scopes = SCOPES
+        )
+        self.__api_endpoint = api_endpoint
+        self.__thread_local = threading.local()
+        self.__folder_id_cache = folder_cache
+        self.__mirror_index = mirror_index
+        self.__mirror_revalidate = mirror_revalidate
         self.__parent_folder_id = ENV.GOOGLE_PARENT_FOLDER_ID
 
+    @property
+    def __drive(self):
+        """
+        Drive service of current thread, as http client of drive service can't be shared between threads
+        """
+
+        drive = getattr(self.__thread_local, "drive", None)
+        if drive is None:
+            drive = self.__connect_to_drive()
+            self.__thread_local.drive = drive
+        return drive
+
     def __connect_to_drive(self):
         """
         It will connect to google drive
         """
 
-        credentials = Credentials.from_service_account_info(
-            SERVICE_ACCOUNT_INFO,
-            scopes = SCOPES
-        )
-        self.__drive = build(
+        return build(
             'drive',
             'v3',
-            credentials = credentials
+            credentials = self.__credentials,
+            client_options = { "api_endpoint": self.__api_endpoint } if self.__api_endpoint else None,
+            cache_discovery = False
         )
     
     def __create_folder(
@@ -108,6 +162,34 @@ class GDrive:
         files = results.get('files', [])
         return files[0].get('id') if files else None
 
+    def __get_or_create_folder(
+        self,
+        folder_name: str,
+        parent_folder_id: str
+    ) -> tuple[str, bool]:
+        """
+        It will return folder id from folder id cache, otherwise from drive search, otherwise it will create the
+        folder. It also returns whether folder is newly created
+        """
+
+        folder_id = self.__folder_id_cache.get(parent_folder_id, folder_name)
+        if folder_id:
+            return folder_id, False
+
+        folder_id = self.__get_folder_id(folder_name, parent_folder_id)
+        if folder_id:
+            self.__folder_id_cache.set(parent_folder_id, folder_name, folder_id)
+            return folder_id, False
+
+        try:
+            folder_id = self.__create_folder(folder_name, parent_folder_id)
+        except Exception:
+            self.__folder_id_cache.invalidate_folder(parent_folder_id)  # Parent folder might be deleted from drive
+            raise
+
+        self.__folder_id_cache.set(parent_folder_id, folder_name, folder_id)
+        return folder_id, True
+
     def upload_file(
         self,
         file_path: str,
@@ -124,15 +206,20 @@ class GDrive:
             file_path,
             resumable = True
         )
-        file = self.__drive.files().create(
-            body = {
-                'name': file_name,
-                'parents': [folder_id]
-            },
-            media_body = media,
-            fields = 'id'
-        ).execute()
+        try:
+            file = self.__drive.files().create(
+                body = {
+                    'name': file_name,
+                    'parents': [folder_id]
+                },
+                media_body = media,
+                fields = f'id, {MIRROR_METADATA_FIELDS}'
+            ).execute()
+        except Exception:
+            self.__folder_id_cache.invalidate_folder(folder_id)    # Folder might be deleted from drive
+            raise
 
+        self.__mirror_index.record(file.get('id'), file_path, file)
         gdrive_logger.info(f"Result uploaded to drive successfully")
         return file.get('id')
 
@@ -141,12 +228,9 @@ class GDrive:
         It will return existing folder id if folder exists, otherwise create a new folder
         and return its id
         """
-        existing_folder_id = self.__get_folder_id(new_folder_name, self.__parent_folder_id)
-        if existing_folder_id:
-            return existing_folder_id
-
-        folder_id = self.__create_folder(new_folder_name, self.__parent_folder_id)
-        create_local_folder(new_folder_name, ENV.LOCAL_RESULT_FOLDER_PATH)
+        folder_id, is_created = self.__get_or_create_folder(new_folder_name, self.__parent_folder_id)
+        if is_created:
+            create_local_folder(new_folder_name, ENV.LOCAL_RESULT_FOLDER_PATH)
         return folder_id
     
     def create_folder_inside_given_dir(
@@ -159,25 +243,23 @@ class GDrive:
         It will create a folder in google drive inside a given folder and return the folder id
         """
 
-        existing_folder_id = self.__get_folder_id(new_folder_name, parent_folder_id)
-        if existing_folder_id:
-            return existing_folder_id
-
-        folder_id = self.__create_folder(new_folder_name, parent_folder_id)
-        create_local_folder(
-            new_folder_name,
-            os.path.join(
-                ENV.LOCAL_RESULT_FOLDER_PATH,
-                relative_local_folder_path
+        folder_id, is_created = self.__get_or_create_folder(new_folder_name, parent_folder_id)
+        if is_created:
+            create_local_folder(
+                new_folder_name,
+                os.path.join(
+                    ENV.LOCAL_RESULT_FOLDER_PATH,
+                    relative_local_folder_path
+                )
             )
-        )
         
         return folder_id
     
     def update_existing_file(
         self,
         file_id: str,
-        updated_file_path: str
+        updated_file_path: str,
+        mimetype: str = "text/csv"
     ):
         """
         It will update the existing file in google drive
@@ -188,18 +270,25 @@ class GDrive:
         
         media = MediaFileUpload(
             updated_file_path,
-            mimetype = "text/csv",
+            mimetype = mimetype,
             resumable = True
         )
-        self.__drive.files().update(
-            fileId = file_id,
-            media_body = media
-        ).execute()
+        try:
+            file = self.__drive.files().update(
+                fileId = file_id,
+                media_body = media,
+                fields = f'id, {MIRROR_METADATA_FIELDS}'
+            ).execute()
+        except Exception:
+            self.__mirror_index.invalidate(file_id)    # Drive file might be partially updated
+            raise
+
+        self.__mirror_index.record(file_id, updated_file_path, file)
         gdrive_logger.info(f"Result updated in drive successfully")
             
-    def read_gdrive_file(self, file_id: str) -> str:
+    def __download_file(self, file_id: str) -> io.BytesIO:
         """
-        It will read the file from google drive and return the file content
+        It will download content of a drive file
         """
 
         request = self.__drive.files().get_media(fileId = file_id)
@@ -208,6 +297,126 @@ class GDrive:
         done = False
         while done is False:
             _, done = downloader.next_chunk()
-        
+
         file_content.seek(0)    # Reset pointer
+        return file_content
+
+    def __read_local_copy(self, file_id: str) -> tuple[io.BytesIO | None, dict | None]:
+        """
+        It will read local copy of drive file if it is fresh, drive is asked only for file metadata (unless
+        revalidation is turned off), which is much cheaper than downloading file. It also returns drive metadata
+        """
+
+        local_path = self.__mirror_index.get_local_path(file_id) if self.__mirror_index.is_enabled else None
+        if not local_path:
+            return None, None
+
+        drive_metadata = None
+        if self.__mirror_revalidate:
+            drive_metadata = self.__drive.files().get(
+                fileId = file_id,
+                fields = MIRROR_METADATA_FIELDS
+            ).execute()
+
+        if not self.__mirror_index.get_fresh_local_path(file_id, drive_metadata):
+            return None, drive_metadata
+
+        gdrive_logger.info(f"Reading fresh local copy of drive file {file_id} - {local_path}")
+        with open(local_path, "rb") as f:
+            return io.BytesIO(f.read()), drive_metadata
+
+    def __refresh_local_copy(self, file_id: str, file_content: io.BytesIO, drive_metadata: dict):
+        """
+        It will replace stale local copy of drive file with downloaded content
+        """
+
+        local_path = self.__mirror_index.get_recorded_path(file_id)
+        if not local_path:
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir = os.path.dirname(local_path), suffix = ".part")
+        with os.fdopen(fd, "wb") as f:
+            f.write(file_content.getvalue())
+        os.replace(tmp_path, local_path)
+        self.__mirror_index.record(file_id, local_path, drive_metadata)
+
+    def get_file_version(self, file_id: str) -> str | None:
+        """
+        It will return version of drive file (md5 of its content, or its modified time for files without md5), only
+        file metadata is asked from drive
+        """
+
+        drive_metadata = self.__drive.files().get(
+            fileId = file_id,
+            fields = "md5Checksum, modifiedTime"
+        ).execute()
+        return drive_metadata.get("md5Checksum") or drive_metadata.get("modifiedTime")
+
+    def read_gdrive_file(self, file_id: str, binary: bool = False) -> io.TextIOWrapper | io.BytesIO:
+        """
+        It will read the file from google drive and return the file content, as bytes for binary files. Fresh
+        local copy of file is read instead of downloading it, and stale local copy is refreshed
+        """
+
+        file_content, drive_metadata = self.__read_local_copy(file_id)
+        if file_content is None:
+            file_content = self.__download_file(file_id)
+            if drive_metadata is not None:
+                self.__refresh_local_copy(file_id, file_content, drive_metadata)
+
+        if binary:
+            return file_content
         return io.TextIOWrapper(file_content, encoding='utf-8')
+
+
+class AsyncGDrive:
+    """
+    Async adapter of GDrive, every drive call runs in bounded drive thread pool so event loop is never blocked
+    """
+
+    __gdrive: GDrive
+    __executor: ThreadPoolExecutor
+
+    def __init__(
+        self,
+        gdrive: GDrive | None = None,
+        executor: ThreadPoolExecutor = gdrive_executor
+    ):
+        self.__gdrive = gdrive or GDrive()
+        self.__executor = executor
+
+    async def __run(self, func, *args, **kwargs):
+        """
+        It will run given drive function in drive thread pool, time spent waiting for a free thread is counted too
+        """
+
+        with span(f"drive.{func.__name__}", DRIVE):
+            return await asyncio.get_running_loop().run_in_executor(
+                self.__executor,
+                partial(func, *args, **kwargs)
+            )
+
+    async def upload_file(self, file_path: str, folder_id: str) -> str:
+        return await self.__run(self.__gdrive.upload_file, file_path, folder_id)
+
+    async def create_folder_inside_parent_dir(self, new_folder_name: str) -> str:
+        return await self.__run(self.__gdrive.create_folder_inside_parent_dir, new_folder_name)
+
+    async def create_folder_inside_given_dir(
+        self,
+        new_folder_name: str,
+        parent_folder_id: str,
+        relative_local_folder_path: str
+    ) -> str:
+        return await self.__run(
+            self.__gdrive.create_folder_inside_given_dir,
+            new_folder_name,
+            parent_folder_id,
+            relative_local_folder_path
+        )
+
+    async def update_existing_file(self, file_id: str, updated_file_path: str, mimetype: str = "text/csv"):
+        return await self.__run(self.__gdrive.update_existing_file, file_id, updated_file_path, mimetype)
+
+    async def read_gdrive_file(self, file_id: str, binary: bool = False) -> io.TextIOWrapper | io.BytesIO:
+        return await self.__run(self.__gdrive.read_gdrive_file, file_id, binary)
@@ -0,0 +1,89 @@
+import os
+import json
+import tempfile
+import threading
+from result_parser.lib.env import ENV
+
+class FolderIdCache:
+    """
+    Cache of google drive folder ids, key: "<parent folder id>/<folder name>". It is kept in memory and
+    also saved to a json file if file path is given, so later runs skip drive search calls too
+    """
+
+    __cache_file_path: str | None
+    __folder_ids: dict[str, str]
+    __lock: threading.Lock
+    hits: int
+    misses: int
+
+    def __init__(self, cache_file_path: str | None = ENV.GDRIVE_FOLDER_CACHE_PATH):
+        self.__cache_file_path = cache_file_path
+        self.__folder_ids = self.__load()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __load(self) -> dict[str, str]:
+        """
+        It will load folder ids from cache file, if it exists
+        """
+
+        if not (self.__cache_file_path and os.path.isfile(self.__cache_file_path)):
+            return dict()
+        with open(self.__cache_file_path, "r") as f:
+            return json.load(f)
+
+    def __save(self):
+        """
+        It will write folder ids to cache file atomically, nothing is written for memory only cache
+        """
+
+        if not self.__cache_file_path:
+            return
+
+        cache_folder_path = os.path.dirname(os.path.abspath(self.__cache_file_path))
+        os.makedirs(cache_folder_path, exist_ok = True)
+        fd, tmp_path = tempfile.mkstemp(dir = cache_folder_path, suffix = ".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.__folder_ids, f, indent = 4)
+        os.replace(tmp_path, self.__cache_file_path)
+
+    def get(self, parent_folder_id: str, folder_name: str) -> str | None:
+        with self.__lock:
+            folder_id = self.__folder_ids.get(f"{parent_folder_id}/{folder_name}")
+            if folder_id:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return folder_id
+
+    def set(self, parent_folder_id: str, folder_name: str, folder_id: str):
+        with self.__lock:
+            self.__folder_ids[f"{parent_folder_id}/{folder_name}"] = folder_id
+            self.__save()
+
+    def invalidate_folder(self, folder_id: str):
+        """
+        It will remove given folder and every folder cached inside it, as that folder might not exist anymore
+        """
+
+        with self.__lock:
+            stale_folder_ids = {folder_id}
+            removed_any = True
+            while removed_any:
+                stale_keys = [
+                    key for key, cached_folder_id in self.__folder_ids.items()
+                    if cached_folder_id in stale_folder_ids or key.split('/', 1)[0] in stale_folder_ids
+                ]
+                removed_any = bool(stale_keys)
+                for key in stale_keys:
+                    stale_folder_ids.add(self.__folder_ids.pop(key))
+
+            self.__save()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.__folder_ids)
+        }
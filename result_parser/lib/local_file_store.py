@@ -0,0 +1,88 @@
+import os
+import io
+import shutil
+import asyncio
+import tempfile
+from result_parser.lib.local_mirror import get_file_md5
+
+class LocalFileStore:
+    """
+    Result files kept in a local folder tree, with same async api as AsyncGDrive. Folder and file ids are paths
+    relative to root folder, so stored results can be browsed directly
+    """
+
+    __root_folder_path: str
+
+    def __init__(self, root_folder_path: str):
+        self.__root_folder_path = os.path.abspath(root_folder_path)
+        os.makedirs(self.__root_folder_path, exist_ok = True)
+
+    @staticmethod
+    def __to_name(name: str) -> str:
+        """
+        It will make folder or file name safe to use as a single path component
+        """
+
+        return name.replace(os.sep, "_").replace("/", "_").strip() or "_"
+
+    def get_path(self, file_id: str) -> str:
+        """
+        It will return absolute path of a file or folder of store by its id
+        """
+
+        path = os.path.abspath(os.path.join(self.__root_folder_path, file_id))
+        if os.path.commonpath([path, self.__root_folder_path]) != self.__root_folder_path:
+            raise ValueError(f"File id {file_id} is outside of local file store")
+        return path
+
+    def __create_folder(self, folder_name: str, parent_folder_id: str) -> str:
+        folder_id = "/".join(filter(None, [parent_folder_id, self.__to_name(folder_name)]))
+        os.makedirs(self.get_path(folder_id), exist_ok = True)
+        return folder_id
+
+    def __copy_file(self, source_file_path: str, file_id: str):
+        """
+        It will copy file into store atomically, so a failed copy never leaves half written result
+        """
+
+        file_path = self.get_path(file_id)
+        fd, tmp_path = tempfile.mkstemp(dir = os.path.dirname(file_path))
+        os.close(fd)
+        try:
+            shutil.copyfile(source_file_path, tmp_path)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def __read_file(self, file_id: str, binary: bool) -> io.TextIOWrapper | io.BytesIO:
+        with open(self.get_path(file_id), "rb") as f:
+            file_content = io.BytesIO(f.read())
+        if binary:
+            return file_content
+        return io.TextIOWrapper(file_content, encoding = 'utf-8')
+
+    def get_file_md5(self, file_id: str) -> str:
+        return get_file_md5(self.get_path(file_id))
+
+    async def upload_file(self, file_path: str, folder_id: str) -> str:
+        file_id = "/".join(filter(None, [folder_id, self.__to_name(os.path.basename(file_path))]))
+        await asyncio.to_thread(self.__copy_file, file_path, file_id)
+        return file_id
+
+    async def create_folder_inside_parent_dir(self, new_folder_name: str) -> str:
+        return self.__create_folder(new_folder_name, "")
+
+    async def create_folder_inside_given_dir(
+        self,
+        new_folder_name: str,
+        parent_folder_id: str,
+        relative_local_folder_path: str
+    ) -> str:
+        return self.__create_folder(new_folder_name, parent_folder_id)
+
+    async def update_existing_file(self, file_id: str, updated_file_path: str, mimetype: str = "text/csv"):
+        await asyncio.to_thread(self.__copy_file, updated_file_path, file_id)
+
+    async def read_gdrive_file(self, file_id: str, binary: bool = False) -> io.TextIOWrapper | io.BytesIO:
+        return await asyncio.to_thread(self.__read_file, file_id, binary)
@@ -0,0 +1,144 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from result_parser.lib.env import ENV
+
+HASH_CHUNK_SIZE = 1024 * 1024   # 1 MB
+
+def get_file_md5(file_path: str) -> str:
+    """
+    It will return md5 hex digest of a local file, same as md5Checksum of drive
+    """
+
+    file_hash = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+class LocalMirrorIndex:
+    """
+    Index of local copies of drive files, key: drive file id. Each entry keeps local path, drive md5Checksum,
+    modifiedTime and size of the copy, along with local file stat to detect local changes without hashing
+    """
+
+    __index_file_path: str | None
+    __index: dict[str, dict]
+    __lock: threading.Lock
+    hits: int
+    misses: int
+
+    def __init__(self, index_file_path: str | None = ENV.LOCAL_MIRROR_INDEX_PATH):
+        self.__index_file_path = index_file_path
+        self.__index = self.__load()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def is_enabled(self) -> bool:
+        return bool(self.__index_file_path)
+
+    def __load(self) -> dict[str, dict]:
+        """
+        It will load index from disk, if it exists
+        """
+
+        if not (self.__index_file_path and os.path.isfile(self.__index_file_path)):
+            return dict()
+        with open(self.__index_file_path, "r") as f:
+            return json.load(f)
+
+    def __save(self):
+        """
+        It will write index to disk atomically
+        """
+
+        index_folder_path = os.path.dirname(os.path.abspath(self.__index_file_path))
+        os.makedirs(index_folder_path, exist_ok = True)
+        fd, tmp_path = tempfile.mkstemp(dir = index_folder_path, suffix = ".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.__index, f, indent = 4)
+        os.replace(tmp_path, self.__index_file_path)
+
+    def record(self, file_id: str, local_path: str, drive_metadata: dict):
+        """
+        It will record local copy of a drive file, drive metadata must have md5Checksum, modifiedTime and size
+        """
+
+        if not self.is_enabled:
+            return
+
+        local_stat = os.stat(local_path)
+        with self.__lock:
+            self.__index[file_id] = {
+                "local_path": os.path.abspath(local_path),
+                "md5_checksum": drive_metadata.get("md5Checksum"),
+                "modified_time": drive_metadata.get("modifiedTime"),
+                "size": int(drive_metadata.get("size") or local_stat.st_size),
+                "local_mtime_ns": local_stat.st_mtime_ns
+            }
+            self.__save()
+
+    def invalidate(self, file_id: str):
+        if not self.is_enabled:
+            return
+
+        with self.__lock:
+            if self.__index.pop(file_id, None) is not None:
+                self.__save()
+
+    def get_recorded_path(self, file_id: str) -> str | None:
+        with self.__lock:
+            entry = self.__index.get(file_id)
+        return entry["local_path"] if entry else None
+
+    def get_local_path(self, file_id: str) -> str | None:
+        """
+        It will return path of local copy of drive file, if it is still same as it was recorded
+        """
+
+        with self.__lock:
+            entry = self.__index.get(file_id)
+        if entry is None or not os.path.isfile(entry["local_path"]):
+            return None
+
+        # Local copy might be rewritten after it was recorded, hash is checked only then
+        local_stat = os.stat(entry["local_path"])
+        if local_stat.st_size != entry["size"]:
+            return None
+        if local_stat.st_mtime_ns != entry["local_mtime_ns"] and get_file_md5(entry["local_path"]) != entry["md5_checksum"]:
+            return None
+        return entry["local_path"]
+
+    def get_fresh_local_path(self, file_id: str, drive_metadata: dict | None) -> str | None:
+        """
+        It will return path of local copy if it matches given drive metadata, when drive metadata is not
+        given local copy is trusted as is
+        """
+
+        local_path = self.get_local_path(file_id)
+        if local_path and drive_metadata is not None:
+            with self.__lock:
+                entry = self.__index.get(file_id, {})
+            if drive_metadata.get("md5Checksum"):
+                is_fresh = drive_metadata["md5Checksum"] == entry.get("md5_checksum")
+            else:
+                is_fresh = drive_metadata.get("modifiedTime") == entry.get("modified_time")
+            local_path = local_path if is_fresh else None
+
+        with self.__lock:
+            if local_path:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return local_path
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.__index)
+        }
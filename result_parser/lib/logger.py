@@ -36,3 +36,9 @@ gdrive_logger = get_logger("gdrive")
 
 # Create a logger instance for the automation
 automation_logger = get_logger("automation")
+
+# Create a logger instance for the pdf downloader
+downloader_logger = get_logger("downloader")
+
+# Create a logger instance for the tracing
+tracing_logger = get_logger("tracing")
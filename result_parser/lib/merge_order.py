@@ -0,0 +1,32 @@
+class MergeOrder:
+    """
+    Order of pdfs of a run, key: index of pdf in run. Results which pdfs store in a same result file are merged in
+    this order (e.g. reappear result over regular result it supplements) whatever order pdfs are parsed in, so result
+    of a pdf is merged only after every earlier pdf of run is finished
+    """
+
+    __active_orders: set[int]
+
+    def __init__(self):
+        self.__active_orders = set()
+
+    def register(self, pdf_order: int):
+        """
+        It will add pdf to run, every pdf of run must be added before any of them is parsed
+        """
+
+        self.__active_orders.add(pdf_order)
+
+    def finish(self, pdf_order: int):
+        """
+        It will remove parsed (or failed) pdf from run, so results of later pdfs can be merged
+        """
+
+        self.__active_orders.discard(pdf_order)
+
+    def is_merge_allowed(self, pdf_order: int | None) -> bool:
+        """
+        It will tell whether result of pdf can be merged now, results of pdfs outside of run are merged right away
+        """
+
+        return pdf_order is None or all(active_order >= pdf_order for active_order in self.__active_orders)
@@ -0,0 +1,141 @@
+import threading
+from bson import ObjectId
+
+class MetadataCache:
+    """
+    Write-through in memory snapshot of batches and degrees of a university. It is loaded once per run, every
+    metadata write of the run also updates it, so later lookups are served from memory
+    """
+
+    __batches: dict[str, dict]
+    __batch_ids_by_num: dict[int, ObjectId]
+    __degrees: dict[str, dict]
+    __degree_ids_by_batch: dict[tuple[str, str], ObjectId]
+    __lock: threading.Lock
+    is_loaded: bool
+    hits: int
+    misses: int
+
+    def __init__(self):
+        self.__batches = dict()
+        self.__batch_ids_by_num = dict()
+        self.__degrees = dict()
+        self.__degree_ids_by_batch = dict()
+        self.__lock = threading.Lock()
+        self.is_loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, batch_docs: list[dict], degree_docs: list[dict]):
+        """
+        It will fill cache with given batch and degree documents
+        """
+
+        for batch_doc in batch_docs:
+            self.put_batch(batch_doc)
+        for degree_doc in degree_docs:
+            self.put_degree(degree_doc)
+        self.is_loaded = True
+
+    def __count(self, doc: dict | None) -> dict | None:
+        with self.__lock:
+            if doc is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return doc
+
+    def put_batch(self, batch_doc: dict):
+        self.__batches[str(batch_doc["_id"])] = batch_doc
+        self.__batch_ids_by_num[batch_doc["batch_num"]] = batch_doc["_id"]
+
+    def put_degree(self, degree_doc: dict):
+        self.__degrees[str(degree_doc["_id"])] = degree_doc
+        self.__degree_ids_by_batch[(str(degree_doc["batch_id"]), degree_doc["degree_id"])] = degree_doc["_id"]
+
+    def get_batch_doc_id(self, batch_num: int) -> ObjectId | None:
+        batch_doc_id = self.__batch_ids_by_num.get(batch_num)
+        self.__count(batch_doc_id and self.__batches.get(str(batch_doc_id)))
+        return batch_doc_id
+
+    def get_batch(self, batch_doc_id: ObjectId) -> dict | None:
+        return self.__count(self.__batches.get(str(batch_doc_id)))
+
+    def get_degree(self, degree_doc_id: ObjectId) -> dict | None:
+        return self.__count(self.__degrees.get(str(degree_doc_id)))
+
+    def find_degree(self, batch_doc_id: ObjectId, degree_id: str) -> dict | None:
+        """
+        It will return degree of given batch, by its degree id
+        """
+
+        degree_doc_id = self.__degree_ids_by_batch.get((str(batch_doc_id), degree_id))
+        return self.__count(self.__degrees.get(str(degree_doc_id)) if degree_doc_id else None)
+
+    def link_batch_degree(self, batch_doc_id: ObjectId, degree_id: str, degree_doc_id: ObjectId):
+        batch_doc = self.__batches.get(str(batch_doc_id))
+        if batch_doc is not None:
+            batch_doc.setdefault("degrees", dict())[degree_id] = degree_doc_id
+
+    def add_degree_subjects(self, degree_doc_id: ObjectId, subjects: dict[str, ObjectId]):
+        degree_doc = self.__degrees.get(str(degree_doc_id))
+        if degree_doc is not None:
+            degree_doc.setdefault("subjects", dict()).update(subjects)
+
+    def set_degree_field(self, degree_doc_id: ObjectId, field_path: str, value):
+        """
+        It will set a field of degree with dotted path, same as $set of mongo
+        """
+
+        degree_doc = self.__degrees.get(str(degree_doc_id))
+        if degree_doc is None:
+            return
+
+        *parent_fields, field = field_path.split(".")
+        for parent_field in parent_fields:
+            degree_doc = degree_doc.setdefault(parent_field, dict())
+        degree_doc[field] = value
+
+    def link_degree_college(
+        self,
+        degree_doc_id: ObjectId,
+        college_id: str,
+        college_name: str,
+        semester_num: int,
+        shift: str
+    ):
+        """
+        It will add college (or its shift and semester) in degree, same as it is linked in mongo
+        """
+
+        degree_doc = self.__degrees.get(str(degree_doc_id))
+        if degree_doc is None:
+            return
+
+        colleges = degree_doc.setdefault("colleges", list())
+        college = next((college for college in colleges if college.get("college_name", '') == college_name), None)
+        if college is None:
+            colleges.append({
+                "college_name": college_name,
+                "available_semester": [semester_num],
+                "shifts": { shift: college_id }
+            })
+            return
+
+        college.setdefault("shifts", dict())[shift] = college_id
+        available_semester = college.setdefault("available_semester", list())
+        if semester_num not in available_semester:
+            available_semester.append(semester_num)
+
+    def invalidate_degree(self, degree_doc_id: ObjectId):
+        self.__degrees.pop(str(degree_doc_id), None)
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+            "batches": len(self.__batches),
+            "degrees": len(self.__degrees)
+        }
@@ -0,0 +1,168 @@
+import asyncio
+import pymongo.collection
+from bson import ObjectId
+from pymongo import InsertOne, UpdateOne, UpdateMany
+from result_parser.lib.metadata_cache import MetadataCache
+from result_parser.lib.logger import result_db_logger
+from result_parser.lib.tracing import span, MONGO
+
+# Errors of links which didn't match their parent document, key: collection of parent
+LINK_FAILURE_MESSAGES = {
+    "university": "Failed to link batch with university",
+    "batch": "Failed to link degree with batch"
+}
+
+class MetadataPlan:
+    """
+    Metadata delta of a result section (new batch, new degree, subjects of degree), grouped by collection. Document
+    ids are generated before writing, so whole delta is known upfront and applied with one bulk write per collection.
+    New documents are written first and links from their parents after them, so a parent never links a missing document
+    """
+
+    batch_doc_id: ObjectId | None
+    degree_doc_id: ObjectId | None
+    __new_batch_doc: dict | None
+    __new_degree_doc: dict | None
+    __new_degree_subjects: dict[ObjectId, dict[str, ObjectId]]
+    __new_doc_ops: dict[str, list]
+    __link_ops: dict[str, list]
+
+    def __init__(self):
+        self.batch_doc_id = None
+        self.degree_doc_id = None
+        self.__new_batch_doc = None
+        self.__new_degree_doc = None
+        self.__new_degree_subjects = dict()
+        self.__new_doc_ops = { "batch": [], "degree": [], "subject": [] }
+        self.__link_ops = { "university": [], "batch": [] }
+
+    def add_batch(self, university_doc_id: ObjectId, batch_num: int, batch_folder_id: str) -> ObjectId:
+        """
+        It will add new batch, and link it with university
+        """
+
+        self.batch_doc_id = ObjectId()
+        self.__new_batch_doc = {
+            "_id": self.batch_doc_id,
+            "batch_num": batch_num,
+            "degrees": dict(),
+            "university_id": university_doc_id,
+            "folder_id": batch_folder_id
+        }
+        self.__new_doc_ops["batch"].append(InsertOne(self.__new_batch_doc))
+        self.__link_ops["university"].append(UpdateOne(
+            { "_id": university_doc_id },
+            { "$set": { f"batches.{batch_num}": self.batch_doc_id } }
+        ))
+        return self.batch_doc_id
+
+    def add_degree(self, degree_doc: dict, subjects: dict[str, ObjectId]) -> ObjectId:
+        """
+        It will add new degree along with its subjects, and link it with batch
+        """
+
+        self.degree_doc_id = ObjectId()
+        degree_doc = { "_id": self.degree_doc_id, **degree_doc, "subjects": dict(subjects) }
+
+        # Degree of a new batch is linked while inserting batch itself
+        if self.__new_batch_doc and self.__new_batch_doc["_id"] == degree_doc["batch_id"]:
+            self.__new_batch_doc["degrees"][degree_doc["degree_id"]] = self.degree_doc_id
+        else:
+            self.__link_ops["batch"].append(UpdateOne(
+                { "_id": degree_doc["batch_id"] },
+                { "$set": { f"degrees.{degree_doc['degree_id']}": self.degree_doc_id } }
+            ))
+
+        self.__new_degree_doc = degree_doc
+        self.__new_doc_ops["degree"].append(InsertOne(degree_doc))
+        return self.degree_doc_id
+
+    def add_degree_subjects(self, degree_doc_id: ObjectId, subjects: dict[str, ObjectId]):
+        """
+        It will add subjects to existing degree
+        """
+
+        if not subjects:
+            return
+        self.__new_degree_subjects[degree_doc_id] = dict(subjects)
+        self.__new_doc_ops["degree"].append(UpdateOne(
+            { "_id": degree_doc_id },
+            { "$set": { f"subjects.{subject_id}": subject_doc_id for subject_id, subject_doc_id in subjects.items() } }
+        ))
+
+    def link_subjects_batch_year(self, subject_doc_ids: list[ObjectId], batch_year: int):
+        """
+        It will add batch year in batch_years of given subjects
+        """
+
+        if not subject_doc_ids:
+            return
+        self.__new_doc_ops["subject"].append(UpdateMany(
+            { "_id": { "$in": list(subject_doc_ids) } },
+            { "$addToSet": { "batch_years": batch_year } }
+        ))
+
+    @property
+    def has_changes(self) -> bool:
+        return any(self.__new_doc_ops.values()) or any(self.__link_ops.values())
+
+    def round_trips(self) -> int:
+        """
+        It will return number of sequential write round trips needed to apply plan
+        """
+
+        return int(any(self.__new_doc_ops.values())) + int(any(self.__link_ops.values()))
+
+    async def apply(self, collections: dict[str, pymongo.collection.Collection], session = None):
+        """
+        It will apply plan, collections key: university, batch, degree or subject. Bulk writes of different
+        collections run concurrently. It raises if a document or link of plan isn't written, so plan is never
+        applied to cache then
+        """
+
+        for ops_by_collection in (self.__new_doc_ops, self.__link_ops):
+            collection_names = [collection_name for collection_name, ops in ops_by_collection.items() if ops]
+            if not collection_names:
+                continue
+            with span("mongo.bulk_write", MONGO):
+                bulk_results = await asyncio.gather(*[
+                    collections[collection_name].bulk_write(ops_by_collection[collection_name], ordered = True, session = session)
+                    for collection_name in collection_names
+                ])
+
+            for collection_name, bulk_result in zip(collection_names, bulk_results):
+                self.__check_bulk_result(collection_name, ops_by_collection[collection_name], bulk_result, ops_by_collection is self.__link_ops)
+
+    def __check_bulk_result(self, collection_name: str, ops: list, bulk_result, is_link: bool):
+        """
+        It will raise if bulk write didn't insert every new document, or an update didn't match its document
+        """
+
+        inserts = sum(isinstance(op, InsertOne) for op in ops)
+        updates = sum(isinstance(op, UpdateOne) for op in ops)
+        if bulk_result.inserted_count >= inserts and bulk_result.matched_count >= updates:
+            return
+
+        error_message = LINK_FAILURE_MESSAGES[collection_name] if is_link else f"Failed to write {collection_name} metadata"
+        result_db_logger.error(
+            f"{error_message}, planned {inserts} inserts and {updates} updates but inserted "
+            f"{bulk_result.inserted_count} and matched {bulk_result.matched_count}"
+        )
+        raise Exception(error_message)
+
+    def apply_to_cache(self, metadata_cache: MetadataCache):
+        """
+        It will apply written plan to metadata cache, so cache stays same as db
+        """
+
+        if self.__new_batch_doc:
+            metadata_cache.put_batch(self.__new_batch_doc)
+        if self.__new_degree_doc:
+            metadata_cache.put_degree(self.__new_degree_doc)
+            metadata_cache.link_batch_degree(
+                self.__new_degree_doc["batch_id"],
+                self.__new_degree_doc["degree_id"],
+                self.degree_doc_id
+            )
+        for degree_doc_id, subjects in self.__new_degree_subjects.items():
+            metadata_cache.add_degree_subjects(degree_doc_id, subjects)
@@ -0,0 +1,130 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import time
+import requests
+from result_parser.lib.env import ENV
+from result_parser.lib.logger import downloader_logger
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024   # 1 MB
+DOWNLOAD_TIMEOUT = 60   # seconds, for connecting and for each chunk
+
+class PDFCache:
+    """
+    On disk cache of downloaded pdfs. Pdf content is stored once by its sha256 hash, and an url index maps
+    each url to its content hash and etag. Cache folder is created and index is loaded on first use only
+    """
+
+    __cache_folder_path: str
+    __blobs_folder_path: str
+    __index_file_path: str
+    __index: dict[str, dict] | None
+    __revalidate: bool
+    __lock: threading.Lock
+
+    def __init__(
+        self,
+        cache_folder_path: str = ENV.PDF_CACHE_FOLDER_PATH,
+        revalidate: bool = ENV.PDF_CACHE_REVALIDATE
+    ):
+        self.__cache_folder_path = cache_folder_path
+        self.__blobs_folder_path = os.path.join(cache_folder_path, "blobs")
+        self.__index_file_path = os.path.join(cache_folder_path, "index.json")
+        self.__revalidate = revalidate
+        self.__lock = threading.Lock()
+        self.__index = None
+
+    def __get_index(self) -> dict[str, dict]:
+        """
+        It will return url index, cache folder is created and index is loaded from disk on first call. Lock must be held
+        """
+
+        if self.__index is None:
+            os.makedirs(self.__blobs_folder_path, exist_ok = True)
+            if os.path.isfile(self.__index_file_path):
+                with open(self.__index_file_path, "r") as f:
+                    self.__index = json.load(f)
+            else:
+                self.__index = dict()
+        return self.__index
+
+    def __save_index(self):
+        """
+        It will write url index to disk atomically
+        """
+
+        fd, tmp_path = tempfile.mkstemp(dir = self.__cache_folder_path, suffix = ".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.__index, f, indent = 4)
+        os.replace(tmp_path, self.__index_file_path)
+
+    def __get_blob_path(self, content_hash: str) -> str:
+        return os.path.join(self.__blobs_folder_path, f"{content_hash}.pdf")
+
+    def __store_response(self, url: str, res: requests.Response) -> str:
+        """
+        It will stream response body into cache in chunks, and return path of stored pdf
+        """
+
+        res.raise_for_status()
+        content_hash = hashlib.sha256()
+        size = 0
+
+        fd, tmp_path = tempfile.mkstemp(dir = self.__blobs_folder_path, suffix = ".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in res.iter_content(chunk_size = DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    content_hash.update(chunk)
+                    size += len(chunk)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+        finally:
+            res.close()
+
+        # Same content downloaded from different url is stored only once
+        blob_path = self.__get_blob_path(content_hash.hexdigest())
+        if os.path.isfile(blob_path):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, blob_path)
+
+        with self.__lock:
+            self.__get_index()[url] = {
+                "sha256": content_hash.hexdigest(),
+                "etag": res.headers.get("ETag"),
+                "size": size,
+                "downloaded_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+            }
+            self.__save_index()
+
+        downloader_logger.info(f"Downloaded {url} ({size} bytes) into pdf cache")
+        return blob_path
+
+    def get_pdf_path(self, url: str) -> str:
+        """
+        It will return local path of pdf of given url, pdf is downloaded only if it is not cached yet. If revalidation
+        is enabled, cached pdf is checked against server with its etag
+        """
+
+        with self.__lock:
+            entry = self.__get_index().get(url)
+
+        request_headers = {}
+        if entry and os.path.isfile(self.__get_blob_path(entry["sha256"])):
+            blob_path = self.__get_blob_path(entry["sha256"])
+            if not (self.__revalidate and entry.get("etag")):
+                downloader_logger.info(f"Using cached pdf of {url}")
+                return blob_path
+            request_headers["If-None-Match"] = entry["etag"]
+
+        res = requests.get(url, headers = request_headers, stream = True, timeout = DOWNLOAD_TIMEOUT)
+        if res.status_code == 304:
+            res.close()
+            downloader_logger.info(f"Cached pdf of {url} is still fresh")
+            return blob_path
+
+        return self.__store_response(url, res)
@@ -0,0 +1,114 @@
+import os
+import json
+import time
+import tempfile
+import threading
+from result_parser.lib.env import ENV
+
+class ProgressJournal:
+    """
+    Parsing progress of each pdf, key: pdf url or path. Each entry keeps status, page of first section which is not
+    committed yet (results of every section before it are uploaded and linked), metadata and result file ids of last
+    committed section, so a failed or stopped parsing resumes from there
+    """
+
+    __journal_file_path: str | None
+    __journal: dict[str, dict]
+    __lock: threading.Lock
+
+    def __init__(self, journal_file_path: str | None = ENV.PROGRESS_JOURNAL_PATH):
+        self.__journal_file_path = journal_file_path
+        self.__journal = self.__load()
+        self.__lock = threading.Lock()
+
+    @property
+    def is_enabled(self) -> bool:
+        return bool(self.__journal_file_path)
+
+    def __load(self) -> dict[str, dict]:
+        """
+        It will load journal from disk, if it exists
+        """
+
+        if not (self.__journal_file_path and os.path.isfile(self.__journal_file_path)):
+            return dict()
+        with open(self.__journal_file_path, "r") as f:
+            return json.load(f)
+
+    def __save(self):
+        """
+        It will write journal to disk atomically, so a crash never leaves half written journal
+        """
+
+        journal_folder_path = os.path.dirname(os.path.abspath(self.__journal_file_path))
+        os.makedirs(journal_folder_path, exist_ok = True)
+        fd, tmp_path = tempfile.mkstemp(dir = journal_folder_path, suffix = ".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.__journal, f, indent = 4)
+        os.replace(tmp_path, self.__journal_file_path)
+
+    def __update(self, pdf_key: str, **fields):
+        if not self.is_enabled:
+            return
+
+        with self.__lock:
+            entry = self.__journal.setdefault(pdf_key, {
+                "status": "in_progress",
+                "committed_page": 1,
+                "section_metadata": None,
+                "result_file_ids": None,
+                "error": None
+            })
+            entry.update(fields)
+            entry["updated_at"] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+            self.__save()
+
+    def get_entry(self, pdf_key: str) -> dict | None:
+        with self.__lock:
+            entry = self.__journal.get(pdf_key)
+        return dict(entry) if entry else None
+
+    def is_completed(self, pdf_key: str) -> bool:
+        entry = self.get_entry(pdf_key)
+        return bool(entry) and entry["status"] == "completed"
+
+    def get_resume_page(self, pdf_key: str) -> int:
+        """
+        It will return page number to resume parsing of pdf from, 1 if pdf was never parsed
+        """
+
+        entry = self.get_entry(pdf_key)
+        if not entry or entry["status"] == "completed":
+            return 1
+        return entry["committed_page"]
+
+    def start(self, pdf_key: str, page_num: int):
+        """
+        It will mark pdf as being parsed from given page, pages before it are not parsed again
+        """
+
+        self.__update(pdf_key, status = "in_progress", committed_page = page_num, error = None)
+
+    def checkpoint(
+        self,
+        pdf_key: str,
+        committed_page: int,
+        section_metadata: dict | None,
+        result_file_ids: dict[str, str] | None
+    ):
+        """
+        It will record that every section before given page is committed
+        """
+
+        self.__update(
+            pdf_key,
+            committed_page = committed_page,
+            section_metadata = section_metadata,
+            result_file_ids = result_file_ids
+        )
+
+    def complete(self, pdf_key: str):
+        self.__update(pdf_key, status = "completed", error = None)
+
+    def fail(self, pdf_key: str, error: str):
+        self.__update(pdf_key, status = "failed", error = error)
@@ -0,0 +1,35 @@
+import io
+import json
+import pandas as pd
+from result_parser.lib import result_frame
+
+def build_ranklist(columnar_df: pd.DataFrame) -> list[dict[str, str | int | None]]:
+    """
+    It will return ranklist of a result file, its records sorted by cgpa along with dense rank of student in whole
+    result file (rank) and in its college (college_rank). Values are kept as they are read back from csv file, so
+    ranklist records are same as records of result file. Students without cgpa have no rank and come last
+    """
+
+    legacy_csv = result_frame.to_legacy(columnar_df).to_csv(index = False)
+    ranklist_df = pd.read_csv(io.StringIO(legacy_csv), dtype = str).fillna("")
+
+    cgpa = pd.to_numeric(ranklist_df["cgpa"], errors = "coerce")
+    ranklist_df["rank"] = cgpa.rank(method = "dense", ascending = False).astype("Int64")
+    ranklist_df["college_rank"] = cgpa.groupby(ranklist_df["college_id"]).rank(method = "dense", ascending = False).astype("Int64")
+    ranklist_df = ranklist_df.loc[cgpa.sort_values(ascending = False, kind = "stable", na_position = "last").index]
+
+    return [
+        {
+            **record,
+            "rank": None if pd.isna(record["rank"]) else int(record["rank"]),
+            "college_rank": None if pd.isna(record["college_rank"]) else int(record["college_rank"])
+        } for record in ranklist_df.to_dict(orient = "records")
+    ]
+
+def write_ranklist(columnar_df: pd.DataFrame, file_path: str):
+    """
+    It will write ranklist of result as json file, which is served as is instead of ranking result file per request
+    """
+
+    with open(file_path, "w") as f:
+        json.dump({ "records": build_ranklist(columnar_df) }, f, separators = (",", ":"))
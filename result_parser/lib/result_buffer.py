@@ -0,0 +1,192 @@
+import pandas as pd
+from result_parser.lib.env import ENV
+
+class PendingMerge:
+    """
+    Result stored by a pdf, waiting for earlier pdfs of run to be merged first
+    """
+
+    pdf_order: int | None
+    result_df: pd.DataFrame
+    sub_id_max_marks_map: dict[str, int]
+    college_link_param: dict
+
+    def __init__(self, pdf_order: int | None, result_df: pd.DataFrame, sub_id_max_marks_map: dict[str, int], college_link_param: dict):
+        self.pdf_order = pdf_order
+        self.result_df = result_df
+        self.sub_id_max_marks_map = dict(sub_id_max_marks_map)
+        self.college_link_param = dict(college_link_param)
+
+class BufferedResult:
+    """
+    Merged result of a result file (or result shard of a college) which is not flushed to drive yet, along with
+    everything required to upload and link it later. Results stored by pdfs whose turn to merge hasn't come yet
+    are kept as pending merges
+    """
+
+    university_name: str
+    degree_doc_id: str
+    semester_num: int
+    shard_college_id: str | None
+    result_df: pd.DataFrame
+    result_file_ids: dict[str, str | None]
+    file_path: str
+    gdrive_folder_id: str
+    college_link_params: list[dict]
+    pending_merges: list[PendingMerge]
+    has_unflushed_merges: bool
+    stores: int
+    size_bytes: int
+
+    def __init__(
+        self,
+        university_name: str,
+        degree_doc_id: str,
+        semester_num: int,
+        shard_college_id: str | None,
+        result_df: pd.DataFrame,
+        result_file_ids: dict[str, str | None],
+        file_path: str,
+        gdrive_folder_id: str
+    ):
+        self.university_name = university_name
+        self.degree_doc_id = degree_doc_id
+        self.semester_num = semester_num
+        self.shard_college_id = shard_college_id
+        self.result_df = result_df
+        self.result_file_ids = result_file_ids
+        self.file_path = file_path
+        self.gdrive_folder_id = gdrive_folder_id
+        self.college_link_params = list()
+        self.pending_merges = list()
+        self.has_unflushed_merges = False
+        self.stores = 0
+        self.size_bytes = 0
+
+    def add_college_link(self, college_link_param: dict):
+        """
+        It will keep college to be linked with degree when result is flushed
+        """
+
+        if college_link_param not in self.college_link_params:
+            self.college_link_params.append(dict(college_link_param))
+
+    def add_pending_merge(self, pending_merge: PendingMerge):
+        """
+        It will keep result to be merged, pending merges are kept sorted by order of their pdf (stores of same pdf
+        keep their order)
+        """
+
+        self.pending_merges.append(pending_merge)
+        self.pending_merges.sort(key = lambda merge: float("inf") if merge.pdf_order is None else merge.pdf_order)
+
+    def memory_usage(self) -> int:
+        result_dfs = [self.result_df] if self.result_df is not None else []
+        result_dfs += [pending_merge.result_df for pending_merge in self.pending_merges]
+        return sum(int(result_df.memory_usage(deep = True).sum()) for result_df in result_dfs)
+
+class ResultWriteBuffer:
+    """
+    Buffer of merged results of a run, key: result file key. Results stored for same file are merged in memory
+    and file is uploaded once when buffer is flushed, or earlier when buffer grows beyond its memory limit. Holders
+    of a result are parsers still adding to it, a parser flushes result only when it is its last holder
+    """
+
+    __results: dict[str, BufferedResult]
+    __holders: dict[str, int]     # Number of parsers holding each result
+    max_bytes: int
+    size_bytes: int     # Memory of every buffered result, as measured when it was put
+    flushes: int
+    coalesced_stores: int
+
+    def __init__(self, max_size_mb: int = ENV.RESULT_BUFFER_MAX_MB):
+        self.__results = dict()
+        self.__holders = dict()
+        self.max_bytes = max_size_mb * 1024 * 1024
+        self.size_bytes = 0
+        self.flushes = 0
+        self.coalesced_stores = 0
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: str) -> BufferedResult | None:
+        return self.__results.get(key)
+
+    def put(self, key: str, buffered_result: BufferedResult):
+        """
+        It will buffer merged result of a file, its memory is measured once here and not on every eviction check
+        """
+
+        buffered_result.stores += 1
+        if buffered_result.stores > 1:
+            self.coalesced_stores += 1
+
+        previous_result = self.__results.get(key)
+        if previous_result is not None:
+            self.size_bytes -= previous_result.size_bytes
+        buffered_result.size_bytes = buffered_result.memory_usage()
+        self.size_bytes += buffered_result.size_bytes
+        self.__results[key] = buffered_result
+
+    def update_size(self, key: str):
+        """
+        It will measure memory of buffered result again, after it is changed in place (e.g. its merges are applied)
+        """
+
+        buffered_result = self.__results.get(key)
+        if buffered_result is not None:
+            self.size_bytes -= buffered_result.size_bytes
+            buffered_result.size_bytes = buffered_result.memory_usage()
+            self.size_bytes += buffered_result.size_bytes
+
+    def pop(self, key: str) -> BufferedResult | None:
+        buffered_result = self.__results.pop(key, None)
+        if buffered_result is not None:
+            self.size_bytes -= buffered_result.size_bytes
+        return buffered_result
+
+    def hold(self, key: str):
+        self.__holders[key] = self.__holders.get(key, 0) + 1
+
+    def release(self, key: str):
+        holders = self.__holders.get(key, 0) - 1
+        if holders > 0:
+            self.__holders[key] = holders
+        else:
+            self.__holders.pop(key, None)
+
+    def get_holders(self, key: str) -> int:
+        return self.__holders.get(key, 0)
+
+    def keys(self) -> list[str]:
+        return list(self.__results.keys())
+
+    def keys_to_evict(self) -> list[str]:
+        """
+        It will return keys of largest results to flush, so buffer comes back under its memory limit. Results are
+        sorted by size only when buffer is over its limit
+        """
+
+        if self.size_bytes <= self.max_bytes:
+            return []
+
+        total_size = self.size_bytes
+        keys = []
+        for key, buffered_result in sorted(self.__results.items(), key = lambda item: item[1].size_bytes, reverse = True):
+            if total_size <= self.max_bytes:
+                break
+            keys.append(key)
+            total_size -= buffered_result.size_bytes
+        return keys
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "buffered_files": len(self.__results),
+            "coalesced_stores": self.coalesced_stores,
+            "flushes": self.flushes
+        }
+
+    def __len__(self) -> int:
+        return len(self.__results)
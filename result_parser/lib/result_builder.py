@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+from array import array
+from result_parser.lib.result_frame import (
+    STUDENT_DETAIL_COLUMNS,
+    SUBJECT_FIELDS,
+    NUMERIC_SUBJECT_FIELDS,
+    CATEGORICAL_SUBJECT_FIELDS,
+    subject_field_column
+)
+
+class SectionResultBuilder:
+    """
+    Results of students of a section, kept as typed columns while parsing instead of a dict per student. Numeric
+    fields of a subject are kept in float arrays, grade and status in lists, all of them aligned by row of student.
+    Subjects missing for a student are left as NaN / None, same as in columnar dataframe
+    """
+
+    __slots__ = ("__roll_nums", "__names", "__numeric_fields", "__categorical_fields")
+
+    __roll_nums: list[str]
+    __names: list[str]
+    __numeric_fields: dict[str, dict[str, array]]      # key: subject column, value: { field: float array }
+    __categorical_fields: dict[str, dict[str, list]]   # key: subject column, value: { field: list }
+
+    def __init__(self):
+        self.__roll_nums = list()
+        self.__names = list()
+        self.__numeric_fields = dict()
+        self.__categorical_fields = dict()
+
+    def add_student(self, roll_num: str, name: str):
+        """
+        It will add a new student, subject results added after it belong to this student
+        """
+
+        self.__roll_nums.append(roll_num)
+        self.__names.append(name)
+
+    def add_subject_result(
+        self,
+        subject_id: str,
+        internal: float | int,
+        external: float | int,
+        grade: str,
+        credit: float | int,
+        total: float | int,
+        status: str
+    ):
+        """
+        It will set subject result of last added student, a repeated subject of same student replaces earlier one
+        """
+
+        if not self.__roll_nums:
+            raise ValueError("Student should be added before its subject result")
+
+        subject_col = f"sub_{subject_id}"
+        if subject_col not in self.__numeric_fields:
+            self.__numeric_fields[subject_col] = { field: array("d") for field in NUMERIC_SUBJECT_FIELDS }
+            self.__categorical_fields[subject_col] = { field: list() for field in CATEGORICAL_SUBJECT_FIELDS }
+
+        row = len(self.__roll_nums) - 1
+        values = {
+            "internal": internal,
+            "external": external,
+            "grade": grade,
+            "credit": credit,
+            "total": total,
+            "status": status
+        }
+        for field, values_array in self.__numeric_fields[subject_col].items():
+            self.__set_value(values_array, row, float(values[field]), np.nan)
+        for field, values_list in self.__categorical_fields[subject_col].items():
+            self.__set_value(values_list, row, values[field], None)
+
+    @staticmethod
+    def __set_value(values: array | list, row: int, value, missing_value):
+        """
+        It will set value at given row, rows of students not having this subject are filled with missing value
+        """
+
+        if len(values) > row:
+            values[row] = value
+            return
+        values.extend([missing_value] * (row - len(values)))
+        values.append(value)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        It will build columnar result dataframe of section, same as result_frame.from_student_records
+        """
+
+        num_students = len(self.__roll_nums)
+        columns = {
+            "roll_num": pd.array(self.__roll_nums, dtype = "string"),
+            "name": self.__names,
+            "college_id": pd.array([''] * num_students, dtype = "string"),
+            "total_marks_scored": np.zeros(num_students, dtype = np.int64),
+            "max_marks_possible": np.zeros(num_students, dtype = np.int64),
+            "cgpa": np.zeros(num_students, dtype = float)
+        }
+        for subject_col, numeric_fields in self.__numeric_fields.items():
+            categorical_fields = self.__categorical_fields[subject_col]
+            for field in SUBJECT_FIELDS:
+                if field in numeric_fields:
+                    values = np.full(num_students, np.nan)
+                    values[:len(numeric_fields[field])] = np.frombuffer(numeric_fields[field], dtype = float)
+                else:
+                    values = categorical_fields[field] + [None] * (num_students - len(categorical_fields[field]))
+                    values = pd.Categorical(values)
+                columns[subject_field_column(subject_col, field)] = values
+
+        return pd.DataFrame(columns, columns = list(dict.fromkeys([*STUDENT_DETAIL_COLUMNS, *columns])))
+
+    def clear(self):
+        self.__roll_nums.clear()
+        self.__names.clear()
+        self.__numeric_fields.clear()
+        self.__categorical_fields.clear()
+
+    def __len__(self) -> int:
+        return len(self.__roll_nums)
@@ -1,33 +1,60 @@
 import os
+import asyncio
 import pymongo
 import pymongo.database
 import pymongo.collection
-from pymongo import WriteConcern
-from pymongo.read_concern import ReadConcern
-from pymongo.read_preferences import ReadPreference
-from pymongo.client_session import TransactionOptions
+from pymongo import UpdateOne
 import re
 import pandas as pd
-import numpy as np
 from result_parser.lib.env import ENV
 from result_parser.lib.utils import create_short_form_name, standardize_subject_code
-from result_parser.lib.gdrive import GDrive
+from result_parser.lib.gdrive import AsyncGDrive
+from result_parser.lib.local_file_store import LocalFileStore
 from result_parser.lib.logger import result_db_logger
-from result_parser.lib.db import DB
-from ast import literal_eval
-
-# GGSIPU grade rating
-GRADE_RATING_GGSIPU = {
-    'O': 10,
-    'A+': 9,
-    'A': 8,
-    'B+': 7,
-    'B': 6,
-    'C': 5,
-    'P': 4,
-    'F': 0
+from result_parser.lib.storage_backend import StorageBackend, get_storage_backend
+from result_parser.lib.subject_catalog import SubjectCatalog
+from result_parser.lib.metadata_cache import MetadataCache
+from result_parser.lib import result_frame
+from result_parser.lib.result_files import read_result_file
+from result_parser.lib.ranklist import write_ranklist
+from result_parser.lib.student_index import build_student_index_ops
+from result_parser.lib.local_mirror import get_file_md5
+from result_parser.lib.result_builder import SectionResultBuilder
+from result_parser.lib.result_buffer import BufferedResult, PendingMerge, ResultWriteBuffer
+from result_parser.lib.merge_order import MergeOrder
+from result_parser.lib.metadata_planner import MetadataPlan
+from result_parser.lib.tracing import span, MONGO
+from bson import ObjectId
+from collections import defaultdict
+
+# Result file formats, key: file format, value: field of degree document where its result files are linked
+RESULT_FILE_LINK_FIELDS = {
+    "csv": "sem_results",
+    "parquet": "sem_results_parquet"
 }
 
+# Field of degree document where result shards of each college are linked, key: sem_num, value: { college_id: { file
+# format: file id } }
+RESULT_SHARDS_FIELD = "sem_result_shards"
+
+# Fields of degree document having result file ids of every layout
+RESULT_FILE_FIELDS = (*RESULT_FILE_LINK_FIELDS.values(), RESULT_SHARDS_FIELD)
+
+def get_sem_result_files(degree_doc: dict, sem_key: str) -> tuple[dict[str, dict[str, str]], dict[str, str]]:
+    """
+    It will return result files linked with a semester of degree, as result shards (key: college id, value: result
+    file ids) of sharded layout and result file ids (key: file format) of single file layout
+    """
+
+    sem_shards = (degree_doc.get(RESULT_SHARDS_FIELD) or {}).get(sem_key) or {}
+    result_shards = { college_id: dict(result_file_ids) for college_id, result_file_ids in sem_shards.items() }
+    result_file_ids = {
+        file_format: degree_doc[field][sem_key]
+        for file_format, field in RESULT_FILE_LINK_FIELDS.items()
+        if (degree_doc.get(field) or {}).get(sem_key)
+    }
+    return result_shards, result_file_ids
+
 def divide_degree_and_branch(degreeName: str):
     """
     It will divide degree name into degree and branch name
@@ -50,44 +77,68 @@ SHIFT_COLLEGE_MAP = {
     'E': 'evening'
 }
 
-txn_options = TransactionOptions(
-    read_concern = ReadConcern("snapshot"),
-    write_concern = WriteConcern("majority"),
-    read_preference = ReadPreference.PRIMARY,
-    max_commit_time_ms = 120000  # 120 seconds
-)
+# Locks shared by every Result_DB instance of a run, so concurrently parsed pdfs don't race on same metadata
+# documents, and results of same degree and semester file are merged one after another
+metadata_lock = asyncio.Lock()
+result_file_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+# Subject catalog of each university, key: university doc id. It is loaded once per run and shared by every Result_DB instance
+subject_catalogs: defaultdict[str, SubjectCatalog] = defaultdict(SubjectCatalog)
 
-class Result_DB(DB):
+# Batches and degrees of each university, key: university doc id. It is loaded once per run and every metadata write updates it
+metadata_caches: defaultdict[str, MetadataCache] = defaultdict(MetadataCache)
+
+# Merged results of a run waiting to be uploaded, shared by every Result_DB instance so a file is uploaded once
+result_buffer = ResultWriteBuffer()
+
+# Order of pdfs of a run, results stored in a same file by different pdfs are merged in this order
+merge_order = MergeOrder()
+
+class Result_DB:
+    __storage_backend: StorageBackend
     __uni_collec: pymongo.collection.Collection
     __batch_collec: pymongo.collection.Collection
     __degree_collec: pymongo.collection.Collection
     __subject_collec: pymongo.collection.Collection
+    __student_index_collec: pymongo.collection.Collection
     __uni_document: dict
-    __gdrive: GDrive
+    __gdrive: AsyncGDrive | LocalFileStore
     __final_folder_path_tracker: str
     __gdrive_upload_folder_id: str
     __semester_num: int
     __college_id: str
+    __college_link_param: dict
     subject_id_code_map: dict[str, str]
     __degree_doc_id: str
     __gdrive_file_id: str | None
     sub_id_max_marks_map: dict[str, int]
-
-    def __init__(self):
-        super().__init__()
-
-        self.__uni_collec = self._uni_collec
-        self.__batch_collec = self._batch_collec
-        self.__degree_collec = self._degree_collec
-        self.__subject_collec = self._subject_collec
-
-        self.__gdrive = GDrive()
+    __subject_catalog: SubjectCatalog
+    __metadata_cache: MetadataCache
+    __buffered_result_keys: dict[str, None]    # Keys of results buffered by this instance, in order of first store
+    __pdf_order: int | None
+
+    def __init__(self, storage_backend: StorageBackend | None = None, pdf_order: int | None = None):
+        # Metadata and result files go to configured storage backend, mongo db and drive by default
+        self.__storage_backend = storage_backend or get_storage_backend()
+
+        self.__uni_collec = self.__storage_backend.uni_collec
+        self.__batch_collec = self.__storage_backend.batch_collec
+        self.__degree_collec = self.__storage_backend.degree_collec
+        self.__subject_collec = self.__storage_backend.subject_collec
+        self.__student_index_collec = self.__storage_backend.student_index_collec
+
+        self.__gdrive = self.__storage_backend.file_store
         self.__final_folder_path_tracker = ''
         self.subject_id_code_map = {}
         self.__degree_doc_id = ''
         self.__semester_num = 0
         self.__gdrive_file_id = None
         self.sub_id_max_marks_map = {}
+        self.__college_link_param = {}
+        self.__buffered_result_keys = dict()
+
+        # Order of parsed pdf in run, results of pdfs outside of a run are merged as soon as they are stored
+        self.__pdf_order = pdf_order
     
     @classmethod
     async def create(cls, university_name: str = '', **kwargs):
@@ -99,6 +150,8 @@ class Result_DB(DB):
 
         if university_name:
             await self.connect_to_university(university_name)
+            await self.__load_subject_catalog()
+            await self.__load_metadata_cache()
             return self
         else:
             result_db_logger.error("University Name should be provided")
@@ -109,8 +162,9 @@ class Result_DB(DB):
         It will start transaction
         """
 
-        self.__session = await self._client.start_session(default_transaction_options = txn_options)
-        self.__session.start_transaction()
+        with span("mongo.start_transaction", MONGO):
+            self.__session = await self.__storage_backend.start_session()
+            self.__session.start_transaction()
         result_db_logger.info("Transaction started")
     
     async def commit_transaction(self):
@@ -118,8 +172,9 @@ class Result_DB(DB):
         It will commit transaction
         """
 
-        await self.__session.commit_transaction()
-        await self.__session.end_session()
+        with span("mongo.commit_transaction", MONGO):
+            await self.__session.commit_transaction()
+            await self.__session.end_session()
         result_db_logger.info("Transaction committed")
 
     async def abort_transaction(self):
@@ -127,8 +182,9 @@ class Result_DB(DB):
         It will abort transaction
         """
 
-        await self.__session.abort_transaction()
-        await self.__session.end_session()
+        with span("mongo.abort_transaction", MONGO):
+            await self.__session.abort_transaction()
+            await self.__session.end_session()
         result_db_logger.info("Transaction aborted")
     
     async def connect_to_university(self, university_name: str, short_name: str = ''):
@@ -138,166 +194,218 @@ class Result_DB(DB):
 
         result_db_logger.info(f"Connecting to {university_name}...")
         short_name = short_name or create_short_form_name(university_name)
-        self.__uni_document = await self.__uni_collec.find_one_and_update({
-                "name": university_name
-            }, {
-                "$setOnInsert": {
-                    "name": university_name,
-                    "short_name": short_name,
-                    "batches": dict(),
-                    "folder_id": self.__gdrive.create_folder_inside_parent_dir(university_name)
-                }
-            }, upsert = True,
-            return_document = pymongo.ReturnDocument.AFTER
-        )
+        uni_folder_id = await self.__gdrive.create_folder_inside_parent_dir(university_name)
+        with span("mongo.universities.find_one_and_update", MONGO):
+            self.__uni_document = await self.__uni_collec.find_one_and_update({
+                    "name": university_name
+                }, {
+                    "$setOnInsert": {
+                        "name": university_name,
+                        "short_name": short_name,
+                        "batches": dict(),
+                        "folder_id": uni_folder_id
+                    }
+                }, upsert = True,
+                return_document = pymongo.ReturnDocument.AFTER
+            )
         result_db_logger.info(f"Connected to {university_name} successfully")
         self.__final_folder_path_tracker = university_name
     
-    async def __create_new_batch(self, batch_num: int):
+    async def __load_subject_catalog(self):
+        """
+        It will load all subjects of connected university into subject catalog, if not already loaded in this run
+        """
+
+        self.__subject_catalog = subject_catalogs[str(self.__uni_document["_id"])]
+        if self.__subject_catalog.is_loaded:
+            return
+
+        result_db_logger.info(f"Loading subject catalog...")
+        with span("mongo.subjects.find", MONGO):
+            subject_docs = await self.__subject_collec.find({
+                "university_id": self.__uni_document["_id"]
+            }).to_list(length = None)
+        self.__subject_catalog.load(subject_docs)
+        result_db_logger.info(f"Subject catalog loaded with {len(self.__subject_catalog)} subjects")
+
+    async def __load_metadata_cache(self):
         """
-        It will create new batch if not already exist and also link with respective university. In the end it will also return batch doc id
+        It will load all batches and degrees of connected university into metadata cache, if not already loaded in this run
+        """
+
+        self.__metadata_cache = metadata_caches[str(self.__uni_document["_id"])]
+        if self.__metadata_cache.is_loaded:
+            return
+
+        result_db_logger.info(f"Loading metadata cache...")
+        with span("mongo.batches.find", MONGO):
+            batch_docs = await self.__batch_collec.find({
+                "university_id": self.__uni_document["_id"]
+            }).to_list(length = None)
+        with span("mongo.degrees.find", MONGO):
+            degree_docs = await self.__degree_collec.find({
+                "batch_id": { "$in": [batch_doc["_id"] for batch_doc in batch_docs] }
+            }).to_list(length = None)
+        self.__metadata_cache.load(batch_docs, degree_docs)
+        result_db_logger.info(f"Metadata cache loaded with {len(batch_docs)} batches and {len(degree_docs)} degrees")
+
+    async def __plan_batch(self, plan: MetadataPlan, batch_num: int) -> tuple[ObjectId, str | None]:
+        """
+        It will plan new batch if not already exist. It returns batch doc id, and batch folder id if batch is new
         """
 
-        batch_doc_id = ''
         batch_num_str = str(batch_num)
         self.__final_folder_path_tracker = self.__uni_document["name"]
 
+        # Batch might be created by another pdf of same run (cached) or by another process
+        cached_batch_doc_id = self.__metadata_cache.get_batch_doc_id(batch_num)
+        if cached_batch_doc_id is not None:
+            self.__uni_document["batches"][batch_num_str] = cached_batch_doc_id
+        elif batch_num_str not in self.__uni_document["batches"]:
+            with span("mongo.universities.find_one", MONGO):
+                self.__uni_document = await self.__uni_collec.find_one({
+                    "_id": self.__uni_document["_id"]
+                })
+
+        batch_folder_id = None
         if self.__uni_document["batches"] and batch_num_str in self.__uni_document["batches"]:
             batch_doc_id = self.__uni_document["batches"][batch_num_str]
         else:
             result_db_logger.info(f"Creating new batch {batch_num_str}...")
-            new_batch = await self.__batch_collec.insert_one({
-                "batch_num": batch_num,
-                "degrees": dict(),
-                "university_id": self.__uni_document["_id"],
-                "folder_id": self.__gdrive.create_folder_inside_given_dir(
-                    batch_num_str,
-                    self.__uni_document["folder_id"],
-                    self.__final_folder_path_tracker
-                )
-            })
-            batch_doc_id = new_batch.inserted_id
-            result_db_logger.info(f"Batch {batch_num_str} created successfully")
-
-            result_db_logger.info(f"Linking batch with university...")
-            updated_uni_doc = await self.__uni_collec.find_one_and_update({
-                    "_id": self.__uni_document["_id"]
-                }, {
-                    "$set": {
-                        f"batches.{str(batch_num)}": batch_doc_id
-                    }
-                }, upsert = True,
-                return_document = pymongo.ReturnDocument.AFTER
+            batch_folder_id = await self.__gdrive.create_folder_inside_given_dir(
+                batch_num_str,
+                self.__uni_document["folder_id"],
+                self.__final_folder_path_tracker
             )
-            if updated_uni_doc:
-                self.__uni_document = updated_uni_doc
-                result_db_logger.info(f"Linked batch with university successfully")
-            else:
-                result_db_logger.error(f"Failed to link batch with university, batch - {batch_num_str}; uni - {self.__uni_document['_id']}")
-                raise Exception(f"Failed to link batch with university")
+            batch_doc_id = plan.add_batch(self.__uni_document["_id"], batch_num, batch_folder_id)
 
         self.__final_folder_path_tracker = os.path.join(
             self.__final_folder_path_tracker,
             batch_num_str
         )
-        return batch_doc_id
-    
-    async def __create_new_degree(
+        return batch_doc_id, batch_folder_id
+
+    async def __plan_degree(
         self,
-        batch_doc_id: int,
+        plan: MetadataPlan,
+        batch_doc_id: ObjectId,
+        batch_folder_id: str | None,
+        batch_num: int,
         degree_id: str,
         degree_name: str,
-        sem_num: int
-    ):
+        sem_num: int,
+        subject_ids: list[tuple[str, str]]
+    ) -> ObjectId:
         """
-        It will create new degree if not already exist and also link with respective batch. In the end it will also return degree doc id
+        It will plan new degree with its subjects if not already exist, otherwise it will plan subjects which are
+        not present in degree. In the end it will also return degree doc id
         """
 
         degree_name, branch_name = divide_degree_and_branch(degree_name)
-        degree_doc_id = ''
 
         # For Folder Name
         if branch_name:
             degree_folder_name = f'{degree_id} - {degree_name} ({branch_name})'
         else:
             degree_folder_name = f'{degree_id} - {degree_name}'
-        
-        batch_doc = await self.__batch_collec.find_one({
-            "_id": batch_doc_id
-        })
 
-        if not batch_doc:
-            result_db_logger.error(f"Batch {batch_doc_id} not found")
-            raise Exception(f"Batch {batch_doc_id} not found")
+        # Degree of a new batch is new too, otherwise it is looked up in cache and then directly instead of through batch document
+        existing_degree = None
+        if batch_folder_id is None:
+            existing_degree = self.__metadata_cache.find_degree(batch_doc_id, degree_id)
+            if existing_degree is None:
+                with span("mongo.degrees.find_one", MONGO):
+                    existing_degree = await self.__degree_collec.find_one({
+                        "batch_id": batch_doc_id,
+                        "degree_id": degree_id
+                    })
+                if existing_degree:
+                    self.__metadata_cache.put_degree(existing_degree)
+
+        subjects = dict(subject_ids)
 
         # If degree already exist
-        if degree_id in batch_doc["degrees"]:
-            degree_doc_id = batch_doc["degrees"][degree_id]
-            existing_degree = await self.__get_degree_by_doc_id(degree_doc_id, { "sem_results": 1, "folder_id": 1 })
+        if existing_degree:
+            degree_doc_id = existing_degree["_id"]
             self.__gdrive_file_id = existing_degree["sem_results"].get(str(sem_num))
+            self.__gdrive_upload_folder_id = existing_degree["folder_id"]
+            result_db_logger.info(f"Degree {degree_id} - {degree_name} {branch_name if branch_name else ''} already exist")
+
+            # Adding subjects which are not present in degree
+            new_subjects_to_add = {}
+            for subject_id, subject_doc_id in subjects.items():
+                if subject_id not in existing_degree["subjects"]:
+                    new_subjects_to_add[subject_id] = subject_doc_id
+                elif existing_degree["subjects"][subject_id] != subject_doc_id:
+                    result_db_logger.warning(f"Subject {subject_id} already exist with different document id, existing id: {existing_degree['subjects'][subject_id]}, new id: {subject_doc_id}")
+
+            if not new_subjects_to_add:
+                result_db_logger.info(f"Subjects already added to degree")
+            plan.add_degree_subjects(degree_doc_id, new_subjects_to_add)
+            plan.link_subjects_batch_year(list(new_subjects_to_add.values()), batch_num)
 
-            if existing_degree:
-                self.__gdrive_upload_folder_id = existing_degree["folder_id"]
-                result_db_logger.info(f"Degree {degree_id} - {degree_name} {branch_name if branch_name else ''} already exist")
-            else:
-                result_db_logger.error(f"Degree {degree_id} - {degree_name} {branch_name if branch_name else ''} not found in database which is linked with batch {batch_doc_id}")
-                raise Exception(f"Degree {degree_id} - {degree_name} {branch_name if branch_name else ''} not found in database which is linked with batch {batch_doc_id}")
-        
         else:
             result_db_logger.info(f"Creating new degree {degree_id} - {degree_name} {branch_name if branch_name else ''}...")
 
-            self.__gdrive_upload_folder_id = self.__gdrive.create_folder_inside_given_dir(
+            if batch_folder_id is None:
+                batch_doc = self.__metadata_cache.get_batch(batch_doc_id)
+                if batch_doc is None:
+                    with span("mongo.batches.find_one", MONGO):
+                        batch_doc = await self.__batch_collec.find_one({ "_id": batch_doc_id })
+                    if batch_doc:
+                        self.__metadata_cache.put_batch(batch_doc)
+                if not batch_doc:
+                    result_db_logger.error(f"Batch {batch_doc_id} not found")
+                    raise Exception(f"Batch {batch_doc_id} not found")
+                batch_folder_id = batch_doc["folder_id"]
+
+            self.__gdrive_upload_folder_id = await self.__gdrive.create_folder_inside_given_dir(
                 degree_folder_name,
-                batch_doc["folder_id"],
+                batch_folder_id,
                 self.__final_folder_path_tracker
             )
-            new_degree = await self.__degree_collec.insert_one({
+            degree_doc_id = plan.add_degree({
                 "degree_id": degree_id,
                 "degree_name": degree_name,
                 "branch_name": branch_name if branch_name else 'GENERAL',
                 "colleges": list(),
-                "subjects": dict(),
                 "sem_results": dict(),  # key: sem_num, value: gdrive file id
-                "batch_year": batch_doc["batch_num"],
+                "sem_results_parquet": dict(),  # key: sem_num, value: gdrive file id of parquet result
+                RESULT_SHARDS_FIELD: dict(),    # key: sem_num, value: { college_id: { file format: gdrive file id } }
+                "sem_ranklists": dict(),        # key: sem_num, value: { file_id: gdrive file id, version: md5 of ranklist }
+                "batch_year": batch_num,
                 "batch_id": batch_doc_id,
                 "folder_id": self.__gdrive_upload_folder_id
-            })
-            degree_doc_id = new_degree.inserted_id
+            }, subjects)
+            plan.link_subjects_batch_year(list(subjects.values()), batch_num)
             self.__gdrive_file_id = None
-            result_db_logger.info(f"Degree {degree_id} - {degree_name} {branch_name if branch_name else ''} created successfully")
 
-            result_db_logger.info(f"Linking degree with batch...")
-            updated_batch = await self.__batch_collec.update_one({
-                "_id": batch_doc_id
-            }, {
-                "$set": {
-                    f"degrees.{degree_id}": degree_doc_id
-                }
-            })
-
-            if updated_batch.modified_count > 0:
-                result_db_logger.info(f"Linked degree with batch successfully")
-            else:
-                result_db_logger.error(f"Failed to link degree with batch, {updated_batch}")
-                raise Exception(f"Failed to link degree with batch")
-            
         self.__final_folder_path_tracker = os.path.join(
             self.__final_folder_path_tracker,
             degree_folder_name
         )
         return degree_doc_id
 
-    async def __get_degree_by_doc_id(self, degree_doc_id: str, projection = {}):
+    async def __get_degree_by_doc_id(self, degree_doc_id: str):
         """
-        It will get degree by degree doc id
+        It will get degree by degree doc id, from metadata cache if it is cached
         """
 
-        return await self.__degree_collec.find_one({
-            "_id": degree_doc_id
-        }, projection)
+        degree_doc = self.__metadata_cache.get_degree(degree_doc_id)
+        if degree_doc is not None:
+            return degree_doc
+
+        with span("mongo.degrees.find_one", MONGO):
+            degree_doc = await self.__degree_collec.find_one({
+                "_id": degree_doc_id
+            })
+        if degree_doc:
+            self.__metadata_cache.put_degree(degree_doc)
+        return degree_doc
 
     async def __adding_updating_new_college_degree(
         self,
+        degree_doc_id: str,
         college_id: str,
         college_name: str,
         semester_num: int,
@@ -307,9 +415,8 @@ class Result_DB(DB):
         It will add or update a new college for a given degree
         """
 
-        degree_doc = await self.__degree_collec.find_one({
-            "_id": self.__degree_doc_id,
-        }, session = self.__session)
+        # Cache is same as db here, as every college link is written under metadata lock
+        degree_doc = await self.__get_degree_by_doc_id(degree_doc_id)
 
         shift = 'M'
         if is_evening_shift:
@@ -337,229 +444,105 @@ class Result_DB(DB):
                 return
             
             result_db_logger.info(f"College {college_id} - {college_name} found with different shift, adding new shift {SHIFT_COLLEGE_MAP[shift]}...")
-            await self.__degree_collec.update_one({
-                "_id": self.__degree_doc_id,
-                "colleges": {
-                    "$elemMatch": {
-                        f"college_name": college_name
-                    }
-                }}, {
-                    "$set": {
-                        f"colleges.$.shifts.{shift}": college_id
-                    }, "$addToSet": {
-                        "colleges.$.available_semester": semester_num
-                    }
-                }, session = self.__session
-            )
+            with span("mongo.degrees.update_one", MONGO):
+                await self.__degree_collec.update_one({
+                    "_id": degree_doc_id,
+                    "colleges": {
+                        "$elemMatch": {
+                            f"college_name": college_name
+                        }
+                    }}, {
+                        "$set": {
+                            f"colleges.$.shifts.{shift}": college_id
+                        }, "$addToSet": {
+                            "colleges.$.available_semester": semester_num
+                        }
+                    }, session = self.__session
+                )
+            self.__metadata_cache.link_degree_college(degree_doc_id, college_id, college_name, semester_num, shift)
             result_db_logger.info(f"College {college_id} - {college_name} has been successfully added with new shift {SHIFT_COLLEGE_MAP[shift]}")
 
         # No college with different shift exist, so just push new one in array and link in degree
         else:
             result_db_logger.info(f"Adding new College {college_id} - {college_name} with {SHIFT_COLLEGE_MAP[shift]} shift...")
-            await self.__degree_collec.update_one({
-                "_id": self.__degree_doc_id
-            }, {
-                "$push": {
-                    "colleges": {
-                        "college_name": college_name,
-                        "available_semester": [semester_num],
-                        "shifts": {
-                            shift: college_id
+            with span("mongo.degrees.update_one", MONGO):
+                await self.__degree_collec.update_one({
+                    "_id": degree_doc_id
+                }, {
+                    "$push": {
+                        "colleges": {
+                            "college_name": college_name,
+                            "available_semester": [semester_num],
+                            "shifts": {
+                                shift: college_id
+                            }
                         }
                     }
-                }
-            }, session = self.__session)
+                }, session = self.__session)
+            self.__metadata_cache.link_degree_college(degree_doc_id, college_id, college_name, semester_num, shift)
             result_db_logger.info(f"College {college_id} - {college_name} has been successfully added with shift {SHIFT_COLLEGE_MAP[shift]}")
 
-    async def __add_subjects_to_degree(
+    async def __link_res_file(
         self,
-        subject_ids: list[tuple[str, str]],
-        batch_year: int
+        degree_doc_id: str,
+        sem_num: int,
+        gdrive_file_id: str,
+        file_format: str = "csv",
+        college_id: str | None = None
     ):
         """
-        It will add subjects to respected degree in a single batch update
+        It will link result file id in degree document, result shard of college is linked if college id is given
         """
 
-        # Getting existing degree to fetch subjects already added
-        existing_degree = await self.__degree_collec.find_one({
-            "_id": self.__degree_doc_id
-        }, {
-            "subjects": 1
-        })
+        if college_id:
+            link_field = f"{RESULT_SHARDS_FIELD}.{sem_num}.{college_id}.{file_format}"
+        else:
+            link_field = f"{RESULT_FILE_LINK_FIELDS[file_format]}.{sem_num}"
 
-        # Adding subjects which are not present in degree
-        new_subjects_to_add = {}
-        for subject_id, subject_doc_id in subject_ids:
-            if subject_id not in existing_degree["subjects"]:
-                new_subjects_to_add[f"subjects.{subject_id}"] = subject_doc_id
-            elif existing_degree["subjects"][subject_id] != subject_doc_id:
-                result_db_logger.warning(f"Subject {subject_id} already exist with different document id, existing id: {existing_degree['subjects'][subject_id]}, new id: {subject_doc_id}")
-            
-        if not new_subjects_to_add:
-            result_db_logger.info(f"Subjects already added to degree")
-            return
-        
-        # Linking subjects with batch year
-        await self.__subject_collec.update_many(
-            {
-                "_id": {
-                    "$in": list(new_subjects_to_add.values())
-                }
+        result_db_logger.info(f"Linking semester {sem_num} {file_format} result (file id: {gdrive_file_id}) with degree {degree_doc_id}...")
+        with span("mongo.degrees.update_one", MONGO):
+            await self.__degree_collec.update_one({
+                "_id": degree_doc_id
             }, {
-                "$addToSet": {
-                    "batch_years": batch_year
+                "$set": {
+                    link_field: gdrive_file_id
                 }
-            }
-        )
-        
-        updated_degree = await self.__degree_collec.update_one(
-            {
-                "_id": self.__degree_doc_id
-            }, {
-                "$set": new_subjects_to_add
-            }
-        )
-        if updated_degree.modified_count > 0:
-            result_db_logger.info(f"Subjects added to degree successfully")
-    
-    async def __link_res_file(
-        self,
-        sem_num: int,
-        gdrive_file_id: str
-    ):
-        """
-        It will link result file id in degree document
-        """
-
-        result_db_logger.info(f"Linking semester {sem_num} result (file id: {gdrive_file_id}) with degree {self.__degree_doc_id}...")
-        await self.__degree_collec.update_one({
-            "_id": self.__degree_doc_id
-        }, {
-            "$set": {
-                f"sem_results.{sem_num}": gdrive_file_id
-            }
-        }, session = self.__session)
+            }, session = self.__session)
+        self.__metadata_cache.set_degree_field(degree_doc_id, link_field, gdrive_file_id)
 
         result_db_logger.info(f"Result file linked with degree successfully")
 
-    def __calculate_cgpa(
-        self,
-        result_df: pd.DataFrame
-    ):
+    async def __link_ranklist(self, degree_doc_id: str, sem_num: int, ranklist_link: dict[str, str]):
         """
-        It will calculate CGPA from result dataframe
+        It will link ranklist file of semester result in degree document, its version changes whenever ranklist
+        changes so servers drop their cached copy of ranklist
         """
 
-        # Parse list-like strings safely
-        def safe_literal_eval(x):
-            try:
-                return literal_eval(str(x))
-            except (ValueError, SyntaxError):
-                return None  # or skip this record
-
-        subject_columns = [col for col in result_df.columns if col.startswith('sub_')]
-
-        result_df['total_marks_scored'] = 0
-        result_df['max_marks_possible'] = 0
-        result_df['total_credits'] = 0
-        result_df['weighted_grade_points'] = 0.0
-
-        for sub in subject_columns:
-            sub_id = sub.replace("sub_", "")
-            
-            # Drop missing and empty values safely
-            valid = result_df[sub].dropna()
-            valid = valid[valid.str.strip() != '']
-
-            if valid.empty:
-                continue
-
-            parsed = valid.apply(safe_literal_eval)
-            parsed = parsed.dropna()
-
-            if parsed.empty:
-                continue
-
-            internal = parsed.apply(lambda x: x[0])
-            external = parsed.apply(lambda x: x[1])
-            grade    = parsed.apply(lambda x: x[2])
-            credit   = parsed.apply(lambda x: x[3])
-
-            sub_max_marks = self.sub_id_max_marks_map.get(sub_id, None)
-            if sub_max_marks is None:
-                # print("Subject ID: ", sub_id)
-                # sub_max_marks = 100
-                result_db_logger.error(f"Subject {sub_id} not found in max marks map")
-                raise ValueError(f"Subject {sub_id} not found in max marks map")
-
-            result_df.loc[parsed.index, 'total_marks_scored'] += internal + external
-            result_df.loc[parsed.index, 'max_marks_possible'] += sub_max_marks
-            result_df.loc[parsed.index, 'total_credits'] += credit
-            result_df.loc[parsed.index, 'weighted_grade_points'] += credit * grade.map(GRADE_RATING_GGSIPU)
-        
-        # Compute final CGPA
-        result_df['cgpa'] = (result_df['weighted_grade_points'] / result_df['total_credits']).round(2)
-        result_df['cgpa'] = result_df['cgpa'].where(result_df['total_credits'] > 0, np.nan)
+        link_field = f"sem_ranklists.{sem_num}"
+        with span("mongo.degrees.update_one", MONGO):
+            await self.__degree_collec.update_one({
+                "_id": degree_doc_id
+            }, {
+                "$set": {
+                    link_field: ranklist_link
+                }
+            }, session = self.__session)
+        self.__metadata_cache.set_degree_field(degree_doc_id, link_field, ranklist_link)
 
-        # Clean up
-        result_df.drop(columns=['total_credits', 'weighted_grade_points'], inplace=True)
-    
-    def __merge_dataframes(self, original_df: pd.DataFrame, new_df: pd.DataFrame):
+    def __calculate_cgpa(
+        self,
+        result_df: pd.DataFrame,
+        sub_id_max_marks_map: dict[str, int]
+    ):
         """
-        Merge original result dataframe with the new supplementary result dataframe.
-        Updates marks where improved and adds new students and subjects.
+        It will calculate CGPA from columnar result dataframe
         """
 
-        # Set roll_num as index
-        original_df.set_index("roll_num", inplace = True)
-        new_df.set_index("roll_num", inplace = True)
-
-        def parse_subject(val):
-            try:
-                return literal_eval(val)
-            except (ValueError, SyntaxError):
-                return np.nan
-        
-        # Getting all subject columns (from new dataframe)
-        subject_cols = [col for col in new_df.columns if col.startswith("sub_")]
-
-        # Add new subjects to original_df if not already present
-        for col in subject_cols:
-            if col not in original_df.columns:
-                original_df[col] = np.nan
-                original_df[col] = original_df[col].astype(object)
-
-        # Parse subject columns in both dataframes
-        for col in subject_cols:
-            new_df[col] = new_df[col].apply(parse_subject)
-            original_df[col] = original_df[col].apply(parse_subject)
-            original_df[col] = original_df[col].astype(object)
-        
-        # Identify reappearing/rechecking and new students
-        students_for_update = new_df.index.intersection(original_df.index)
-        new_students = new_df.index.difference(original_df.index)
-
-        for roll_num in students_for_update:
-            for col in subject_cols:
-                updated_sub = new_df.at[roll_num, col]
-                orig_sub = original_df.at[roll_num, col]
-
-                # If new marks are better, or original is missing
-                if isinstance(updated_sub, list):
-                    if not isinstance(orig_sub, list) or updated_sub[1] > orig_sub[1]:
-                        original_df.at[roll_num, col] = updated_sub
-        
-        # Merge dataframes and calculate updated cgpa and total marks
-        parts = [original_df, new_df.loc[new_students]]
-        updated_df = pd.concat(
-            [df for df in parts if not df.empty],
-            ignore_index = False,
-            join = "outer"
-        )
-        self.__calculate_cgpa(updated_df)
-        updated_df.reset_index(inplace = True)
-
-        return updated_df
+        try:
+            result_frame.calculate_cgpa(result_df, sub_id_max_marks_map)
+        except ValueError as e:
+            result_db_logger.error(str(e))
+            raise
         
     def reset_subject_data_list(self):
         """
@@ -586,12 +569,42 @@ class Result_DB(DB):
         self.__gdrive_file_id = None
         self.__college_id = college_id  # For data storing and uploading in future
         
-        batch_doc_id = await self.__create_new_batch(batch)
-        self.__degree_doc_id = await self.__create_new_degree(batch_doc_id, degree_id, degree_name, semester_num)
-        await self.__add_subjects_to_degree(subject_ids, batch)
+        # Whole metadata delta of section is planned first, and then written with few bulk writes
+        async with metadata_lock:
+            plan = MetadataPlan()
+            batch_doc_id, batch_folder_id = await self.__plan_batch(plan, batch)
+            self.__degree_doc_id = await self.__plan_degree(
+                plan,
+                batch_doc_id,
+                batch_folder_id,
+                batch,
+                degree_id,
+                degree_name,
+                semester_num,
+                subject_ids
+            )
 
-        await self.start_transaction()
-        await self.__adding_updating_new_college_degree(college_id, college_name, semester_num, is_evening_shift)
+            if plan.has_changes:
+                await plan.apply({
+                    "university": self.__uni_collec,
+                    "batch": self.__batch_collec,
+                    "degree": self.__degree_collec,
+                    "subject": self.__subject_collec
+                })
+                result_db_logger.info(f"Metadata linked successfully in {plan.round_trips()} write round trips")
+
+            plan.apply_to_cache(self.__metadata_cache)
+            if batch_folder_id is not None:
+                self.__uni_document["batches"][str(batch)] = batch_doc_id
+            self.__subject_catalog.link_batch_year([subject_doc_id for _, subject_doc_id in subject_ids], batch)
+
+        # College is linked along with result file, once result is stored
+        self.__college_link_param = {
+            "college_id": college_id,
+            "college_name": college_name,
+            "semester_num": semester_num,
+            "is_evening_shift": is_evening_shift
+        }
         self.__semester_num = semester_num
         
     async def add_subject(
@@ -605,108 +618,472 @@ class Result_DB(DB):
         It will create new subject in db and return subject id and subject doc id, and if it is already created then it will just skip
         """
 
-        # Standardizing subject code
-        subject_code = standardize_subject_code(subject_code)
+        added_subjects = await self.add_subjects([(subject_name, subject_code, subject_id, max_marks)])
+        return added_subjects[0] if added_subjects else None
+
+    async def add_subjects(
+        self,
+        subjects: list[tuple[str, str, str, int]]
+    ) -> list[tuple[str, str]]:
+        """
+        It will register all subjects (subject name, subject code, subject id, max marks) of a scheme page. Existing subjects are resolved with a single query and new ones are inserted with a single bulk write. It returns subject id and subject doc id of each valid subject in given order
+        """
+
+        # Standardizing subject codes and skipping invalid subjects
+        valid_subjects = dict()
+        for subject_name, subject_code, subject_id, max_marks in subjects:
+            subject_code = standardize_subject_code(subject_code)
+
+            if len(subject_id) < 6:
+                result_db_logger.warning(f"Subject ID should be greater than or equal to 6 digits, {subject_id} given, subject name: {subject_name}, subject code: {subject_code}")
+                continue
+                # raise ValueError(f"Subject ID should be greater than or equal to 6 digits, {subject_id} given, subject name: {subject_name}, subject code: {subject_code}")
+
+            valid_subjects.setdefault((subject_id, subject_code), (subject_name, max_marks))
 
-        if len(subject_id) < 6:
-            result_db_logger.warning(f"Subject ID should be greater than or equal to 6 digits, {subject_id} given, subject name: {subject_name}, subject code: {subject_code}")
-            return None
-            # raise ValueError(f"Subject ID should be greater than or equal to 6 digits, {subject_id} given, subject name: {subject_name}, subject code: {subject_code}")
+        if not valid_subjects:
+            return []
 
-        existing_sub = await self._subject_collec.find_one({
-            "subject_id": subject_id,
-            "subject_code": subject_code,
-            "university_id": self.__uni_document["_id"]
-        })
-        if existing_sub:
+        # Resolving existing subjects, from subject catalog first and then from db
+        existing_subs = list()
+        uncataloged_subjects = list()
+        for subject_id, subject_code in valid_subjects:
+            cataloged_sub = self.__subject_catalog.find(subject_id, subject_code)
+            if cataloged_sub:
+                existing_subs.append(cataloged_sub)
+            else:
+                uncataloged_subjects.append((subject_id, subject_code))
+
+        if uncataloged_subjects:
+            with span("mongo.subjects.find", MONGO):
+                for sub in await self.__subject_collec.find({
+                    "university_id": self.__uni_document["_id"],
+                    "$or": [
+                        { "subject_id": subject_id, "subject_code": subject_code }
+                        for subject_id, subject_code in uncataloged_subjects
+                    ]
+                }).to_list(length = None):
+                    existing_subs.append(sub)
+                    self.__subject_catalog.add(sub)
+
+        subject_docs = dict()
+        for existing_sub in existing_subs:
+            subject_key = (existing_sub["subject_id"], existing_sub["subject_code"])
+            subject_name = valid_subjects[subject_key][0]
             if subject_name.lower() != existing_sub["subject_name"].lower():
                 result_db_logger.warning(f"Subject name is different from existing name. Let's be this way..., existing name: {existing_sub['subject_name']}, and other name: {subject_name}")
-            self.subject_id_code_map[subject_code] = existing_sub["subject_id"]
-            self.sub_id_max_marks_map[subject_id] = existing_sub["max_marks"]
-            return existing_sub["subject_id"], existing_sub["_id"]
-
-        sub_data = await self.__subject_collec.insert_one({
-            "subject_name": subject_name,
-            "subject_code": subject_code,
-            "subject_id": subject_id,
-            "batch_years": [],
-            "max_marks": max_marks,
-            "university_id": self.__uni_document["_id"]
-        })
-        result_db_logger.info(f"Subject {subject_id} - {subject_name} created successfully")
+            subject_docs[subject_key] = existing_sub
 
-        # Storing for conversion of subject code to subject id and subject id to max marks map
-        self.subject_id_code_map[subject_code] = subject_id
-        self.sub_id_max_marks_map[subject_id] = max_marks
+        # Inserting new subjects, upsert keeps it safe if same subject is inserted meanwhile by another pdf
+        new_subject_docs = [
+            {
+                "subject_name": subject_name,
+                "subject_code": subject_code,
+                "subject_id": subject_id,
+                "batch_years": [],
+                "max_marks": max_marks,
+                "university_id": self.__uni_document["_id"]
+            } for (subject_id, subject_code), (subject_name, max_marks) in valid_subjects.items()
+            if (subject_id, subject_code) not in subject_docs
+        ]
+        if new_subject_docs:
+            with span("mongo.subjects.bulk_write", MONGO):
+                bulk_result = await self.__subject_collec.bulk_write([
+                    UpdateOne({
+                        "subject_id": sub_doc["subject_id"],
+                        "subject_code": sub_doc["subject_code"],
+                        "university_id": sub_doc["university_id"]
+                    }, {
+                        "$setOnInsert": sub_doc
+                    }, upsert = True) for sub_doc in new_subject_docs
+                ], ordered = False)
+
+            for op_index, inserted_id in bulk_result.upserted_ids.items():
+                sub_doc = new_subject_docs[op_index]
+                subject_docs[(sub_doc["subject_id"], sub_doc["subject_code"])] = { **sub_doc, "_id": inserted_id }
+                self.__subject_catalog.add(subject_docs[(sub_doc["subject_id"], sub_doc["subject_code"])])
+                result_db_logger.info(f"Subject {sub_doc['subject_id']} - {sub_doc['subject_name']} created successfully")
+
+            # Subjects inserted meanwhile by another pdf
+            if len(subject_docs) < len(valid_subjects):
+                with span("mongo.subjects.find", MONGO):
+                    for sub in await self.__subject_collec.find({
+                        "university_id": self.__uni_document["_id"],
+                        "$or": [
+                            { "subject_id": subject_id, "subject_code": subject_code }
+                            for subject_id, subject_code in valid_subjects
+                            if (subject_id, subject_code) not in subject_docs
+                        ]
+                    }).to_list(length = None):
+                        subject_docs[(sub["subject_id"], sub["subject_code"])] = sub
+                        self.__subject_catalog.add(sub)
 
-        return subject_id, sub_data.inserted_id
+        # Storing for conversion of subject code to subject id and subject id to max marks map
+        added_subjects = list()
+        for subject_key in valid_subjects:
+            sub_doc = subject_docs[subject_key]
+            self.subject_id_code_map[sub_doc["subject_code"]] = sub_doc["subject_id"]
+            self.sub_id_max_marks_map[sub_doc["subject_id"]] = sub_doc["max_marks"]
+            added_subjects.append((sub_doc["subject_id"], sub_doc["_id"]))
+
+        return added_subjects
     
     async def store_and_upload_result(
         self,
-        student_result_list: list[dict[str, str | list[int]]]
+        section_result: SectionResultBuilder | pd.DataFrame | list[dict[str, str | list[int]]]
     ):
         """
-        It will store and upload result to drive
+        It will store and upload result to drive, result is taken as section result builder, columnar dataframe or
+        list of student records
         """
 
-        # Create filename for this result
-        filename = f"{self.__semester_num:02d}.csv"
+        # Create folder path for this result, if not exists
         folder_path = os.path.join(ENV.LOCAL_RESULT_FOLDER_PATH, self.__final_folder_path_tracker)
-        file_path = os.path.join(folder_path, filename)
-
-        # Create folder path if not exists
         os.makedirs(folder_path, exist_ok=True)
 
-        # Convert results to dataframe
-        student_result_df = pd.DataFrame(student_result_list, dtype=str)
-        student_result_df['college_id'] = ''
-        student_result_df = student_result_df.astype({"roll_num": "string", "college_id": "string"})
+        # Convert results to columnar dataframe
+        if isinstance(section_result, SectionResultBuilder):
+            student_result_df = section_result.to_frame()
+        elif isinstance(section_result, pd.DataFrame):
+            student_result_df = section_result.copy()
+        else:
+            student_result_df = result_frame.from_student_records(section_result)
 
         # Add college id
         student_result_df['college_id'] = self.__college_id
+        student_result_df['college_id'] = student_result_df['college_id'].astype("string")
 
-        # If file doesn't exist, upload it
-        if not self.__gdrive_file_id:
-            # Calculate cgpa
-            self.__calculate_cgpa(student_result_df)
+        # Semester keeps layout of its first stored result
+        degree_doc = await self.__get_degree_by_doc_id(self.__degree_doc_id)
+        if self.__is_sharded_result(degree_doc):
+            result_key = f"{self.__degree_doc_id}/{self.__semester_num}/{self.__college_id}"
+            load_result = self.__load_result_shard
+        else:
+            result_key = f"{self.__degree_doc_id}/{self.__semester_num}"
+            load_result = self.__load_result_file
+
+        async with result_file_locks[result_key]:
+            # Result of same file might be buffered already by earlier section of this run
+            buffered_result = result_buffer.get(result_key) or await load_result(folder_path)
+
+            # Result is merged once every earlier pdf of run is finished, till then it is kept as pending merge
+            buffered_result.add_pending_merge(PendingMerge(
+                self.__pdf_order,
+                student_result_df,
+                self.sub_id_max_marks_map,
+                self.__college_link_param
+            ))
+            self.__apply_pending_merges(buffered_result)
+            result_buffer.put(result_key, buffered_result)
+
+            if not result_buffer.is_enabled:
+                await self.__upload_buffered_result(result_key)
+            if result_buffer.get(result_key) is not None and result_key not in self.__buffered_result_keys:
+                result_buffer.hold(result_key)
+                self.__buffered_result_keys[result_key] = None
+
+        # Largest buffered results are flushed early if buffer grows beyond its limit
+        if result_buffer.is_enabled:
+            for evict_key in result_buffer.keys_to_evict():
+                result_db_logger.info(f"Result buffer is full, flushing {evict_key} early...")
+                await self.__flush_buffered_result(evict_key)
 
-            result_db_logger.info(f"Storing new result...")
-            student_result_df.to_csv(file_path, index = False)
-            result_gdrive_id = self.__gdrive.upload_file(file_path, self.__gdrive_upload_folder_id)
+        self.__final_folder_path_tracker = self.__uni_document["name"]
 
-            await self.__link_res_file(
-                sem_num = self.__semester_num,
-                gdrive_file_id = result_gdrive_id
-            )
-            result_db_logger.info(f"Result stored and uploaded successfully")
+    async def flush_results(self):
+        """
+        It will upload results buffered by this instance to drive and link them with their degrees. A result which
+        other parsers are still adding to is only released, it is uploaded by last of them (or at end of run)
+        """
+
+        for result_key in list(self.__buffered_result_keys):
+            if result_buffer.get_holders(result_key) <= 1:
+                await self.__flush_buffered_result(result_key)
+            result_buffer.release(result_key)
+            del self.__buffered_result_keys[result_key]
+        result_db_logger.info(f"Result buffer stats: {result_buffer.stats()}")
+        result_db_logger.info(f"Metadata cache stats: {self.__metadata_cache.stats()}")
+
+    @classmethod
+    async def flush_all_results(cls, storage_backend: StorageBackend | None = None):
+        """
+        It will upload every result still buffered in this run, e.g. results of a pdf whose parsing failed. It is
+        meant for end of run, when no parser is adding to buffer anymore
+        """
+
+        result_dbs: dict[str, Result_DB] = dict()    # key: university name
+        for result_key in result_buffer.keys():
+            buffered_result = result_buffer.get(result_key)
+            if buffered_result is None:
+                continue
+
+            if buffered_result.university_name not in result_dbs:
+                result_dbs[buffered_result.university_name] = await cls.create(
+                    buffered_result.university_name,
+                    storage_backend = storage_backend
+                )
+            await result_dbs[buffered_result.university_name].__flush_buffered_result(result_key)
+        result_db_logger.info(f"Result buffer stats: {result_buffer.stats()}")
+
+    def get_result_file_ids(self, batch_num: int, degree_id: str, semester_num: int, college_id: str) -> dict[str, str]:
+        """
+        It will return linked result file ids (key: file format) of given degree and semester, of given college if
+        semester result is sharded. Degree is taken from metadata cache, as it has every link of this run
+        """
+
+        batch_doc_id = self.__metadata_cache.get_batch_doc_id(batch_num)
+        degree_doc = self.__metadata_cache.find_degree(batch_doc_id, degree_id) if batch_doc_id else None
+        if degree_doc is None:
+            return {}
+
+        result_shards, result_file_ids = get_sem_result_files(degree_doc, str(semester_num))
+        if result_shards:
+            return result_shards.get(college_id) or {}
+        return result_file_ids
 
-        # If file exists, update it
+    def __apply_pending_merges(self, buffered_result: BufferedResult):
+        """
+        It will merge pending results of buffered result in order of their pdfs, results of pdfs whose earlier pdfs
+        are still being parsed are left pending
+        """
+
+        while buffered_result.pending_merges and merge_order.is_merge_allowed(buffered_result.pending_merges[0].pdf_order):
+            pending_merge = buffered_result.pending_merges.pop(0)
+            if buffered_result.result_df is None:
+                result_db_logger.info(f"Storing new result...")
+                result_df = pending_merge.result_df
+            else:
+                result_db_logger.info(f"Updating existing result...")
+                result_df = result_frame.merge_supplementary(buffered_result.result_df, pending_merge.result_df)
+
+            self.__calculate_cgpa(result_df, pending_merge.sub_id_max_marks_map)
+            buffered_result.result_df = result_df
+            buffered_result.add_college_link(pending_merge.college_link_param)
+            buffered_result.has_unflushed_merges = True
+
+    async def __flush_buffered_result(self, result_key: str):
+        async with result_file_locks[result_key]:
+            await self.__upload_buffered_result(result_key)
+
+    async def __upload_buffered_result(self, result_key: str):
+        """
+        It will upload merged part of buffered result, results waiting for earlier pdfs to be merged first are kept
+        in buffer and uploaded later. Lock of result file must be held
+        """
+
+        buffered_result = result_buffer.get(result_key)
+        if buffered_result is None:
+            return
+
+        self.__apply_pending_merges(buffered_result)
+        if buffered_result.has_unflushed_merges:
+            await self.__flush_result(buffered_result)
+            buffered_result.has_unflushed_merges = False
+
+        if buffered_result.pending_merges:
+            result_db_logger.info(f"Result {result_key} has merges pending for earlier pdfs, keeping them in buffer...")
+            result_buffer.update_size(result_key)
         else:
-            result_db_logger.info(f"Updating existing result...")
+            result_buffer.pop(result_key)
+
+    def __is_sharded_result(self, degree_doc: dict) -> bool:
+        """
+        It will tell whether result of current semester is stored as one shard per college
+        """
 
-            # Read existing file
-            existing_result_content = self.__gdrive.read_gdrive_file(self.__gdrive_file_id)
-            existing_df = pd.read_csv(existing_result_content, dtype={"roll_num": "string", "college_id": "string"})
+        result_shards, result_file_ids = get_sem_result_files(degree_doc, str(self.__semester_num))
+        if result_shards:
+            return True
+        if result_file_ids:
+            return False
+        return ENV.RESULT_FILE_LAYOUT == "sharded"
 
-            # Update existing file with new result
-            updated_df = self.__merge_dataframes(existing_df, student_result_df)
-            updated_df.to_csv(file_path, index = False)
+    async def __load_result_file(self, folder_path: str) -> BufferedResult:
+        """
+        It will load existing result file of semester (if any) to store new result in it
+        """
 
-            # Upload updated file to drive
-            self.__gdrive.update_existing_file(self.__gdrive_file_id, file_path)
-            result_db_logger.info(f"Result updated and uploaded successfully")
-        
-        await self.commit_transaction()
-        self.__final_folder_path_tracker = self.__uni_document["name"]
+        degree_doc = await self.__get_degree_by_doc_id(self.__degree_doc_id)
+        result_file_ids = {
+            file_format: (degree_doc.get(field) or {}).get(str(self.__semester_num))
+            for file_format, field in RESULT_FILE_LINK_FIELDS.items()
+        }
+        self.__gdrive_file_id = result_file_ids["csv"]
+
+        return BufferedResult(
+            university_name = self.__uni_document["name"],
+            degree_doc_id = self.__degree_doc_id,
+            semester_num = self.__semester_num,
+            shard_college_id = None,
+            result_df = await read_result_file(self.__gdrive, result_file_ids),
+            result_file_ids = result_file_ids,
+            file_path = os.path.join(folder_path, f"{self.__semester_num:02d}"),
+            gdrive_folder_id = self.__gdrive_upload_folder_id
+        )
+
+    async def __load_result_shard(self, folder_path: str) -> BufferedResult:
+        """
+        It will load existing result shard of current college (if any) to store new result in it. Shards of other
+        colleges are never downloaded or uploaded again
+        """
+
+        degree_doc = await self.__get_degree_by_doc_id(self.__degree_doc_id)
+        result_shards, _ = get_sem_result_files(degree_doc, str(self.__semester_num))
+        result_file_ids = result_shards.get(self.__college_id) or {}
+
+        # Shards of a semester are kept in their own folder
+        shard_folder_name = f"{self.__semester_num:02d}"
+        shard_folder_id = await self.__gdrive.create_folder_inside_given_dir(
+            shard_folder_name,
+            self.__gdrive_upload_folder_id,
+            os.path.relpath(folder_path, ENV.LOCAL_RESULT_FOLDER_PATH)
+        )
+        shard_folder_path = os.path.join(folder_path, shard_folder_name)
+        os.makedirs(shard_folder_path, exist_ok = True)
+
+        return BufferedResult(
+            university_name = self.__uni_document["name"],
+            degree_doc_id = self.__degree_doc_id,
+            semester_num = self.__semester_num,
+            shard_college_id = self.__college_id,
+            result_df = await read_result_file(self.__gdrive, result_file_ids),
+            result_file_ids = result_file_ids,
+            file_path = os.path.join(shard_folder_path, self.__college_id),
+            gdrive_folder_id = shard_folder_id
+        )
+
+    def __write_result_file(self, result_df: pd.DataFrame, file_path: str, file_format: str):
+        """
+        It will write columnar result dataframe in given file format
+        """
+
+        if file_format == "parquet":
+            result_frame.to_parquet(result_df, file_path)
+        else:
+            result_frame.to_legacy(result_df).to_csv(file_path, index = False)
+
+    async def __upload_ranklist(self, buffered_result: BufferedResult) -> dict[str, str]:
+        """
+        It will write and upload ranklist of buffered result, existing ranklist file of semester is updated
+        """
+
+        degree_doc = await self.__get_degree_by_doc_id(buffered_result.degree_doc_id)
+        existing_link = (degree_doc.get("sem_ranklists") or {}).get(str(buffered_result.semester_num))
+
+        ranklist_file_path = f"{buffered_result.file_path}.ranklist.json"
+        write_ranklist(buffered_result.result_df, ranklist_file_path)
+        if existing_link:
+            ranklist_file_id = existing_link["file_id"]
+            await self.__gdrive.update_existing_file(ranklist_file_id, ranklist_file_path, "application/json")
+        else:
+            ranklist_file_id = await self.__gdrive.upload_file(ranklist_file_path, buffered_result.gdrive_folder_id)
+
+        result_db_logger.info(f"Ranklist of semester {buffered_result.semester_num} uploaded successfully")
+        return {
+            "file_id": ranklist_file_id,
+            "version": get_file_md5(ranklist_file_path)
+        }
+
+    async def __flush_result(self, buffered_result: BufferedResult):
+        """
+        It will write and upload result in every format, then link colleges and newly uploaded result files
+        with degree in a transaction
+        """
+
+        unsupported_formats = [file_format for file_format in ENV.RESULT_FILE_FORMATS if file_format not in RESULT_FILE_LINK_FIELDS]
+        if unsupported_formats:
+            result_db_logger.error(f"Result file formats {unsupported_formats} are not supported")
+            raise ValueError(f"Result file formats {unsupported_formats} are not supported")
+
+        # Existing result files are always updated, even if their format is not configured anymore
+        result_file_ids = buffered_result.result_file_ids
+        file_formats = list(dict.fromkeys(
+            ENV.RESULT_FILE_FORMATS + [file_format for file_format, file_id in result_file_ids.items() if file_id]
+        ))
+
+        new_result_file_ids = {}
+        for file_format in file_formats:
+            format_file_path = f"{buffered_result.file_path}.{file_format}"
+            self.__write_result_file(buffered_result.result_df, format_file_path, file_format)
+
+            if result_file_ids.get(file_format):
+                await self.__gdrive.update_existing_file(
+                    result_file_ids[file_format],
+                    format_file_path,
+                    "text/csv" if file_format == "csv" else "application/octet-stream"
+                )
+            else:
+                new_result_file_ids[file_format] = await self.__gdrive.upload_file(format_file_path, buffered_result.gdrive_folder_id)
+        result_buffer.flushes += 1
+        result_db_logger.info(f"Result stored and uploaded successfully ({', '.join(file_formats)})")
+
+        # Ranklist is precomputed for semester result files, shards are not served as ranklists
+        ranklist_link = None
+        if ENV.WRITE_RANKLISTS and buffered_result.shard_college_id is None:
+            ranklist_link = await self.__upload_ranklist(buffered_result)
+
+        async with metadata_lock:
+            await self.start_transaction()
+            try:
+                for college_link_param in buffered_result.college_link_params:
+                    await self.__adding_updating_new_college_degree(buffered_result.degree_doc_id, **college_link_param)
+                for file_format, result_gdrive_id in new_result_file_ids.items():
+                    await self.__link_res_file(
+                        degree_doc_id = buffered_result.degree_doc_id,
+                        sem_num = buffered_result.semester_num,
+                        gdrive_file_id = result_gdrive_id,
+                        file_format = file_format,
+                        college_id = buffered_result.shard_college_id
+                    )
+                if ranklist_link is not None:
+                    await self.__link_ranklist(buffered_result.degree_doc_id, buffered_result.semester_num, ranklist_link)
+                await self.commit_transaction()
+            except Exception:
+                # Cache is updated along with writes, so degree is dropped from cache and fetched again when needed
+                self.__metadata_cache.invalidate_degree(buffered_result.degree_doc_id)
+                await self.abort_transaction()
+                raise
+
+        # Result can be flushed again with merges applied later, then its uploaded files are updated
+        buffered_result.result_file_ids = { **result_file_ids, **new_result_file_ids }
+        buffered_result.college_link_params.clear()
+
+        # Rows of students are moved whenever file is rewritten, so index of whole file is updated
+        if ENV.WRITE_STUDENT_INDEX and "csv" in file_formats:
+            await self.__update_student_index(buffered_result, buffered_result.result_file_ids["csv"])
+
+    async def __update_student_index(self, buffered_result: BufferedResult, csv_file_id: str):
+        """
+        It will point every student of result csv file to its row in file, so a student result is read without
+        downloading whole file
+        """
+
+        index_ops = build_student_index_ops(
+            buffered_result.result_df["roll_num"],
+            f"{buffered_result.file_path}.csv",
+            csv_file_id,
+            buffered_result.semester_num
+        )
+        with span("mongo.student_index.bulk_write", MONGO):
+            await self.__student_index_collec.bulk_write(index_ops, ordered = False)
+        result_db_logger.info(f"Student index updated for {len(index_ops)} students of semester {buffered_result.semester_num}")
     
     async def get_subject_id_by_code(self, subject_code: str, batch_year: int) -> str:
         if subject_code in self.subject_id_code_map:
             return self.subject_id_code_map[subject_code]
         else:
-            subs = await self.__subject_collec.find({
-                "subject_code": subject_code,
-                "batch_years": batch_year
-            }).to_list(length=None)
+            # Subject catalog is consulted before going to db
+            subs = self.__subject_catalog.find_by_code(subject_code, batch_year)
+            if not subs:
+                with span("mongo.subjects.find", MONGO):
+                    subs = await self.__subject_collec.find({
+                        "university_id": self.__uni_document["_id"],
+                        "subject_code": subject_code,
+                        "batch_years": batch_year
+                    }).to_list(length=None)
+                for sub in subs:
+                    self.__subject_catalog.add(sub)
+
             if len(subs) == 1:
                 sub = subs[0]
                 self.subject_id_code_map[subject_code] = sub["subject_id"]
@@ -718,17 +1095,17 @@ class Result_DB(DB):
         
             else:
                 # Matching subjects with degree's subjects to find common subject
-                degree = await self.__get_degree_by_doc_id(self.__degree_doc_id, { "subjects": 1 })
+                degree = await self.__get_degree_by_doc_id(self.__degree_doc_id)
                 degree_subjects = degree["subjects"] if degree else {}
 
                 # A lookup map from subject _id(doc id) to subject_id
                 sub_doc_id_to_subject_id = {str(sub["_id"]): (sub["subject_id"], sub["max_marks"]) for sub in subs}                
 
                 for subject_doc_id in degree_subjects.values():
-                    if subject_doc_id in sub_doc_id_to_subject_id:
-                        subject_id = sub_doc_id_to_subject_id[subject_doc_id][0]
+                    if str(subject_doc_id) in sub_doc_id_to_subject_id:
+                        subject_id = sub_doc_id_to_subject_id[str(subject_doc_id)][0]
                         self.subject_id_code_map[subject_code] = subject_id
-                        self.sub_id_max_marks_map[subject_id] = sub_doc_id_to_subject_id[subject_doc_id][1]
+                        self.sub_id_max_marks_map[subject_id] = sub_doc_id_to_subject_id[str(subject_doc_id)][1]
                         return subject_id
                 else:
                     result_db_logger.error(f"Multiple subjects found for subject code: {subject_code}, batch year: {batch_year}")
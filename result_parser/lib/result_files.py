@@ -0,0 +1,60 @@
+import pandas as pd
+from typing import AsyncIterator
+from result_parser.lib import result_frame
+from result_parser.lib.gdrive import AsyncGDrive
+
+async def read_result_file(gdrive: AsyncGDrive, result_file_ids: dict[str, str | None]) -> pd.DataFrame | None:
+    """
+    It will read a result file from drive as columnar dataframe, key of result file ids is file format. Parquet
+    file is preferred as it needs no parsing
+    """
+
+    if result_file_ids.get("parquet"):
+        result_content = await gdrive.read_gdrive_file(result_file_ids["parquet"], binary = True)
+        return result_frame.read_parquet(result_content)
+
+    if result_file_ids.get("csv"):
+        result_content = await gdrive.read_gdrive_file(result_file_ids["csv"])
+        result_df = pd.read_csv(result_content, dtype={"roll_num": "string", "college_id": "string"})
+        return result_frame.to_columnar(result_df)
+
+    return None
+
+async def iter_result_shards(
+    gdrive: AsyncGDrive,
+    result_shards: dict[str, dict[str, str]],
+    college_ids: list[str] | None = None
+) -> AsyncIterator[tuple[str, pd.DataFrame]]:
+    """
+    It will read shards of a sharded semester result one by one, only shards of given colleges if given.
+    Result shards are taken from sem_result_shards of degree document, key: college id, value: result file ids
+    """
+
+    for college_id, result_file_ids in result_shards.items():
+        if college_ids is not None and college_id not in college_ids:
+            continue
+
+        shard_df = await read_result_file(gdrive, result_file_ids)
+        if shard_df is not None:
+            yield college_id, shard_df
+
+async def read_sharded_result(
+    gdrive: AsyncGDrive,
+    result_shards: dict[str, dict[str, str]],
+    college_ids: list[str] | None = None
+) -> pd.DataFrame | None:
+    """
+    It will assemble shards of a sharded semester result into a single columnar dataframe
+    """
+
+    shard_dfs = [shard_df async for _, shard_df in iter_result_shards(gdrive, result_shards, college_ids)]
+    if not shard_dfs:
+        return None
+
+    result_df = pd.concat(shard_dfs, ignore_index = True)
+
+    # Categories of shards can differ, so they are made categorical again
+    for col in result_df.columns:
+        if col.startswith("sub_") and col.endswith(result_frame.CATEGORICAL_SUBJECT_FIELDS):
+            result_df[col] = pd.Categorical(result_df[col].astype(object))
+    return result_df
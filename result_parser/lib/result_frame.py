@@ -0,0 +1,350 @@
+import io
+import pandas as pd
+import numpy as np
+
+# GGSIPU grade rating
+GRADE_RATING_GGSIPU = {
+    'O': 10,
+    'A+': 9,
+    'A': 8,
+    'B+': 7,
+    'B': 6,
+    'C': 5,
+    'P': 4,
+    'F': 0
+}
+
+# Fields of a subject result, in same order as they are stored in a result file cell
+SUBJECT_FIELDS = ("internal", "external", "grade", "credit", "total", "status")
+NUMERIC_SUBJECT_FIELDS = ("internal", "external", "credit", "total")
+CATEGORICAL_SUBJECT_FIELDS = ("grade", "status")
+
+STUDENT_DETAIL_COLUMNS = ["roll_num", "name", "college_id", "total_marks_scored", "max_marks_possible", "cgpa"]
+
+def get_subject_columns(result_df: pd.DataFrame) -> list[str]:
+    """
+    It will return subject columns (sub_<subject id>) of a result file dataframe, in their order
+    """
+
+    return [col for col in result_df.columns if col.startswith("sub_")]
+
+def get_columnar_subject_columns(columnar_df: pd.DataFrame) -> list[str]:
+    """
+    It will return subject columns (sub_<subject id>) present in a columnar dataframe, in their order
+    """
+
+    return list(dict.fromkeys(
+        col.rsplit(".", 1)[0] for col in columnar_df.columns
+        if col.startswith("sub_") and "." in col
+    ))
+
+def subject_field_column(subject_col: str, field: str) -> str:
+    return f"{subject_col}.{field}"
+
+def _set_subject_fields(
+    subject_fields: dict[str, pd.Series | np.ndarray | list],
+    subject_col: str,
+    internal, external, grade, credit, total, status
+):
+    """
+    It will add typed columns of a subject into given column mapping
+    """
+
+    subject_fields[subject_field_column(subject_col, "internal")] = pd.to_numeric(pd.Series(internal), errors = "coerce").to_numpy(dtype = float)
+    subject_fields[subject_field_column(subject_col, "external")] = pd.to_numeric(pd.Series(external), errors = "coerce").to_numpy(dtype = float)
+    subject_fields[subject_field_column(subject_col, "grade")] = pd.Categorical(grade)
+    subject_fields[subject_field_column(subject_col, "credit")] = pd.to_numeric(pd.Series(credit), errors = "coerce").to_numpy(dtype = float)
+    subject_fields[subject_field_column(subject_col, "total")] = pd.to_numeric(pd.Series(total), errors = "coerce").to_numpy(dtype = float)
+    subject_fields[subject_field_column(subject_col, "status")] = pd.Categorical(status)
+
+def from_student_records(student_result_list: list[dict]) -> pd.DataFrame:
+    """
+    It will build columnar result dataframe from student records, where each subject is a list of
+    [internal, external, grade, credit, total, status]
+    """
+
+    subject_cols = list(dict.fromkeys(
+        key for student in student_result_list for key in student if key.startswith("sub_")
+    ))
+
+    columns = {
+        col: [student.get(col, '') for student in student_result_list]
+        for col in STUDENT_DETAIL_COLUMNS
+    }
+    for subject_col in subject_cols:
+        subject_results = [student.get(subject_col) for student in student_result_list]
+        fields = [
+            [sub_res[field_index] if sub_res is not None else None for sub_res in subject_results]
+            for field_index in range(len(SUBJECT_FIELDS))
+        ]
+        _set_subject_fields(columns, subject_col, *fields)
+
+    columnar_df = pd.DataFrame(columns)
+    return columnar_df.astype({"roll_num": "string", "college_id": "string"})
+
+def to_columnar(result_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    It will convert result file dataframe (each subject cell is a stringified list) into columnar dataframe,
+    having typed internal/external/credit/total and categorical grade/status columns per subject
+    """
+
+    subject_cols = get_subject_columns(result_df)
+    columns = {
+        col: result_df[col] for col in result_df.columns
+        if col not in subject_cols
+    }
+
+    for subject_col in subject_cols:
+        cells = result_df[subject_col]
+        if cells.dtype == object:
+            cells = cells.map(lambda cell: str(cell) if isinstance(cell, list) else cell)
+        cells = cells.astype("string").str.strip()
+
+        # Cells which are not a list are treated as missing subject result
+        is_present = (cells.str.startswith("[") & cells.str.endswith("]")).fillna(False).to_numpy(dtype = bool)
+
+        # Cell contents are parsed together as csv, with quoted grade and status
+        parts = pd.read_csv(
+            io.StringIO("\n".join(cells[is_present].str.slice(1, -1))),
+            header = None,
+            names = range(len(SUBJECT_FIELDS)),
+            dtype = str,
+            quotechar = "'",
+            skipinitialspace = True,
+            keep_default_na = False
+        ) if is_present.any() else pd.DataFrame(columns = range(len(SUBJECT_FIELDS)), dtype = str)
+
+        fields = []
+        for field_index in range(len(SUBJECT_FIELDS)):
+            field_values = np.full(len(cells), None, dtype = object)
+            field_values[is_present] = parts[field_index].to_numpy(dtype = object)
+            fields.append(field_values)
+
+        _set_subject_fields(columns, subject_col, *fields)
+
+    return pd.DataFrame(columns, index = result_df.index)
+
+def _format_number(values: pd.Series) -> pd.Series:
+    """
+    It will format numbers as python does, integral values without decimal part and missing values as None
+    """
+
+    is_integral = (values.notna() & (values % 1 == 0)).to_numpy()
+    formatted = pd.Series("None", index = values.index, dtype = object)
+    formatted[is_integral] = values[is_integral].astype("int64").astype(str)
+
+    is_fractional = values.notna().to_numpy() & ~is_integral
+    if is_fractional.any():
+        formatted[is_fractional] = values[is_fractional].map(repr)
+    return formatted
+
+def to_legacy(columnar_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    It will convert columnar dataframe back into result file dataframe, each subject is stored in a single cell
+    as stringified list of [internal, external, grade, credit, total, status]
+    """
+
+    subject_cols = get_columnar_subject_columns(columnar_df)
+    columns = {
+        col: columnar_df[col] for col in columnar_df.columns
+        if not (col.startswith("sub_") and "." in col)
+    }
+
+    for subject_col in subject_cols:
+        internal = columnar_df[subject_field_column(subject_col, "internal")]
+        is_present = internal.notna()
+
+        grade = columnar_df[subject_field_column(subject_col, "grade")].astype(object).fillna('').astype(str)
+        status = columnar_df[subject_field_column(subject_col, "status")].astype(object).fillna('').astype(str)
+        cells = (
+            "[" + _format_number(internal) +
+            ", " + _format_number(columnar_df[subject_field_column(subject_col, "external")]) +
+            ", '" + grade +
+            "', " + _format_number(columnar_df[subject_field_column(subject_col, "credit")]) +
+            ", " + _format_number(columnar_df[subject_field_column(subject_col, "total")]) +
+            ", '" + status + "']"
+        )
+        columns[subject_col] = cells.where(is_present, np.nan)
+
+    return pd.DataFrame(columns, index = columnar_df.index)
+
+def calculate_cgpa(
+    columnar_df: pd.DataFrame,
+    sub_id_max_marks_map: dict[str, int]
+):
+    """
+    It will calculate total marks, max marks and CGPA of every student of columnar dataframe with whole frame
+    operations, and set them in dataframe
+    """
+
+    subject_cols = get_columnar_subject_columns(columnar_df)
+    if not subject_cols:
+        columnar_df['total_marks_scored'] = 0
+        columnar_df['max_marks_possible'] = 0
+        columnar_df['cgpa'] = np.nan
+        return
+
+    # Students x subjects matrices
+    internal = columnar_df[[subject_field_column(col, "internal") for col in subject_cols]].to_numpy(dtype = float)
+    external = columnar_df[[subject_field_column(col, "external") for col in subject_cols]].to_numpy(dtype = float)
+    credit = columnar_df[[subject_field_column(col, "credit") for col in subject_cols]].to_numpy(dtype = float)
+    grade_points = np.column_stack([
+        columnar_df[subject_field_column(col, "grade")].astype(object).map(GRADE_RATING_GGSIPU).to_numpy(dtype = float)
+        for col in subject_cols
+    ])
+    is_present = ~np.isnan(internal)
+
+    # Max marks is required for every subject which has any result
+    max_marks = np.zeros(len(subject_cols))
+    for col_index, subject_col in enumerate(subject_cols):
+        sub_id = subject_col.replace("sub_", "")
+        sub_max_marks = sub_id_max_marks_map.get(sub_id, None)
+        if sub_max_marks is None:
+            if is_present[:, col_index].any():
+                raise ValueError(f"Subject {sub_id} not found in max marks map")
+            continue
+        max_marks[col_index] = sub_max_marks
+
+    # Unknown grade of a present subject makes CGPA unknown, same as missing grade rating
+    total_marks_scored = np.where(is_present, internal + external, 0).sum(axis = 1)
+    max_marks_possible = np.where(is_present, max_marks, 0).sum(axis = 1)
+    total_credits = np.where(is_present, credit, 0).sum(axis = 1)
+    weighted_grade_points = np.where(is_present, credit * grade_points, 0).sum(axis = 1)
+
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        cgpa = np.round(weighted_grade_points / total_credits, 2)
+
+    columnar_df['total_marks_scored'] = total_marks_scored.astype("int64")
+    columnar_df['max_marks_possible'] = max_marks_possible.astype("int64")
+    columnar_df['cgpa'] = np.where(total_credits > 0, cgpa, np.nan)
+
+def _subject_field_columns(subject_col: str) -> list[str]:
+    return [subject_field_column(subject_col, field) for field in SUBJECT_FIELDS]
+
+def _add_missing_subject_columns(columnar_df: pd.DataFrame, subject_cols: list[str]) -> pd.DataFrame:
+    """
+    It will add empty columns for subjects which are not present in columnar dataframe
+    """
+
+    missing_columns = {}
+    for subject_col in subject_cols:
+        if subject_field_column(subject_col, "internal") in columnar_df.columns:
+            continue
+        for field in SUBJECT_FIELDS:
+            missing_columns[subject_field_column(subject_col, field)] = (
+                np.full(len(columnar_df), np.nan) if field in NUMERIC_SUBJECT_FIELDS
+                else pd.Categorical([None] * len(columnar_df))
+            )
+
+    if not missing_columns:
+        return columnar_df
+    return pd.concat([columnar_df, pd.DataFrame(missing_columns, index = columnar_df.index)], axis = 1)
+
+def merge_supplementary(original_df: pd.DataFrame, new_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    It will merge columnar dataframe of supplementary (reappear/rechecking) result into columnar dataframe of
+    original result. A subject is updated when new external marks are better or original is missing, and new
+    students and subjects are added. CGPA columns are not recalculated
+    """
+
+    original_df = original_df.set_index("roll_num")
+    new_df = new_df.set_index("roll_num")
+
+    new_subject_cols = get_columnar_subject_columns(new_df)
+    original_df = _add_missing_subject_columns(original_df, new_subject_cols)
+
+    # Align new result with original students, students not present in original are added later
+    common_new_df = new_df.reindex(original_df.index)
+    new_students = new_df.index.difference(original_df.index)
+
+    updated_columns = {}
+    for subject_col in new_subject_cols:
+        internal_col = subject_field_column(subject_col, "internal")
+        external_col = subject_field_column(subject_col, "external")
+
+        new_present = common_new_df[internal_col].notna()
+        original_missing = original_df[internal_col].isna()
+        is_better = common_new_df[external_col] > original_df[external_col]
+        take_new = new_present & (original_missing | is_better)
+
+        for field_col in _subject_field_columns(subject_col):
+            if field_col.endswith(CATEGORICAL_SUBJECT_FIELDS):
+                updated_columns[field_col] = pd.Categorical(
+                    common_new_df[field_col].astype(object).where(take_new, original_df[field_col].astype(object))
+                )
+            else:
+                updated_columns[field_col] = common_new_df[field_col].where(take_new, original_df[field_col])
+
+    original_df = original_df.assign(**updated_columns)
+
+    # Add new students, with columns of original result
+    if len(new_students):
+        new_students_df = new_df.loc[new_students].reindex(columns = original_df.columns)
+        merged_df = pd.concat([original_df, new_students_df], ignore_index = False)
+        for col in original_df.columns:
+            if isinstance(original_df[col].dtype, pd.CategoricalDtype):
+                merged_df[col] = pd.Categorical(merged_df[col].astype(object))
+        original_df = merged_df
+
+    original_df.index.name = "roll_num"
+    return original_df.reset_index()
+
+def _import_pyarrow():
+    """
+    It will import pyarrow, which is only required for parquet result files
+    """
+
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("pyarrow is required for parquet result files, install it with `pip install pyarrow`") from e
+
+    return pyarrow, pyarrow.parquet
+
+def to_parquet(columnar_df: pd.DataFrame, file_path: str, row_group_size: int = 1024):
+    """
+    It will write columnar dataframe as parquet file, rows are sorted by college so readers of a single college
+    only read its row groups. roll_num, college_id, grade and status are dictionary encoded
+    """
+
+    pa, pq = _import_pyarrow()
+
+    columnar_df = columnar_df.sort_values(["college_id", "roll_num"], kind = "stable")
+    columnar_df = columnar_df.astype({"college_id": "category"})
+    table = pa.Table.from_pandas(columnar_df, preserve_index = False)
+
+    dictionary_columns = ["roll_num", "college_id"] + [
+        col for col in columnar_df.columns
+        if col.startswith("sub_") and col.endswith(CATEGORICAL_SUBJECT_FIELDS)
+    ]
+    pq.write_table(
+        table,
+        file_path,
+        row_group_size = row_group_size,
+        use_dictionary = dictionary_columns,
+        write_statistics = True
+    )
+
+def read_parquet(
+    source,
+    columns: list[str] | None = None,
+    college_id: str | None = None
+) -> pd.DataFrame:
+    """
+    It will read columnar dataframe from parquet file, only given columns are read and only row groups of
+    given college if college id is given
+    """
+
+    _, pq = _import_pyarrow()
+
+    table = pq.read_table(
+        source,
+        columns = columns,
+        filters = [("college_id", "==", college_id)] if college_id is not None else None
+    )
+    columnar_df = table.to_pandas()
+
+    # College id is dictionary encoded only in file
+    dtypes = { col: "string" for col in ("roll_num", "college_id") if col in columnar_df.columns }
+    return columnar_df.astype(dtypes)
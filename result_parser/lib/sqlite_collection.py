@@ -0,0 +1,439 @@
+import sqlite3
+from bson import ObjectId, json_util
+from pymongo import InsertOne, UpdateOne, UpdateMany
+
+# Query operators supported in filters, and update operators supported in updates
+QUERY_OPERATORS = ("$in", "$nin", "$eq", "$ne", "$exists", "$elemMatch")
+UPDATE_OPERATORS = ("$set", "$setOnInsert", "$unset", "$push", "$addToSet")
+
+# Fields kept in indexed columns of every collection table, equality filters on them are looked up in sqlite
+INDEXED_FIELDS = ("university_id", "batch_id", "degree_id", "subject_code")
+
+_MISSING = object()
+
+def _get_child(value, key: str):
+    """
+    It will return child of a document or array element by key, array elements are addressed by index
+    """
+
+    if isinstance(value, dict):
+        return value.get(key, _MISSING)
+    if isinstance(value, list) and key.isdigit() and int(key) < len(value):
+        return value[int(key)]
+    return _MISSING
+
+def _get_path(doc: dict, path: str):
+    """
+    It will return value at dotted path of document, _MISSING if path doesn't exist
+    """
+
+    value = doc
+    for key in path.split("."):
+        value = _get_child(value, key)
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+def _get_parent(doc: dict, path: str) -> tuple[dict | list, str]:
+    """
+    It will return container of last key of dotted path along with that key, missing documents on the way are created
+    """
+
+    keys = path.split(".")
+    container = doc
+    for key in keys[:-1]:
+        child = _get_child(container, key)
+        if not isinstance(child, (dict, list)):
+            child = dict()
+            container[key] = child
+        container = child
+    return container, keys[-1]
+
+def _set_path(doc: dict, path: str, value):
+    container, key = _get_parent(doc, path)
+    if isinstance(container, list):
+        container[int(key)] = value
+    else:
+        container[key] = value
+
+def _unset_path(doc: dict, path: str):
+    if _get_path(doc, path) is _MISSING:
+        return
+    container, key = _get_parent(doc, path)
+    if isinstance(container, list):
+        container[int(key)] = None
+    else:
+        container.pop(key)
+
+def _is_operator_condition(condition) -> bool:
+    return isinstance(condition, dict) and bool(condition) and all(key.startswith("$") for key in condition)
+
+def _matches_value(value, condition) -> bool:
+    """
+    It will match value of a field with condition, an array field matches if any of its elements matches
+    """
+
+    if not _is_operator_condition(condition):
+        if value is _MISSING:
+            return condition is None
+        return value == condition or (isinstance(value, list) and condition in value)
+
+    for operator, operand in condition.items():
+        if operator == "$eq":
+            is_matched = _matches_value(value, operand)
+        elif operator == "$ne":
+            is_matched = not _matches_value(value, operand)
+        elif operator == "$in":
+            is_matched = any(_matches_value(value, item) for item in operand)
+        elif operator == "$nin":
+            is_matched = not any(_matches_value(value, item) for item in operand)
+        elif operator == "$exists":
+            is_matched = (value is not _MISSING) == bool(operand)
+        elif operator == "$elemMatch":
+            is_matched = isinstance(value, list) and any(
+                isinstance(item, dict) and matches_filter(item, operand) for item in value
+            )
+        else:
+            raise NotImplementedError(f"Query operator {operator} is not supported by sqlite collection, supported: {QUERY_OPERATORS}")
+        if not is_matched:
+            return False
+    return True
+
+def matches_filter(doc: dict, query_filter: dict) -> bool:
+    """
+    It will tell whether document matches mongo style filter, only operators used by Result_DB are supported
+    """
+
+    for key, condition in query_filter.items():
+        if key == "$or":
+            if not any(matches_filter(doc, sub_filter) for sub_filter in condition):
+                return False
+        elif key == "$and":
+            if not all(matches_filter(doc, sub_filter) for sub_filter in condition):
+                return False
+        elif not _matches_value(_get_path(doc, key), condition):
+            return False
+    return True
+
+def _get_positional_index(doc: dict, query_filter: dict) -> int | None:
+    """
+    It will return index of first array element matched by filter, used for positional `$` of update
+    """
+
+    for key, condition in query_filter.items():
+        value = _get_path(doc, key)
+        if key.startswith("$") or not isinstance(value, list):
+            continue
+        for index, item in enumerate(value):
+            if isinstance(condition, dict) and "$elemMatch" in condition:
+                if isinstance(item, dict) and matches_filter(item, condition["$elemMatch"]):
+                    return index
+            elif _matches_value(item, condition):
+                return index
+    return None
+
+def apply_update(doc: dict, update: dict, query_filter: dict, is_insert: bool = False):
+    """
+    It will apply mongo style update on document in place, only operators used by Result_DB are supported
+    """
+
+    positional_index = None
+    for operator, fields in update.items():
+        if operator not in UPDATE_OPERATORS:
+            raise NotImplementedError(f"Update operator {operator} is not supported by sqlite collection, supported: {UPDATE_OPERATORS}")
+        if operator == "$setOnInsert" and not is_insert:
+            continue
+
+        for path, value in fields.items():
+            if ".$." in path or path.endswith(".$"):
+                if positional_index is None:
+                    positional_index = _get_positional_index(doc, query_filter)
+                    if positional_index is None:
+                        raise ValueError(f"Positional update {path} needs filter matching an array element")
+                path = path.replace(".$", f".{positional_index}")
+
+            if operator in ("$set", "$setOnInsert"):
+                _set_path(doc, path, value)
+            elif operator == "$unset":
+                _unset_path(doc, path)
+            else:
+                values = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+                array = _get_path(doc, path)
+                if array is _MISSING:
+                    array = list()
+                    _set_path(doc, path, array)
+                for item in values:
+                    if operator == "$push" or item not in array:
+                        array.append(item)
+
+def _get_index_key(value) -> str | None:
+    """
+    It will return key of scalar value stored in indexed column, values equal in python have same key. Other values
+    (arrays, documents, null) have no key, their documents are kept with null in column
+    """
+
+    if isinstance(value, (bool, int, float)):
+        try:
+            return f"num:{float(value)!r}"
+        except OverflowError:
+            return None
+    if isinstance(value, (str, ObjectId)):
+        return f"{type(value).__name__}:{value}"
+    return None
+
+def _get_index_keys(condition) -> list[str] | None:
+    """
+    It will return index keys one of which value of a field must have to match equality or `$in` condition, None if
+    condition can't be looked up in indexed column
+    """
+
+    if not _is_operator_condition(condition):
+        index_key = _get_index_key(condition)
+        return None if index_key is None else [index_key]
+    if list(condition) == ["$eq"]:
+        return _get_index_keys(condition["$eq"])
+    if list(condition) == ["$in"]:
+        index_keys = [_get_index_key(item) for item in condition["$in"]]
+        return None if None in index_keys else index_keys
+    return None
+
+class UpdateResult:
+    def __init__(self, matched_count: int, modified_count: int, upserted_id: ObjectId | None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+
+class BulkWriteResult:
+    def __init__(self):
+        self.inserted_count = 0
+        self.matched_count = 0
+        self.modified_count = 0
+        self.upserted_ids: dict[int, ObjectId] = dict()    # key: index of operation
+
+class SQLiteSession:
+    """
+    Transaction over sqlite connection shared by every collection, writes inside it are committed or rolled back
+    together. Connection is shared, so writes of other pdfs made while transaction is open are committed with it
+    """
+
+    __connection: sqlite3.Connection
+    in_transaction: bool
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.__connection = connection
+        self.in_transaction = False
+
+    def start_transaction(self):
+        self.in_transaction = True
+
+    async def commit_transaction(self):
+        self.__connection.commit()
+        self.in_transaction = False
+
+    async def abort_transaction(self):
+        self.__connection.rollback()
+        self.in_transaction = False
+
+    async def end_session(self):
+        if self.in_transaction:
+            await self.abort_transaction()
+
+class SQLiteCursor:
+    def __init__(self, docs: list[dict]):
+        self.__docs = docs
+
+    async def to_list(self, length: int | None = None) -> list[dict]:
+        return self.__docs if length is None else self.__docs[:length]
+
+class SQLiteCollection:
+    """
+    Collection of documents stored as json in a sqlite table, with the async subset of motor collection api used
+    by Result_DB. Equality filters on document id and indexed fields are looked up in sqlite, so large collections
+    (e.g. student index) aren't scanned, documents found are then matched with whole filter in python
+    """
+
+    name: str
+    __connection: sqlite3.Connection
+
+    def __init__(self, connection: sqlite3.Connection, name: str):
+        self.name = name
+        self.__connection = connection
+        self.__connection.execute(f'CREATE TABLE IF NOT EXISTS "{name}" (_id TEXT PRIMARY KEY, doc TEXT NOT NULL)')
+        self.__add_indexed_columns()
+        self.__connection.commit()
+
+    def __add_indexed_columns(self):
+        """
+        It will add indexed columns missing in table, those of tables created before them are filled from documents
+        """
+
+        columns = { row[1] for row in self.__connection.execute(f'PRAGMA table_info("{self.name}")') }
+        missing_fields = [field for field in INDEXED_FIELDS if field not in columns]
+        for field in missing_fields:
+            self.__connection.execute(f'ALTER TABLE "{self.name}" ADD COLUMN "{field}" TEXT')
+        for field in INDEXED_FIELDS:
+            self.__connection.execute(f'CREATE INDEX IF NOT EXISTS "{self.name}_{field}" ON "{self.name}" ("{field}")')
+
+        if missing_fields:
+            assignments = ", ".join(f'"{field}" = ?' for field in missing_fields)
+            for doc_id, doc_json in self.__connection.execute(f'SELECT _id, doc FROM "{self.name}"').fetchall():
+                doc = json_util.loads(doc_json)
+                self.__connection.execute(
+                    f'UPDATE "{self.name}" SET {assignments} WHERE _id = ?',
+                    (*(_get_index_key(doc.get(field)) for field in missing_fields), doc_id)
+                )
+
+    def __load_docs(self, query_filter: dict) -> list[dict]:
+        """
+        It will return documents matching filter in insertion order. Equality of document id and of indexed fields is
+        looked up in sqlite, a document with array in indexed field has null in its column so it is always checked
+        """
+
+        conditions, params = list(), list()
+        doc_id = query_filter.get("_id")
+        if doc_id is not None and not _is_operator_condition(doc_id):
+            conditions.append("_id = ?")
+            params.append(str(doc_id))
+
+        for field in INDEXED_FIELDS:
+            index_keys = _get_index_keys(query_filter[field]) if field in query_filter else None
+            if index_keys is not None:
+                placeholders = ", ".join("?" * len(index_keys))
+                conditions.append(f'("{field}" IN ({placeholders}) OR "{field}" IS NULL)')
+                params.extend(index_keys)
+
+        where_clause = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        rows = self.__connection.execute(f'SELECT doc FROM "{self.name}" {where_clause}ORDER BY rowid', params).fetchall()
+
+        docs = (json_util.loads(row[0]) for row in rows)
+        return [doc for doc in docs if matches_filter(doc, query_filter)]
+
+    def __save_doc(self, doc: dict):
+        columns = ", ".join(f'"{field}"' for field in INDEXED_FIELDS)
+        placeholders = ", ".join("?" * len(INDEXED_FIELDS))
+        self.__connection.execute(
+            f'INSERT OR REPLACE INTO "{self.name}" (_id, doc, {columns}) VALUES (?, ?, {placeholders})',
+            (str(doc["_id"]), json_util.dumps(doc), *(_get_index_key(doc.get(field)) for field in INDEXED_FIELDS))
+        )
+
+    def __commit(self, session: SQLiteSession | None):
+        """
+        It will commit write, unless it is part of an open transaction
+        """
+
+        if session is None or not session.in_transaction:
+            self.__connection.commit()
+
+    def __upsert_doc(self, query_filter: dict, update: dict) -> dict:
+        """
+        It will create new document from equality conditions of filter and given update
+        """
+
+        doc = {
+            key: condition for key, condition in query_filter.items()
+            if not key.startswith("$") and "." not in key and not _is_operator_condition(condition)
+        }
+        apply_update(doc, update, query_filter, is_insert = True)
+        doc.setdefault("_id", ObjectId())
+        return doc
+
+    def __update(self, query_filter: dict, update: dict, upsert: bool, multi: bool) -> tuple[list[dict], list[dict], dict | None]:
+        """
+        It will update matching documents, it returns documents before and after update, and upserted document
+        """
+
+        docs = self.__load_docs(query_filter)
+        if not multi:
+            docs = docs[:1]
+
+        if not docs:
+            if not upsert:
+                return [], [], None
+            upserted_doc = self.__upsert_doc(query_filter, update)
+            self.__save_doc(upserted_doc)
+            return [], [], upserted_doc
+
+        updated_docs = list()
+        for doc in docs:
+            updated_doc = json_util.loads(json_util.dumps(doc))
+            apply_update(updated_doc, update, query_filter)
+            self.__save_doc(updated_doc)
+            updated_docs.append(updated_doc)
+        return docs, updated_docs, None
+
+    async def find_one(self, query_filter: dict | None = None, session: SQLiteSession | None = None) -> dict | None:
+        docs = self.__load_docs(query_filter or {})
+        return docs[0] if docs else None
+
+    def find(self, query_filter: dict | None = None, session: SQLiteSession | None = None) -> SQLiteCursor:
+        return SQLiteCursor(self.__load_docs(query_filter or {}))
+
+    async def insert_one(self, doc: dict, session: SQLiteSession | None = None):
+        doc.setdefault("_id", ObjectId())
+        self.__save_doc(doc)
+        self.__commit(session)
+
+    async def update_one(
+        self,
+        query_filter: dict,
+        update: dict,
+        upsert: bool = False,
+        session: SQLiteSession | None = None
+    ) -> UpdateResult:
+        docs, _, upserted_doc = self.__update(query_filter, update, upsert, multi = False)
+        self.__commit(session)
+        return UpdateResult(len(docs), len(docs), upserted_doc["_id"] if upserted_doc else None)
+
+    async def update_many(
+        self,
+        query_filter: dict,
+        update: dict,
+        upsert: bool = False,
+        session: SQLiteSession | None = None
+    ) -> UpdateResult:
+        docs, _, upserted_doc = self.__update(query_filter, update, upsert, multi = True)
+        self.__commit(session)
+        return UpdateResult(len(docs), len(docs), upserted_doc["_id"] if upserted_doc else None)
+
+    async def find_one_and_update(
+        self,
+        query_filter: dict,
+        update: dict,
+        upsert: bool = False,
+        return_document: bool = False,     # pymongo.ReturnDocument.BEFORE (False) or AFTER (True)
+        session: SQLiteSession | None = None
+    ) -> dict | None:
+        docs, updated_docs, upserted_doc = self.__update(query_filter, update, upsert, multi = False)
+        self.__commit(session)
+        if return_document:
+            return updated_docs[0] if updated_docs else upserted_doc
+        return docs[0] if docs else None
+
+    async def bulk_write(self, requests: list, ordered: bool = True, session: SQLiteSession | None = None) -> BulkWriteResult:
+        """
+        It will apply InsertOne, UpdateOne and UpdateMany operations in order
+        """
+
+        bulk_result = BulkWriteResult()
+        for op_index, request in enumerate(requests):
+            # Operations of pymongo keep their document, filter and upsert flag in these attributes
+            if isinstance(request, InsertOne):
+                request._doc.setdefault("_id", ObjectId())
+                self.__save_doc(request._doc)
+                bulk_result.inserted_count += 1
+            elif isinstance(request, (UpdateOne, UpdateMany)):
+                docs, _, upserted_doc = self.__update(
+                    request._filter,
+                    request._doc,
+                    bool(request._upsert),
+                    multi = isinstance(request, UpdateMany)
+                )
+                bulk_result.matched_count += len(docs)
+                bulk_result.modified_count += len(docs)
+                if upserted_doc is not None:
+                    bulk_result.upserted_ids[op_index] = upserted_doc["_id"]
+            else:
+                raise NotImplementedError(f"Bulk write operation {type(request).__name__} is not supported by sqlite collection")
+
+        self.__commit(session)
+        return bulk_result
@@ -0,0 +1,150 @@
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+import pymongo.collection
+from pymongo import WriteConcern
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import ReadPreference
+from pymongo.client_session import TransactionOptions
+from result_parser.lib.env import ENV
+from result_parser.lib.sqlite_collection import SQLiteCollection, SQLiteSession
+from result_parser.lib.local_file_store import LocalFileStore
+
+txn_options = TransactionOptions(
+    read_concern = ReadConcern("snapshot"),
+    write_concern = WriteConcern("majority"),
+    read_preference = ReadPreference.PRIMARY,
+    max_commit_time_ms = 120000  # 120 seconds
+)
+
+class StorageBackend(ABC):
+    """
+    Storage used by Result_DB, metadata collections (university, batch, degree, subject, student index) with motor
+    collection api and a file store of result files with AsyncGDrive api
+    """
+
+    name: str
+    uni_collec: pymongo.collection.Collection
+    batch_collec: pymongo.collection.Collection
+    degree_collec: pymongo.collection.Collection
+    subject_collec: pymongo.collection.Collection
+    student_index_collec: pymongo.collection.Collection
+
+    @property
+    @abstractmethod
+    def file_store(self):
+        pass
+
+    @abstractmethod
+    async def start_session(self):
+        """
+        It will return session whose transaction groups metadata writes
+        """
+
+    def close(self):
+        pass
+
+class MongoDriveBackend(StorageBackend):
+    """
+    Metadata in mongo db and result files in google drive
+    """
+
+    name = "mongo_drive"
+
+    def __init__(self):
+        # Imported here, so local backend never creates mongo client or needs google credentials
+        from result_parser.lib.db import DB
+        from result_parser.lib.gdrive import AsyncGDrive
+
+        self.__db = DB()
+        self.uni_collec = self.__db._uni_collec
+        self.batch_collec = self.__db._batch_collec
+        self.degree_collec = self.__db._degree_collec
+        self.subject_collec = self.__db._subject_collec
+        self.student_index_collec = self.__db._student_index_collec
+        self.__file_store = AsyncGDrive()
+
+    @property
+    def file_store(self):
+        return self.__file_store
+
+    async def start_session(self):
+        return await self.__db._client.start_session(default_transaction_options = txn_options)
+
+class LocalBackend(StorageBackend):
+    """
+    Metadata in a sqlite database and result files in a folder tree, both inside local storage folder. It needs no
+    network or credentials, and its content can be synced to mongo db and drive later
+    """
+
+    name = "local"
+    storage_folder_path: str
+    __connection: sqlite3.Connection
+    __file_store: LocalFileStore
+
+    def __init__(self, storage_folder_path: str | None = None):
+        self.storage_folder_path = os.path.abspath(storage_folder_path or ENV.LOCAL_STORAGE_PATH)
+        os.makedirs(self.storage_folder_path, exist_ok = True)
+
+        self.__connection = sqlite3.connect(os.path.join(self.storage_folder_path, "metadata.sqlite3"))
+        self.uni_collec = SQLiteCollection(self.__connection, "universities")
+        self.batch_collec = SQLiteCollection(self.__connection, "batches")
+        self.degree_collec = SQLiteCollection(self.__connection, "degrees")
+        self.subject_collec = SQLiteCollection(self.__connection, "subjects")
+        self.student_index_collec = SQLiteCollection(self.__connection, "student_index")
+        self.__file_store = LocalFileStore(os.path.join(self.storage_folder_path, "files"))
+
+        # Fingerprints of result files already synced to remote storage, key: degree doc id / semester / college id
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS sync_state (sync_key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL)")
+        self.__connection.commit()
+
+    @property
+    def file_store(self) -> LocalFileStore:
+        return self.__file_store
+
+    async def start_session(self) -> SQLiteSession:
+        return SQLiteSession(self.__connection)
+
+    def get_synced_fingerprint(self, sync_key: str) -> str | None:
+        row = self.__connection.execute("SELECT fingerprint FROM sync_state WHERE sync_key = ?", (sync_key,)).fetchone()
+        return row[0] if row else None
+
+    def set_synced_fingerprint(self, sync_key: str, fingerprint: str):
+        self.__connection.execute(
+            "INSERT OR REPLACE INTO sync_state (sync_key, fingerprint) VALUES (?, ?)",
+            (sync_key, fingerprint)
+        )
+        self.__connection.commit()
+
+    def close(self):
+        self.__connection.close()
+
+STORAGE_BACKENDS = {
+    MongoDriveBackend.name: MongoDriveBackend,
+    LocalBackend.name: LocalBackend
+}
+
+# Storage backend of a run, shared by every Result_DB instance, key: backend name
+_storage_backends: dict[str, StorageBackend] = dict()
+
+def get_storage_backend(backend_name: str | None = None) -> StorageBackend:
+    """
+    It will return storage backend of given name (default configured one), created once per run
+    """
+
+    backend_name = backend_name or ENV.STORAGE_BACKEND
+    if backend_name not in STORAGE_BACKENDS:
+        raise ValueError(f"Storage backend {backend_name} is not supported, supported: {list(STORAGE_BACKENDS)}")
+
+    if backend_name not in _storage_backends:
+        _storage_backends[backend_name] = STORAGE_BACKENDS[backend_name]()
+    return _storage_backends[backend_name]
+
+def close_storage_backends():
+    """
+    It will close every storage backend of run, next get creates them again
+    """
+
+    for storage_backend in _storage_backends.values():
+        storage_backend.close()
+    _storage_backends.clear()
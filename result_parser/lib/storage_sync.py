@@ -0,0 +1,122 @@
+from result_parser.lib.logger import result_db_logger
+from result_parser.lib.result_db import Result_DB, RESULT_FILE_FIELDS, get_sem_result_files
+from result_parser.lib.result_files import read_result_file
+from result_parser.lib.storage_backend import StorageBackend, LocalBackend, MongoDriveBackend, get_storage_backend
+
+def _get_full_degree_name(degree_doc: dict) -> str:
+    """
+    It will join degree and branch name back as they appear in pdf, so degree is matched with same branch remotely
+    """
+
+    if degree_doc["branch_name"] == "GENERAL":
+        return degree_doc["degree_name"]
+    return f"{degree_doc['degree_name']} ({degree_doc['branch_name']})"
+
+def _get_result_units(degree_doc: dict) -> list[tuple[int, str | None, dict[str, str]]]:
+    """
+    It will return result files of degree as (semester num, shard college id, result file ids) for each semester
+    file, or for each college shard of a sharded semester
+    """
+
+    result_units = list()
+    sem_keys = { sem_key for field in RESULT_FILE_FIELDS for sem_key in (degree_doc.get(field) or {}) }
+    for sem_key in sorted(sem_keys, key = int):
+        result_shards, result_file_ids = get_sem_result_files(degree_doc, sem_key)
+        for college_id, shard_file_ids in result_shards.items():
+            result_units.append((int(sem_key), college_id, shard_file_ids))
+        if result_file_ids:
+            result_units.append((int(sem_key), None, result_file_ids))
+    return result_units
+
+async def _sync_degree(
+    local_backend: LocalBackend,
+    remote_db: Result_DB,
+    degree_doc: dict,
+    local_subjects: dict
+) -> int:
+    """
+    It will sync result files of a degree whose content changed since their last sync, and return number of synced files
+    """
+
+    remote_db.reset_subject_data_list()
+    subject_ids = await remote_db.add_subjects([
+        (sub["subject_name"], sub["subject_code"], sub["subject_id"], sub["max_marks"])
+        for sub in (local_subjects[subject_doc_id] for subject_doc_id in degree_doc["subjects"].values())
+    ])
+
+    synced_files = 0
+    for semester_num, shard_college_id, result_file_ids in _get_result_units(degree_doc):
+        sync_key = f"{degree_doc['_id']}/{semester_num}/{shard_college_id or ''}"
+        fingerprint = ",".join(
+            local_backend.file_store.get_file_md5(file_id) for _, file_id in sorted(result_file_ids.items()) if file_id
+        )
+        if local_backend.get_synced_fingerprint(sync_key) == fingerprint:
+            continue
+
+        result_df = await read_result_file(local_backend.file_store, result_file_ids)
+        if result_df is None:
+            continue
+
+        # Results are stored college by college, as colleges are linked along with their results
+        for college in degree_doc["colleges"]:
+            if semester_num not in college["available_semester"]:
+                continue
+            for shift, college_id in college["shifts"].items():
+                if shard_college_id and college_id != shard_college_id:
+                    continue
+                college_df = result_df[result_df["college_id"] == college_id].reset_index(drop = True)
+                if college_df.empty:
+                    continue
+
+                await remote_db.link_all_metadata(
+                    subject_ids = subject_ids,
+                    degree_id = degree_doc["degree_id"],
+                    degree_name = _get_full_degree_name(degree_doc),
+                    batch = degree_doc["batch_year"],
+                    college_id = college_id,
+                    college_name = college["college_name"],
+                    semester_num = semester_num,
+                    is_evening_shift = shift == "E"
+                )
+                await remote_db.store_and_upload_result(section_result = college_df)
+
+        if result_df["college_id"].isin([
+            college_id for college in degree_doc["colleges"] for college_id in college["shifts"].values()
+        ]).sum() < len(result_df):
+            result_db_logger.warning(f"Some results of degree {degree_doc['degree_id']} semester {semester_num} have no linked college, they are not synced")
+
+        # Sync of file is recorded only once its results are uploaded and linked remotely
+        await remote_db.flush_results()
+        local_backend.set_synced_fingerprint(sync_key, fingerprint)
+        synced_files += 1
+        result_db_logger.info(f"Synced degree {degree_doc['degree_id']} batch {degree_doc['batch_year']} semester {semester_num} results")
+    return synced_files
+
+async def sync_local_storage(local_backend: LocalBackend, remote_backend: StorageBackend | None = None) -> int:
+    """
+    It will push metadata and results of local storage to remote storage (mongo db and drive by default). Results
+    are stored through Result_DB, so they are merged with existing remote results same as parsed results. Result
+    files unchanged since their last sync are skipped. It returns number of synced result files
+    """
+
+    remote_backend = remote_backend or get_storage_backend(MongoDriveBackend.name)
+    synced_files = 0
+    for uni_doc in await local_backend.uni_collec.find({}).to_list(length = None):
+        remote_db = await Result_DB.create(uni_doc["name"], storage_backend = remote_backend)
+        local_subjects = {
+            sub["_id"]: sub for sub in await local_backend.subject_collec.find({
+                "university_id": uni_doc["_id"]
+            }).to_list(length = None)
+        }
+
+        uni_synced_files = 0
+        for _, batch_doc_id in sorted(uni_doc["batches"].items()):
+            for degree_doc in await local_backend.degree_collec.find({ "batch_id": batch_doc_id }).to_list(length = None):
+                uni_synced_files += await _sync_degree(local_backend, remote_db, degree_doc, local_subjects)
+
+        synced_files += uni_synced_files
+        result_db_logger.info(f"Local storage of {uni_doc['name']} synced, {uni_synced_files} result files")
+
+    # Every synced file is flushed by its degree already, anything left in buffer is uploaded before returning
+    await Result_DB.flush_all_results(storage_backend = remote_backend)
+    return synced_files
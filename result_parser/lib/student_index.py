@@ -0,0 +1,55 @@
+import pandas as pd
+from pymongo import UpdateOne
+
+def get_csv_row_ranges(file_path: str) -> tuple[int, list[tuple[int, int]]]:
+    """
+    It will return byte length of header of csv file along with byte range (offset, length) of each of its rows.
+    A quoted value can span lines, so a row ends only at a line where its quotes are balanced
+    """
+
+    row_ranges = list()
+    row_start = position = quote_count = 0
+    with open(file_path, "rb") as f:
+        for line in f:
+            position += len(line)
+            quote_count += line.count(b'"')
+            if quote_count % 2:
+                continue
+
+            row_ranges.append((row_start, position - row_start))
+            row_start = position
+            quote_count = 0
+
+    _, header_length = row_ranges.pop(0)
+    return header_length, row_ranges
+
+def build_student_index_ops(
+    roll_nums: pd.Series,
+    csv_file_path: str,
+    csv_file_id: str,
+    semester_num: int
+) -> list[UpdateOne]:
+    """
+    It will return index updates pointing each student of a result csv file to its row in file, so result of a
+    student is read with ranged reads of header and its row only. Roll nums are in same order as rows of file
+    """
+
+    header_length, row_ranges = get_csv_row_ranges(csv_file_path)
+    if len(row_ranges) != len(roll_nums):
+        raise ValueError(f"Result file {csv_file_path} has {len(row_ranges)} rows, expected {len(roll_nums)}")
+
+    return [
+        UpdateOne({
+            "_id": roll_num
+        }, {
+            "$set": {
+                f"semesters.{semester_num}": {
+                    "file_id": csv_file_id,
+                    "header_length": header_length,
+                    "offset": offset,
+                    "length": length
+                }
+            }
+        }, upsert = True)
+        for roll_num, (offset, length) in zip(roll_nums, row_ranges)
+    ]
@@ -0,0 +1,72 @@
+from collections import defaultdict
+
+class SubjectCatalog:
+    """
+    In memory catalog of all subjects of a university, indexed by (subject code, batch year) and by subject id.
+    It is loaded once and kept updated as subjects are inserted or linked with batch years
+    """
+
+    __subjects_by_doc_id: dict[str, dict]
+    __subjects_by_code_batch: defaultdict[tuple[str, int], dict[str, dict]]
+    __subjects_by_subject_id: defaultdict[str, dict[str, dict]]
+    is_loaded: bool
+
+    def __init__(self):
+        self.__subjects_by_doc_id = dict()
+        self.__subjects_by_code_batch = defaultdict(dict)
+        self.__subjects_by_subject_id = defaultdict(dict)
+        self.is_loaded = False
+
+    def load(self, subject_docs: list[dict]):
+        """
+        It will fill catalog with given subject documents
+        """
+
+        for sub_doc in subject_docs:
+            self.add(sub_doc)
+        self.is_loaded = True
+
+    def add(self, sub_doc: dict):
+        """
+        It will add or replace a subject document in catalog
+        """
+
+        doc_id = str(sub_doc["_id"])
+        sub_doc = { **sub_doc, "batch_years": list(sub_doc.get("batch_years", [])) }
+        self.__subjects_by_doc_id[doc_id] = sub_doc
+        self.__subjects_by_subject_id[sub_doc["subject_id"]][doc_id] = sub_doc
+        for batch_year in sub_doc["batch_years"]:
+            self.__subjects_by_code_batch[(sub_doc["subject_code"], batch_year)][doc_id] = sub_doc
+
+    def link_batch_year(self, subject_doc_ids: list, batch_year: int):
+        """
+        It will link given subjects with batch year, same as adding batch year in their batch_years
+        """
+
+        for subject_doc_id in subject_doc_ids:
+            sub_doc = self.__subjects_by_doc_id.get(str(subject_doc_id))
+            if sub_doc is None:
+                continue
+
+            if batch_year not in sub_doc["batch_years"]:
+                sub_doc["batch_years"].append(batch_year)
+            self.__subjects_by_code_batch[(sub_doc["subject_code"], batch_year)][str(subject_doc_id)] = sub_doc
+
+    def find_by_code(self, subject_code: str, batch_year: int) -> list[dict]:
+        return list(self.__subjects_by_code_batch.get((subject_code, batch_year), {}).values())
+
+    def find_by_subject_id(self, subject_id: str) -> list[dict]:
+        return list(self.__subjects_by_subject_id.get(subject_id, {}).values())
+
+    def find(self, subject_id: str, subject_code: str) -> dict | None:
+        """
+        It will return subject document of given subject id and subject code
+        """
+
+        return next((
+            sub_doc for sub_doc in self.find_by_subject_id(subject_id)
+            if sub_doc["subject_code"] == subject_code
+        ), None)
+
+    def __len__(self) -> int:
+        return len(self.__subjects_by_doc_id)
@@ -0,0 +1,218 @@
+import os
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager, nullcontext
+from result_parser.lib.env import ENV
+from result_parser.lib.logger import tracing_logger
+
+# Span categories, time of a pdf is split between them to tell where the run was bound
+CPU = "cpu"             # Page extraction, parsing and result processing
+MONGO = "mongo"
+DRIVE = "drive"
+DOWNLOAD = "download"   # Downloading pdf from university site
+CATEGORIES = (CPU, MONGO, DRIVE, DOWNLOAD)
+
+class PdfTrace:
+    """
+    Timings of spans recorded while a pdf is parsed, aggregated by span name. Self time of a span excludes time of
+    spans nested in it, so time of a stage waiting on mongo or drive is counted only once
+    """
+
+    pdf_key: str
+    status: str
+    error: str | None
+    __started_at: str
+    __start_time: float
+    __spans: dict[str, dict]     # key: span name, value: { category, count, total_seconds, self_seconds, max_seconds }
+    __lock: threading.Lock
+
+    def __init__(self, pdf_key: str):
+        self.pdf_key = pdf_key
+        self.status = "completed"
+        self.error = None
+        self.__started_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+        self.__start_time = time.perf_counter()
+        self.__spans = dict()
+        self.__lock = threading.Lock()
+
+    def record(self, name: str, category: str, duration: float, self_duration: float):
+        """
+        It will add a finished span, spans can finish in drive or pdf threads too
+        """
+
+        with self.__lock:
+            span_stats = self.__spans.get(name)
+            if span_stats is None:
+                span_stats = self.__spans[name] = {
+                    "category": category,
+                    "count": 0,
+                    "total_seconds": 0.0,
+                    "self_seconds": 0.0,
+                    "max_seconds": 0.0
+                }
+            span_stats["count"] += 1
+            span_stats["total_seconds"] += duration
+            span_stats["self_seconds"] += self_duration
+            span_stats["max_seconds"] = max(span_stats["max_seconds"], duration)
+
+    def summary(self) -> dict:
+        """
+        It will return timing summary of pdf, bound is the category where most of the time went
+        """
+
+        with self.__lock:
+            spans = { name: dict(span_stats) for name, span_stats in self.__spans.items() }
+
+        category_seconds = dict.fromkeys(CATEGORIES, 0.0)
+        for span_stats in spans.values():
+            category_seconds[span_stats["category"]] += span_stats["self_seconds"]
+
+        return {
+            "pdf_key": self.pdf_key,
+            "started_at": self.__started_at,
+            "status": self.status,
+            "error": self.error,
+            "wall_seconds": round(time.perf_counter() - self.__start_time, 4),
+            "bound": max(category_seconds, key = category_seconds.get) if any(category_seconds.values()) else None,
+            "category_seconds": { category: round(seconds, 4) for category, seconds in category_seconds.items() },
+            "spans": {
+                name: {
+                    **span_stats,
+                    "total_seconds": round(span_stats["total_seconds"], 4),
+                    "self_seconds": round(span_stats["self_seconds"], 4),
+                    "max_seconds": round(span_stats["max_seconds"], 4)
+                } for name, span_stats in sorted(spans.items(), key = lambda item: -item[1]["self_seconds"])
+            }
+        }
+
+class _ActiveSpan:
+    """
+    Span which is not finished yet, time of spans finished inside it is added to it
+    """
+
+    __slots__ = ("child_seconds",)
+
+    def __init__(self):
+        self.child_seconds = 0.0
+
+def _create_otel_tracer():
+    """
+    It will create OpenTelemetry tracer exporting spans to OTLP endpoint, None if endpoint is not configured
+    """
+
+    if not ENV.OTEL_EXPORTER_OTLP_ENDPOINT:
+        return None
+
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError as e:
+        raise ImportError(
+            "opentelemetry is required to export spans, install it with "
+            "`pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http`"
+        ) from e
+
+    # Spans are exported in background, pending spans are exported when process exits
+    tracer_provider = TracerProvider(resource = Resource.create({ "service.name": "result_parser" }))
+    tracer_provider.add_span_processor(BatchSpanProcessor(
+        OTLPSpanExporter(endpoint = f"{ENV.OTEL_EXPORTER_OTLP_ENDPOINT.rstrip('/')}/v1/traces")
+    ))
+    trace.set_tracer_provider(tracer_provider)
+    return trace.get_tracer("result_parser")
+
+# Trace of pdf being parsed and innermost unfinished span, per asyncio task (and copied into threads it starts)
+_current_trace: contextvars.ContextVar[PdfTrace | None] = contextvars.ContextVar("current_trace", default = None)
+_current_span: contextvars.ContextVar[_ActiveSpan | None] = contextvars.ContextVar("current_span", default = None)
+
+_otel_tracer = _create_otel_tracer()
+_metrics_file_lock = threading.Lock()
+
+@contextmanager
+def span(name: str, category: str = CPU, **attributes):
+    """
+    It will time the block it wraps into trace of current pdf, works around awaits too. Outside of a pdf trace it
+    does nothing unless spans are exported to OpenTelemetry
+    """
+
+    trace = _current_trace.get()
+    if trace is None and _otel_tracer is None:
+        yield
+        return
+
+    parent_span = _current_span.get()
+    active_span = _ActiveSpan()
+    span_token = _current_span.set(active_span)
+    otel_span = _otel_tracer.start_as_current_span(
+        name,
+        attributes = { "category": category, **attributes }
+    ) if _otel_tracer else nullcontext()
+
+    start_time = time.perf_counter()
+    try:
+        with otel_span:
+            yield
+    finally:
+        duration = time.perf_counter() - start_time
+        _current_span.reset(span_token)
+        if parent_span is not None:
+            parent_span.child_seconds += duration
+        if trace is not None:
+            # Children running concurrently (e.g. gathered bulk writes) can add up to more than their parent
+            trace.record(name, category, duration, max(duration - active_span.child_seconds, 0.0))
+
+@contextmanager
+def trace_pdf(pdf_key: str, metrics_file_path: str | None = ENV.METRICS_FILE_PATH):
+    """
+    It will trace parsing of a pdf, spans inside it are recorded into its trace. At the end timing summary of pdf
+    is logged and appended to metrics file
+    """
+
+    trace = PdfTrace(pdf_key)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    otel_span = _otel_tracer.start_as_current_span(
+        "pdf",
+        attributes = { "pdf_key": pdf_key }
+    ) if _otel_tracer else nullcontext()
+
+    try:
+        with otel_span as root_span:
+            try:
+                yield trace
+            except BaseException as e:
+                trace.status = "failed"
+                trace.error = str(e)
+                raise
+            finally:
+                summary = trace.summary()
+                if root_span is not None:
+                    root_span.set_attributes({
+                        "status": summary["status"],
+                        "bound": summary["bound"] or "",
+                        **{ f"{category}_seconds": seconds for category, seconds in summary["category_seconds"].items() }
+                    })
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+
+        category_times = ", ".join(f"{category} {seconds:.2f}s" for category, seconds in summary["category_seconds"].items())
+        tracing_logger.info(f"Pdf {pdf_key} {summary['status']} in {summary['wall_seconds']:.2f}s, {summary['bound']} bound ({category_times})")
+        if metrics_file_path:
+            write_metrics(summary, metrics_file_path)
+
+def write_metrics(summary: dict, metrics_file_path: str = ENV.METRICS_FILE_PATH):
+    """
+    It will append summary as a json line into metrics file, pdfs parsed concurrently write one line each
+    """
+
+    os.makedirs(os.path.dirname(os.path.abspath(metrics_file_path)), exist_ok = True)
+    with _metrics_file_lock, open(metrics_file_path, "a") as f:
+        f.write(json.dumps(summary) + "\n")
+
+def get_current_trace() -> PdfTrace | None:
+    return _current_trace.get()
@@ -2,6 +2,12 @@ import os
 import re
 from urllib.parse import urlparse
 
+# Patterns are compiled once, as they run for every college name and subject code
+OPENING_BRACKET_PATTERN = re.compile(r'\(')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+SUBJECT_CODE_PARTS_PATTERN = re.compile(r'^([A-Za-z0-9\s\-\(\)\.\/]+?)(\d+(?:\.\d+)?)$')
+SUBJECT_CODE_PREFIX_NOISE_PATTERN = re.compile(r'[^A-Za-z0-9\(\)]')
+
 def create_short_form_name(full_name: str) -> str:
     """
     It will create short form name from full name
@@ -26,8 +32,8 @@ def normalize_spacing(text: str) -> str:
     It will normalize the spacing of the text by removing extra spaces and removing a space before '('
     """
 
-    text = re.sub(r'\(', ' (', text)    # Add space before '('
-    text = re.sub(r'\s+', ' ', text)    # Remove trailing spaces
+    text = OPENING_BRACKET_PATTERN.sub(' (', text)  # Add space before '('
+    text = WHITESPACE_PATTERN.sub(' ', text)        # Remove trailing spaces
     return text
 
 def is_valid_url(url):
@@ -45,11 +51,11 @@ def standardize_subject_code(code):
     """
 
     code = code.strip()
-    match = re.match(r'^([A-Za-z0-9\s\-\(\)\.\/]+?)(\d+(?:\.\d+)?)$', code)
+    match = SUBJECT_CODE_PARTS_PATTERN.match(code)
     if match:
         raw_prefix = match.group(1)
         number = match.group(2)
-        cleaned_prefix = re.sub(r'[^A-Za-z0-9\(\)]', '', raw_prefix).upper()
+        cleaned_prefix = SUBJECT_CODE_PREFIX_NOISE_PATTERN.sub('', raw_prefix).upper()
         return f"{cleaned_prefix}-{number}"
     return code
 
@@ -1,19 +1,15 @@
 from pdfplumber.page import Page
 from result_parser.lib.result_db import Result_DB
+from result_parser.lib.result_builder import SectionResultBuilder
+from result_parser.lib.progress_journal import ProgressJournal
+from result_parser.pdfDataParser.pageExtractor import PageExtractor, LazyPage, PageCache, SerialPageExtractor
+from result_parser.lib.env import ENV
 from result_parser.lib.logger import parser_logger
+from result_parser.lib.tracing import span
 from result_parser.lib.utils import is_int, normalize_spacing, standardize_subject_code
 from result_parser.lib.customErrors import OldSessionException
+from result_parser.pdfDataParser import ipuPatterns
 from typing import Union
-import re
-
-DEFAULT_STUDENT_RESULT = {
-    'roll_num': '',
-    'name': '',
-    'college_id': '',
-    'total_marks_scored': 0,
-    'max_marks_possible': 0,
-    'cgpa': 0.00,
-}
 
 SEMESTER_STR_TO_NUM = {
     "first": 1,
@@ -54,10 +50,10 @@ STATUS_MAP = {
 }
 
 class IPU_Result_Parser:
-    __pdf_pages_list: list[Page]
+    __page_extractor: PageExtractor
+    __page_cache: PageCache
     __pdf_page_index: int
-    __students_result_list: list[dict[str, str | list[int]]]
-    __students_result_index: int
+    __section_result: SectionResultBuilder
     __starting_session: int
     __res_db: Result_DB
     __save_link_metadata_param: dict
@@ -65,17 +61,35 @@ class IPU_Result_Parser:
     __current_degree_id: str
     __current_college_id: str
     __current_semester_num: int
-
-    def __init__(self, pdf_pages_list: list[Page] = [], session_start = 2020, page_to_start = 1):
-        if not pdf_pages_list:
-            parser_logger.error("Page List can't be empty.")
-            raise ValueError("Page List can't be empty.")
+    __subject_cell_memo: dict[str, tuple[str, float | int]]
+    __progress_journal: ProgressJournal | None
+    __pdf_key: str
+    __pdf_order: int | None
+    __section_start_page_index: int
+    __stored_sections: int
+    __last_stored_section: dict | None
+
+    def __init__(
+        self,
+        pdf_pages_list: list[Page] = [],
+        session_start = 2020,
+        page_to_start = 1,
+        page_extractor: PageExtractor | None = None,
+        progress_journal: ProgressJournal | None = None,
+        pdf_key: str = '',
+        pdf_order: int | None = None
+    ):
+        if page_extractor is None:
+            if not pdf_pages_list:
+                parser_logger.error("Page List can't be empty.")
+                raise ValueError("Page List can't be empty.")
+            page_extractor = SerialPageExtractor(pdf_pages_list)
         
         # Initializing values
-        self.__pdf_pages_list = pdf_pages_list
+        self.__page_extractor = page_extractor
+        self.__page_cache = PageCache(ENV.PDF_PAGE_CACHE_SIZE)
         self.__pdf_page_index = page_to_start - 2   # default -1
-        self.__students_result_list = list()
-        self.__students_result_index = -1
+        self.__section_result = SectionResultBuilder()
         self.__starting_session = session_start
         self.__res_db = None
         self.__save_link_metadata_param = dict()
@@ -83,10 +97,84 @@ class IPU_Result_Parser:
         self.__current_degree_id = ''
         self.__current_college_id = ''
         self.__current_semester_num = 0
+        self.__subject_cell_memo = dict()
+
+        # Progress is journaled only if journal is given, pdf key identifies pdf in journal
+        self.__progress_journal = progress_journal if progress_journal and progress_journal.is_enabled else None
+        self.__pdf_key = pdf_key
+
+        # Order of pdf in run, results it stores are merged after those of earlier pdfs of run
+        self.__pdf_order = pdf_order
+        self.__section_start_page_index = page_to_start - 1
+        self.__stored_sections = 0
+        self.__last_stored_section = None
     
     async def start(self):
-        self.__res_db = await Result_DB.create(UNIVERSITY_NAME)
-        await self.__parsing_pdf_pages()
+        self.__res_db = await Result_DB.create(UNIVERSITY_NAME, pdf_order = self.__pdf_order)
+        if self.__progress_journal:
+            self.__progress_journal.start(self.__pdf_key, self.__section_start_page_index + 1)
+
+        try:
+            try:
+                await self.__parsing_pdf_pages()
+            finally:
+                parser_logger.info(f"Page cache stats: {self.__page_cache.stats()}")
+                self.__page_cache.clear()
+                self.__page_extractor.close()
+        except Exception as err:
+            if self.__progress_journal:
+                self.__progress_journal.fail(self.__pdf_key, str(err))
+
+            # Results stored before failure are still uploaded and committed, without hiding error of parsing
+            try:
+                await self.__commit_stored_results()
+            except Exception:
+                parser_logger.error("Results stored before parsing failed couldn't be uploaded", exc_info = True)
+            raise
+
+        try:
+            await self.__commit_stored_results(is_completed = True)
+        except Exception as err:
+            if self.__progress_journal:
+                self.__progress_journal.fail(self.__pdf_key, str(err))
+            raise
+
+    async def __commit_stored_results(self, is_completed: bool = False):
+        """
+        It will upload results stored by this parser and then checkpoint progress, progress is not checkpointed
+        if upload fails. Results shared with other pdfs still being parsed are uploaded by last of them instead
+        """
+
+        with span("parser.flush_results"):
+            await self.__res_db.flush_results()
+        self.__checkpoint_progress(is_completed)
+
+    def __checkpoint_progress(self, is_completed: bool = False):
+        """
+        It will record in progress journal that every section before current section is committed, so parsing resumes
+        from current section. Stored results must be flushed before it
+        """
+
+        if self.__progress_journal is None:
+            return
+
+        result_file_ids = None
+        if self.__last_stored_section:
+            result_file_ids = self.__res_db.get_result_file_ids(
+                self.__last_stored_section['batch'],
+                self.__last_stored_section['degree_id'],
+                self.__last_stored_section['semester_num'],
+                self.__last_stored_section['college_id']
+            )
+        self.__progress_journal.checkpoint(
+            self.__pdf_key,
+            self.__section_start_page_index + 1,
+            self.__last_stored_section,
+            result_file_ids
+        )
+        if is_completed:
+            self.__progress_journal.complete(self.__pdf_key)
+        parser_logger.info(f"Progress checkpointed, parsing resumes from page no. {self.__section_start_page_index + 1}")
     
     async def __parsing_pdf_pages(self):
         """
@@ -94,54 +182,79 @@ class IPU_Result_Parser:
         """
 
         parser_logger.info("Starting to parse PDF pages")
-        if not self.__skip_till_get_subjects_list():
+        if not await self.__skip_till_get_subjects_list():
             return
 
         while True:
-            page_data = self.__get_next_page()
-            if page_data is None:
+            next_page = await self.__get_next_page()
+            if next_page is None:
                 parser_logger.info("No more pages to parse, storing remaining results...")
                 await self.__storing_result()
+                self.__section_start_page_index = len(self.__page_extractor)
                 break
-            next_page, page_table = page_data
 
             parser_logger.info(f"Parsing page no. {self.__pdf_page_index + 1} ...")
 
-            if self.__is_page_contains_subject_list(next_page):
+            if self.__is_page_contains_subject_list(next_page.text):
                 parser_logger.info("Found subject list, storing previous results...")
                 await self.__storing_result()
 
+                # Every section before this page is stored now, and committed once results are flushed
+                self.__section_start_page_index = self.__pdf_page_index
+                if self.__progress_journal and ENV.PROGRESS_CHECKPOINT_SECTIONS and self.__stored_sections >= ENV.PROGRESS_CHECKPOINT_SECTIONS:
+                    await self.__commit_stored_results()
+                    self.__stored_sections = 0
+
                 # Clearing metadata
                 self.__res_db.reset_subject_data_list()
                 self.__save_link_metadata_param.clear()
                 self.__current_batch_year = 0
 
-                await self.__start_subjects_parser(next_page, page_table)
+                with span("parser.subjects_page"):
+                    await self.__start_subjects_parser(next_page)
             else:
-                await self.__start_student_results_parser(next_page, page_table)
+                with span("parser.student_results_page"):
+                    await self.__start_student_results_parser(next_page)
     
     async def __storing_result(self):        
-        if len(self.__students_result_list) == 0:
+        if len(self.__section_result) == 0:
             parser_logger.info("No results to store, skipping it...")
         else:
             parser_logger.info("Storing and uploading results...")
-            await self.__res_db.store_and_upload_result(
-                student_result_list = self.__students_result_list
-            )
+            with span("parser.store_section"):
+                await self.__res_db.store_and_upload_result(
+                    section_result = self.__section_result
+                )
+            self.__stored_sections += 1
+            self.__last_stored_section = {
+                'degree_id': self.__save_link_metadata_param['degree_id'],
+                'degree_name': self.__save_link_metadata_param['degree_name'],
+                'college_id': self.__save_link_metadata_param['college_id'],
+                'college_name': self.__save_link_metadata_param['college_name'],
+                'semester_num': self.__save_link_metadata_param['semester_num'],
+                'is_evening_shift': self.__save_link_metadata_param['is_evening_shift'],
+                'batch': self.__current_batch_year
+            }
 
         # Clearing previous results
-        self.__students_result_list.clear()
-        self.__students_result_index = -1
+        self.__section_result.clear()
     
-    def __get_next_page(self) -> tuple[str, list[list[str]]] | None:
+    async def __get_next_page(self) -> LazyPage | None:
         """
-        Returns next page data as string, if no next page is found, then it will return None
+        Returns next page, its text is already extracted and table is extracted on first read. If no next page is found, then it will return None
         """
 
-        if len(self.__pdf_pages_list) == self.__pdf_page_index + 1:
+        if len(self.__page_extractor) == self.__pdf_page_index + 1:
             return None
         self.__pdf_page_index += 1
-        return self.__pdf_pages_list[self.__pdf_page_index].extract_text_simple(), self.__pdf_pages_list[self.__pdf_page_index].extract_table()
+
+        # Peeked or rewound pages are served from cache
+        page = self.__page_cache.get(self.__pdf_page_index)
+        if page is None:
+            with span("pdf.extract_text"):
+                page = await self.__page_extractor.get_page(self.__pdf_page_index)
+            self.__page_cache.put(self.__pdf_page_index, page)
+        return page
     
     def __is_page_contains_subject_list(self, page_content: str) -> bool:
         """
@@ -150,18 +263,16 @@ class IPU_Result_Parser:
 
         return "SCHEME OF EXAMINATIONS" in page_content
 
-    def __exam_meta_data_parser(self, raw_exam_meta_data: str) -> Union[dict[str, int | str], None]:
+    async def __exam_meta_data_parser(self, raw_exam_meta_data: str) -> Union[dict[str, int | str], None]:
         """
         It will parse Metadata about result, like degree code, degree name, semester number, college code, college name and batch year; and return in dictionary. If page is supposed to be skipped, then it return False else True
         """
 
-        regexStrForExamMetaData = r'(?:Prg\.|Programme) Code:\s*(\d{3})\s+Programme(?: Name)?\s*:\s*(.+)\s+SchemeID:\s*\d+\s+Sem\./(?:Year|Annual):\s*(.+?)\s+(?:SEMESTER|ANNUAL|TRIMESTER).*\n.*Institution Code:\s*\'?(\d{3})\'?\s+Institution:\s+(.+)\n'
-
-        batch = self.__peek_to_get_batch()
+        batch = await self.__peek_to_get_batch()
         if batch == 0:
             pass
         
-        exam_meta_data_matched_regex = re.search(regexStrForExamMetaData, raw_exam_meta_data)
+        exam_meta_data_matched_regex = ipuPatterns.EXAM_META_DATA_PATTERN.search(raw_exam_meta_data)
         if exam_meta_data_matched_regex is None:
             parser_logger.error(f"Failed to parse Exam Meta Data from page no. {self.__pdf_page_index + 1}, raw data: {raw_exam_meta_data}")
             raise ValueError(f"Failed to parse Exam Meta Data from page no. {self.__pdf_page_index + 1}, raw data: {raw_exam_meta_data}")
@@ -214,18 +325,18 @@ class IPU_Result_Parser:
         else:
             return 0
     
-    def __peek_to_get_batch(self) -> int:
+    async def __peek_to_get_batch(self) -> int:
         """
         It will get batch number from the next page
         """
 
-        next_page, _ = self.__get_next_page()
+        next_page = (await self.__get_next_page()).text
         batch = 0
 
         if not self.__is_page_contains_subject_list(next_page):
             batch = self.__get_batch(next_page)
 
-            exam_type_searched = re.search(r'Examination:\s*(\w+)', next_page, re.IGNORECASE)
+            exam_type_searched = ipuPatterns.EXAM_TYPE_PATTERN.search(next_page)
             if exam_type_searched is None:
                 parser_logger.error(f"Failed to parse Exam Type from page no. {self.__pdf_page_index + 1}, raw data: {next_page}")
                 raise ValueError(f"Failed to parse Exam Type from page no. {self.__pdf_page_index + 1}, raw data: {next_page}")
@@ -240,7 +351,7 @@ class IPU_Result_Parser:
 
         if not self.__is_page_contains_subject_list(raw_data):
             try:
-                batch_searched = re.search(r'Batch:\s(\d{4})', raw_data)
+                batch_searched = ipuPatterns.BATCH_PATTERN.search(raw_data)
                 batch_str = batch_searched.group(1)
                 return self.__get_int_val(batch_str)
             except Exception as e:
@@ -248,16 +359,16 @@ class IPU_Result_Parser:
         
         return 0
     
-    def __skip_till_get_subjects_list(self):
+    async def __skip_till_get_subjects_list(self):
         """
         It will skip all the pages till it finds subject list, if no page contains subject list then it will return False
         """
 
-        page_data = self.__get_next_page()
-        while page_data is not None and not self.__is_page_contains_subject_list(page_data[0]):
-            page_data = self.__get_next_page()
+        page = await self.__get_next_page()
+        while page is not None and not self.__is_page_contains_subject_list(page.text):
+            page = await self.__get_next_page()
         
-        if page_data is None:
+        if page is None:
             parser_logger.error("Pdf doesn't contain subject list at all.")
             return False
         
@@ -270,28 +381,26 @@ class IPU_Result_Parser:
         """
 
         # Fix line breaks inside words (e.g., '20\n1' -> '201', 'AV\nV' -> 'AVV') and remove dots between numbers (e.g., 'B 3.3' -> 'B33')
-        text = re.sub(r'(?<=\w)[\s\n]+(?=\w)', '', raw_subject_code)
-        text = re.sub(r'(?<=\d)[.\n]+(?=\d)', '', text)
+        text = ipuPatterns.WORD_BREAK_PATTERN.sub('', raw_subject_code)
+        text = ipuPatterns.NUMBER_BREAK_PATTERN.sub('', text)
 
-        # Pattern pattern:
+        # Subject code pattern:
         # - Starts with letters
         # - Allows dots, dashes, slashes, parentheses and ampersand
         # - Allows optional space or whitespaces before number
-        pattern = r'[A-Z][A-Z.\-/()&]*\s*\d*'
-
-        match = re.search(pattern, text, flags=re.IGNORECASE)
+        match = ipuPatterns.SUBJECT_CODE_PATTERN.search(text)
         return match.group().replace(' ', '') if match else None
     
-    async def __subject_parser(self, raw_subject_data: list[str], paper_id_index: int):
+    def __subject_parser(self, raw_subject_data: list[str], paper_id_index: int) -> tuple[str, str, str, int] | None:
         """
-        It will parse subject data like subject id, subject code, subject name, subject credit, subject type, subject internal marks, subject external marks, subject passing marks
+        It will parse subject data like subject id, subject code, subject name, subject credit, subject type, subject internal marks, subject external marks, subject passing marks. It returns subject name, subject code, subject id and max marks
         """
 
         subject_id = raw_subject_data[paper_id_index]
         subject_name = raw_subject_data[paper_id_index + 2].strip()
 
         # Subject id should be only numbers
-        subject_id = re.sub(r'\D', '', subject_id).strip()
+        subject_id = ipuPatterns.NON_DIGIT_PATTERN.sub('', subject_id).strip()
 
         raw_subject_code = raw_subject_data[paper_id_index + 1].strip()
         if raw_subject_code == subject_id:
@@ -334,20 +443,20 @@ class IPU_Result_Parser:
         if subject_max_marks == 0:
             subject_max_marks = subject_internal_marks + subject_external_marks
 
-        return await self.__res_db.add_subject(subject_name, subject_code, subject_id, subject_max_marks)
+        return subject_name, subject_code, subject_id, subject_max_marks
     
     async def __subjects_data_parser(self, raw_subjects_table: list[list[str]]):
         """
-        It will divide subjects data into individual subject and then parse each subject
+        It will divide subjects data into individual subject, parse each subject and then register all of them together
         """
 
         paper_id_index = 0
-        if not re.match(r'paper\s*id', raw_subjects_table[0][0].lower()):   # Checking if subjects data starts from 0 or 1, as paper id index will be the starting index of subject data
+        if not ipuPatterns.PAPER_ID_PATTERN.match(raw_subjects_table[0][0].lower()):   # Checking if subjects data starts from 0 or 1, as paper id index will be the starting index of subject data
             paper_id_index = 1
 
-        subject_list = list()
+        parsed_subject_list = list()
         for subject_num_index in range(1, len(raw_subjects_table)):
-            subject_res = await self.__subject_parser(
+            subject_res = self.__subject_parser(
                 raw_subjects_table[subject_num_index],
                 paper_id_index
             )
@@ -356,30 +465,30 @@ class IPU_Result_Parser:
             elif subject_res is None:   # Just skipping this subject
                 continue
             
-            subject_id, subject_doc_id = subject_res
-            subject_list.append((subject_id, subject_doc_id))
-        return subject_list
+            parsed_subject_list.append(subject_res)
+        return await self.__res_db.add_subjects(parsed_subject_list)
     
-    async def __start_subjects_parser(self, page_data: str, page_table: list[list[str]]):
+    async def __start_subjects_parser(self, page: LazyPage):
         """
         It will divide page into two parts, one for metadata and other for subjects data. Then it will parse those two parts
         """
 
         parser_logger.info("Found subject list, parsing it...")
-        sub_id_list = await self.__subjects_data_parser(page_table)
+        page_data = page.text
+        sub_id_list = await self.__subjects_data_parser(await page.get_table())
         if not sub_id_list:
-            self.__skip_till_get_subjects_list()
+            await self.__skip_till_get_subjects_list()
             return
         
         try:
-            meta_data = self.__exam_meta_data_parser(page_data)
+            meta_data = await self.__exam_meta_data_parser(page_data)
         except OldSessionException:
-            self.__skip_till_get_subjects_list()
+            await self.__skip_till_get_subjects_list()
             return
         
         if meta_data['degree_code'] in DEGREE_ID_SKIP_LIST:
             start_page = self.__pdf_page_index
-            self.__skip_till_get_subjects_list()
+            await self.__skip_till_get_subjects_list()
             end_page = self.__pdf_page_index
 
             parser_logger.warning(f"Skipping result page due to degree id: {meta_data['degree_code']}, skipped from page no. {start_page + 1} to page no. {end_page + 1}")
@@ -409,21 +518,22 @@ class IPU_Result_Parser:
 
         if meta_data['batch'] == 0:
             parser_logger.info("Next page is also subject list, going to parse it as well...")
-            page_data = self.__get_next_page()
-            if not page_data:
+            next_page = await self.__get_next_page()
+            if not next_page:
                 parser_logger.info("No more pages to parse, now parsing student results...")
                 return
             parser_logger.info(f"Parsing page no. {self.__pdf_page_index + 1} ...")
-            await self.__start_subjects_parser(page_data[0], page_data[1])
+            await self.__start_subjects_parser(next_page)
         else:
             parser_logger.info("Subject list parsed successfully")
             parser_logger.info("Now parsing student results...")
     
-    async def __start_student_results_parser(self, raw_result: str, result_table: list[list[str]]):
+    async def __start_student_results_parser(self, page: LazyPage):
         """
-        This will remove header from page data and then starts parsing
+        This will remove header from page data and then starts parsing. Table of page is extracted only if batch is going to be parsed
         """
         
+        raw_result = page.text
         batch_year = self.__extract_student_page_exam_metadata(raw_result)
         if batch_year == 0:
             parser_logger.error(f"Failed to parse batch year from page no. {self.__pdf_page_index + 1}, raw data: {raw_result}")
@@ -454,10 +564,10 @@ class IPU_Result_Parser:
             )
             self.__current_batch_year = batch_year
 
+        result_table = await page.get_table()
+        self.__subject_cell_memo.clear()
         student_index = 1
         while student_index < len(result_table) and result_table[student_index][1]:
-            self.__students_result_list.append(DEFAULT_STUDENT_RESULT.copy())
-            self.__students_result_index += 1
             await self.__extract_student_result(
                 result_table[student_index],
                 result_table[student_index + 1],
@@ -487,8 +597,7 @@ class IPU_Result_Parser:
         It will parse student detail like student roll number and student name
         """
 
-        student_detail_regex_pattern = r'(\d+)\s+(.+?)\s+SID:'
-        student_detail_regex_search = re.match(student_detail_regex_pattern, raw_student_detail, re.DOTALL)
+        student_detail_regex_search = ipuPatterns.STUDENT_DETAIL_PATTERN.match(raw_student_detail)
         if not student_detail_regex_search:
             parser_logger.error(f"Error while parsing student detail, {raw_student_detail}")
             raise ValueError("Error while parsing student detail")
@@ -496,9 +605,8 @@ class IPU_Result_Parser:
         student_roll_num = student_detail_regex_search.group(1).strip()
         student_name = student_detail_regex_search.group(2).replace('\n', ' ').strip()
 
-        # Adding student detail to list
-        self.__students_result_list[self.__students_result_index]['roll_num'] = student_roll_num
-        self.__students_result_list[self.__students_result_index]['name'] = student_name
+        # Adding student to section result
+        self.__section_result.add_student(student_roll_num, student_name)
     
     def __extract_subject_id_credit(self, raw_subject_id_str: str):
         """
@@ -506,10 +614,10 @@ class IPU_Result_Parser:
         """
 
         # Normalize whitespace
-        raw_subject_id_str = re.sub(r'\s+', ' ', raw_subject_id_str).strip()
+        raw_subject_id_str = ipuPatterns.WHITESPACE_PATTERN.sub(' ', raw_subject_id_str).strip()
 
         # Extract part before credit
-        credit_match = re.search(r'\((\d+(?:\.\d+)?)\)', raw_subject_id_str)
+        credit_match = ipuPatterns.CREDIT_PATTERN.search(raw_subject_id_str)
         subject_part = raw_subject_id_str[:credit_match.start()] if credit_match else raw_subject_id_str
 
         # Credit
@@ -520,6 +628,22 @@ class IPU_Result_Parser:
         subject_code = subject_part.replace(' ', '')
         return subject_code, credit
 
+    def __parse_subject_cell(self, raw_subject_cell: str) -> tuple[str, float | int]:
+        """
+        It will parse subject code (standardized, if it is not a subject id) and credit from subject cell of student row.
+        Every student of a page has same subject cells, so they are parsed once per page
+        """
+
+        parsed_subject_cell = self.__subject_cell_memo.get(raw_subject_cell)
+        if parsed_subject_cell is None:
+            subject_id, subject_credit = self.__extract_subject_id_credit(raw_subject_cell)
+            if subject_id and not subject_id.isdigit():
+                subject_id = self.__self_cleaning_subject_code(subject_id)
+                subject_id = standardize_subject_code(subject_id)
+            parsed_subject_cell = (subject_id, subject_credit)
+            self.__subject_cell_memo[raw_subject_cell] = parsed_subject_cell
+        return parsed_subject_cell
+
     async def __extract_student_marks(
         self,
         student_n_subject_detail : list[str],
@@ -530,7 +654,6 @@ class IPU_Result_Parser:
         It will divide student marks into individual subject marks and then parse each subject marks
         """
 
-        regexGrade = r'(-?\d+|CAN|ABS|RL|DET|C|A|D)(?:\s*\*?\s*\(([ABCFPO]\+?)\))?'
         subject_start_index = 2
         student_grade_list = []
         while subject_start_index < len(student_n_subject_detail):
@@ -538,15 +661,13 @@ class IPU_Result_Parser:
                 subject_start_index += 2
                 continue
             
-            subject_id, subject_credit = self.__extract_subject_id_credit(student_n_subject_detail[subject_start_index])
+            subject_id, subject_credit = self.__parse_subject_cell(student_n_subject_detail[subject_start_index])
             if not subject_credit:
                 parser_logger.warning(f"Subject credit not found in page no. {self.__pdf_page_index + 1}, raw data: {student_n_subject_detail}")
             if not subject_id:
                 parser_logger.error(f"Subject ID not found in page no. {self.__pdf_page_index + 1}, raw data: {student_n_subject_detail}")
                 raise ValueError(f"Subject ID not found in page no. {self.__pdf_page_index + 1}, raw data: {student_n_subject_detail}")
             if not subject_id.isdigit():
-                subject_id = self.__self_cleaning_subject_code(subject_id)
-                subject_id = standardize_subject_code(subject_id)
                 if self.__res_db.subject_id_code_map.get(subject_id, None) is None:
                     parser_logger.warning(f"Subject ID not found in given subject page, raw data: {subject_id}, trying for database")
 
@@ -564,7 +685,7 @@ class IPU_Result_Parser:
             total_marks = internal_marks + external_marks   # Default total marks
             status = '' # By default status is empty
 
-            total_marks_n_grade_match = re.match(regexGrade, student_total_marks_n_grade[subject_start_index])
+            total_marks_n_grade_match = ipuPatterns.GRADE_PATTERN.match(student_total_marks_n_grade[subject_start_index])
             if total_marks_n_grade_match:
                 total_marks_str = total_marks_n_grade_match.group(1)
                 grade = total_marks_n_grade_match.group(2)
@@ -595,7 +716,7 @@ class IPU_Result_Parser:
                 grade = self.__marks_to_grade(total_marks, subject_id)
             grade = grade.strip()
 
-            self.__students_result_list[self.__students_result_index][f'sub_{subject_id}'] = [internal_marks, external_marks, grade, subject_credit, total_marks, status]
+            self.__section_result.add_subject_result(subject_id, internal_marks, external_marks, grade, subject_credit, total_marks, status)
             student_grade_list.append(grade)
             subject_start_index += 2
     
@@ -604,8 +725,7 @@ class IPU_Result_Parser:
         It will extract exam metadata in student result page to verify if it is correct
         """
 
-        regexStrForExamMetaData = r'Programme Code:\s*(\d{3})\s+Programme Name:\s*.+\s+Sem./Year(?:/EU)?:\s*(.+)\s+(?:SEMESTER|ANNUAL)\s+Batch:\s*(\d{4}).+Institution Code:\s*(\d{3})'
-        metaDataSearched = re.search(regexStrForExamMetaData, raw_data, re.DOTALL)
+        metaDataSearched = ipuPatterns.STUDENT_PAGE_EXAM_META_DATA_PATTERN.search(raw_data)
 
         if metaDataSearched is None:
             parser_logger.error(f"Failed to parse Exam Meta Data in student result from page no. {self.__pdf_page_index + 1}, raw data: {raw_data}")
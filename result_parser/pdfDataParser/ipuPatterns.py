@@ -0,0 +1,23 @@
+import re
+
+# Patterns used by IPU_Result_Parser, compiled once at import instead of being looked up in re cache on every call.
+# Most of them run once per student subject cell, so they are kept here as module level constants
+
+# Subject list page
+EXAM_META_DATA_PATTERN = re.compile(r'(?:Prg\.|Programme) Code:\s*(\d{3})\s+Programme(?: Name)?\s*:\s*(.+)\s+SchemeID:\s*\d+\s+Sem\./(?:Year|Annual):\s*(.+?)\s+(?:SEMESTER|ANNUAL|TRIMESTER).*\n.*Institution Code:\s*\'?(\d{3})\'?\s+Institution:\s+(.+)\n')
+EXAM_TYPE_PATTERN = re.compile(r'Examination:\s*(\w+)', re.IGNORECASE)
+BATCH_PATTERN = re.compile(r'Batch:\s(\d{4})')
+PAPER_ID_PATTERN = re.compile(r'paper\s*id')
+NON_DIGIT_PATTERN = re.compile(r'\D')
+
+# Subject code cleaning
+WORD_BREAK_PATTERN = re.compile(r'(?<=\w)[\s\n]+(?=\w)')        # '20\n1' -> '201', 'AV\nV' -> 'AVV'
+NUMBER_BREAK_PATTERN = re.compile(r'(?<=\d)[.\n]+(?=\d)')       # 'B 3.3' -> 'B33'
+SUBJECT_CODE_PATTERN = re.compile(r'[A-Z][A-Z.\-/()&]*\s*\d*', re.IGNORECASE)
+
+# Student result page
+STUDENT_PAGE_EXAM_META_DATA_PATTERN = re.compile(r'Programme Code:\s*(\d{3})\s+Programme Name:\s*.+\s+Sem./Year(?:/EU)?:\s*(.+)\s+(?:SEMESTER|ANNUAL)\s+Batch:\s*(\d{4}).+Institution Code:\s*(\d{3})', re.DOTALL)
+STUDENT_DETAIL_PATTERN = re.compile(r'(\d+)\s+(.+?)\s+SID:', re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+CREDIT_PATTERN = re.compile(r'\((\d+(?:\.\d+)?)\)')
+GRADE_PATTERN = re.compile(r'(-?\d+|CAN|ABS|RL|DET|C|A|D)(?:\s*\*?\s*\(([ABCFPO]\+?)\))?')
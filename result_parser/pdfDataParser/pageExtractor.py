@@ -0,0 +1,303 @@
+import pdfplumber
+from pdfplumber.pdf import PDF
+from pdfplumber.page import Page
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from abc import ABC, abstractmethod
+import asyncio
+import logging
+from result_parser.lib.tracing import span
+
+# Suppress only pdfminer warnings (also required inside worker processes)
+logging.getLogger("pdfminer").setLevel(logging.ERROR)
+
+PageTable = list[list[str]] | None
+
+# Pdf files opened inside a worker process in order of last use, key: pdf path
+_worker_pdf_handles: OrderedDict[str, PDF] = OrderedDict()
+MAX_WORKER_PDF_HANDLES = 4
+
+class LazyPage:
+    """
+    Extracted page, text is extracted upfront and table is extracted only when it is read for the first time
+    """
+
+    text: str
+    __table: PageTable
+    __table_loader: Callable[[], Awaitable[PageTable]] | None
+
+    def __init__(self, text: str, table_loader: Callable[[], Awaitable[PageTable]]):
+        self.text = text
+        self.__table = None
+        self.__table_loader = table_loader
+
+    async def get_table(self) -> PageTable:
+        """
+        It will return table of page, table is extracted on first call only
+        """
+
+        if self.__table_loader is not None:
+            with span("pdf.extract_table"):
+                self.__table = await self.__table_loader()
+            self.__table_loader = None
+        return self.__table
+
+    @property
+    def is_table_extracted(self) -> bool:
+        return self.__table_loader is None
+
+def _get_worker_pdf(pdf_path: str) -> PDF:
+    """
+    It will return pdf opened in current worker process, pdf is opened only once per worker
+    """
+
+    pdf = _worker_pdf_handles.get(pdf_path)
+    if pdf is not None:
+        _worker_pdf_handles.move_to_end(pdf_path)
+        return pdf
+
+    # Closing least recently used pdf, so worker doesn't keep every pdf of a run open
+    if len(_worker_pdf_handles) >= MAX_WORKER_PDF_HANDLES:
+        _, lru_pdf = _worker_pdf_handles.popitem(last = False)
+        lru_pdf.close()
+
+    pdf = pdfplumber.open(pdf_path)
+    _worker_pdf_handles[pdf_path] = pdf
+    return pdf
+
+def _extract_page_in_worker(pdf_path: str, page_index: int, with_table: bool) -> tuple[str, PageTable]:
+    """
+    It will extract text of a page inside worker process, along with its table if asked. Table is extracted from
+    same parsed page objects as text, so page is parsed only once
+    """
+
+    page = _get_worker_pdf(pdf_path).pages[page_index]
+    try:
+        return page.extract_text_simple(), page.extract_table() if with_table else None
+    finally:
+        page.close()    # Releasing layout cache of page
+
+def _extract_page_table_in_worker(pdf_path: str, page_index: int) -> PageTable:
+    """
+    It will extract table of a page inside worker process
+    """
+
+    page = _get_worker_pdf(pdf_path).pages[page_index]
+    try:
+        return page.extract_table()
+    finally:
+        page.close()
+
+class PageCache:
+    """
+    Bounded LRU cache of extracted pages, key: page index
+    """
+
+    __pages: OrderedDict[int, LazyPage]
+    __max_size: int
+    hits: int
+    misses: int
+
+    def __init__(self, max_size: int = 8):
+        self.__pages = OrderedDict()
+        self.__max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, page_index: int) -> LazyPage | None:
+        """
+        It will return cached page and mark it as recently used, None if page is not cached
+        """
+
+        page = self.__pages.get(page_index)
+        if page is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.__pages.move_to_end(page_index)
+        return page
+
+    def put(self, page_index: int, page: LazyPage):
+        """
+        It will cache page, least recently used page is evicted when cache is full
+        """
+
+        self.__pages[page_index] = page
+        self.__pages.move_to_end(page_index)
+        if len(self.__pages) > self.__max_size:
+            self.__pages.popitem(last = False)
+
+    def clear(self):
+        self.__pages.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.__pages)
+        }
+
+class PageExtractor(ABC):
+    """
+    Base class of page extractors, it gives text and table of a page by its index
+    """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    async def get_page(self, page_index: int) -> LazyPage:
+        """
+        It will return page whose text is extracted, table is extracted when it is read
+        """
+
+    def close(self):
+        pass
+
+class SerialPageExtractor(PageExtractor):
+    """
+    It will extract pages one by one in current process from already opened pdf pages
+    """
+
+    __pdf_pages_list: list[Page]
+
+    def __init__(self, pdf_pages_list: list[Page]):
+        self.__pdf_pages_list = pdf_pages_list
+
+    def __len__(self) -> int:
+        return len(self.__pdf_pages_list)
+
+    async def get_page(self, page_index: int) -> LazyPage:
+        page = self.__pdf_pages_list[page_index]
+
+        async def table_loader():
+            return page.extract_table()
+
+        return LazyPage(page.extract_text_simple(), table_loader)
+
+class ProcessPoolPageExtractor(PageExtractor):
+    """
+    It will extract pages in worker processes, each worker opens pdf itself. Only a window of pages ahead of
+    the requested page is in flight at any time, so memory stays bounded. Tables are extracted on demand, and
+    while tables of consecutive pages are being read, pages ahead are extracted with their table in same job
+    """
+
+    __pdf_path: str
+    __total_pages: int
+    __window_size: int
+    __executor: Executor
+    __own_executor: bool
+    __page_futures: dict[int, Future]      # result: (text, table or None)
+    __table_page_indexes: set[int]         # pages whose job extracts table along with text
+    __last_table_index: int
+    __is_reading_tables: bool
+
+    def __init__(
+        self,
+        pdf_path: str,
+        total_pages: int,
+        max_workers: int = 1,
+        window_size: int = 0,
+        executor: Executor | None = None
+    ):
+        self.__pdf_path = pdf_path
+        self.__total_pages = total_pages
+        self.__window_size = window_size or max_workers * 2
+        self.__page_futures = dict()
+        self.__table_page_indexes = set()
+        self.__last_table_index = -2
+        self.__is_reading_tables = False
+
+        # Executor can be shared between multiple pdfs, then it is not owned by this extractor
+        self.__own_executor = executor is None
+        self.__executor = executor or ProcessPoolExecutor(max_workers = max_workers)
+
+    def __len__(self) -> int:
+        return self.__total_pages
+
+    def __submit_page(self, page_index: int):
+        """
+        It will submit extraction of page, its table is extracted in same job while tables are being read
+        """
+
+        self.__page_futures[page_index] = self.__executor.submit(
+            _extract_page_in_worker,
+            self.__pdf_path,
+            page_index,
+            self.__is_reading_tables
+        )
+        if self.__is_reading_tables:
+            self.__table_page_indexes.add(page_index)
+        else:
+            self.__table_page_indexes.discard(page_index)
+
+    def __schedule_window(self, page_index: int):
+        """
+        It will submit extraction of all pages of window starting from given page index
+        """
+
+        window_end = min(page_index + self.__window_size, self.__total_pages)
+        for index in range(page_index, window_end):
+            if index not in self.__page_futures:
+                self.__submit_page(index)
+
+    def __release_pages_before(self, page_index: int):
+        """
+        It will drop extracted pages before given page index, pending ones are cancelled
+        """
+
+        for index in [index for index in self.__page_futures if index < page_index]:
+            self.__page_futures.pop(index).cancel()
+            self.__table_page_indexes.discard(index)
+
+    def __start_reading_tables(self, page_index: int):
+        """
+        It will extract tables of next pages along with their text, jobs of pages ahead which haven't started yet
+        are submitted again with table
+        """
+
+        self.__is_reading_tables = True
+        for index, future in list(self.__page_futures.items()):
+            if index > page_index and index not in self.__table_page_indexes and future.cancel():
+                self.__submit_page(index)
+
+    async def __get_table(self, page_index: int, extracted_table: PageTable, is_table_extracted: bool) -> PageTable:
+        """
+        It will return table of a page, extracting it if it wasn't extracted along with text. Reading table of page
+        right after previous page table starts extracting tables along with text
+        """
+
+        if self.__last_table_index == page_index - 1 and not self.__is_reading_tables:
+            self.__start_reading_tables(page_index)
+        self.__last_table_index = page_index
+
+        if is_table_extracted:
+            return extracted_table
+        return await asyncio.wrap_future(self.__executor.submit(_extract_page_table_in_worker, self.__pdf_path, page_index))
+
+    async def get_page(self, page_index: int) -> LazyPage:
+        # Pages skipped without reading their table (parser may peek one page ahead) stop extracting tables ahead
+        if self.__is_reading_tables and page_index - self.__last_table_index > 2:
+            self.__is_reading_tables = False
+
+        self.__schedule_window(page_index)
+
+        # Waiting without blocking event loop, so other pdfs of same run keep parsing
+        page_text, page_table = await asyncio.wrap_future(self.__page_futures[page_index])
+        is_table_extracted = page_index in self.__table_page_indexes
+
+        # Keeping previous page, as parser can step one page back after peeking
+        self.__release_pages_before(page_index - 1)
+        return LazyPage(page_text, lambda: self.__get_table(page_index, page_table, is_table_extracted))
+
+    def close(self):
+        for future in self.__page_futures.values():
+            future.cancel()
+        self.__page_futures.clear()
+        self.__table_page_indexes.clear()
+
+        if self.__own_executor:
+            self.__executor.shutdown(wait = True, cancel_futures = True)
@@ -2,16 +2,25 @@ import pdfplumber
 from pdfplumber.pdf import PDF
 from pdfplumber.page import Page
 from result_parser.lib.utils import is_valid_url
-from io import BytesIO
+from result_parser.lib.env import ENV
+from result_parser.lib.pdf_cache import PDFCache
+from result_parser.lib.tracing import span, DOWNLOAD
+from result_parser.pdfDataParser.pageExtractor import (
+    PageExtractor,
+    SerialPageExtractor,
+    ProcessPoolPageExtractor
+)
+from concurrent.futures import Executor
 import os
-import requests
 import logging
 
 # Suppress only pdfminer warnings
 logging.getLogger("pdfminer").setLevel(logging.ERROR)
 
+pdf_cache = PDFCache()
+
 class PDFParser:
-    __stream_content : str | None
+    __stream_content : str | None   # Local pdf path
     __pdf_pointer : PDF | None
     pdf_pages_list : list[Page]
 
@@ -38,10 +47,37 @@ class PDFParser:
     def __parsing_pdf_pages(self):
         self.pdf_pages_list = self.__pdf_pointer.pages
     
-    def __read_pdf_from_url(self, url: str):
-        res = requests.get(url)
-        return BytesIO(res.content)
+    def __read_pdf_from_url(self, url: str) -> str:
+        """
+        It will stream pdf into local pdf cache (if not already cached) and return its path
+        """
+
+        with span("pdf.download", DOWNLOAD):
+            return pdf_cache.get_pdf_path(url)
     
     def parsePdf(self):
-        self.__get_pdf_pointer()
-        self.__parsing_pdf_pages()
+        with span("pdf.open"):
+            self.__get_pdf_pointer()
+            self.__parsing_pdf_pages()
+
+    def get_page_extractor(
+        self,
+        max_workers: int = ENV.PDF_EXTRACT_WORKERS,
+        window_size: int = ENV.PDF_EXTRACT_WINDOW,
+        executor: Executor | None = None
+    ) -> PageExtractor:
+        """
+        It will return page extractor of parsed pdf. Pages are extracted in worker processes, each worker opens
+        pdf by its path, with a single worker pages are extracted in current process
+        """
+
+        if executor or max_workers > 1:
+            return ProcessPoolPageExtractor(
+                self.__stream_content,
+                len(self.pdf_pages_list),
+                max_workers = max_workers,
+                window_size = window_size,
+                executor = executor
+            )
+        return SerialPageExtractor(self.pdf_pages_list)
+